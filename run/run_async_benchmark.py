@@ -0,0 +1,66 @@
+from EasyTeleop.Device.VR import TestVR, AsyncTestVR
+from EasyTeleop.Device.Robot import TestRobot, AsyncTestRobot
+from EasyTeleop.Device.Camera import TestCamera, AsyncTestCamera
+import argparse
+import threading
+import time
+
+"""
+对比线程运行时(BaseDevice)和asyncio运行时(AsyncBaseDevice)：
+同时启动若干测试设备，统计实际频率、唤醒抖动、线程数量和CPU占用
+用法: python run/run_async_benchmark.py --robots 4 --vrs 2 --cameras 1 --fps 100 --seconds 10
+"""
+
+
+def run(runtime, args):
+    if runtime == "thread":
+        vr_cls, robot_cls, camera_cls = TestVR, TestRobot, TestCamera
+    else:
+        vr_cls, robot_cls, camera_cls = AsyncTestVR, AsyncTestRobot, AsyncTestCamera
+
+    devices = []
+    devices += [robot_cls({"fps": args.fps}) for _ in range(args.robots)]
+    devices += [vr_cls({"fps": args.fps}) for _ in range(args.vrs)]
+    devices += [camera_cls({"fps": args.camera_fps}) for _ in range(args.cameras)]
+
+    threads_before = threading.active_count()
+    for device in devices:
+        device.start()
+    # 等待设备连接并进入稳定状态后再开始统计
+    time.sleep(1.0)
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    threads = threading.active_count() - threads_before
+    time.sleep(args.seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    stats = [device.get_loop_stats() for device in devices]
+    for device in devices:
+        device.stop()
+
+    print(f"===== {runtime} 运行时 ({len(devices)}个设备) =====")
+    for device, stat in zip(devices, stats):
+        print(f"{device.__class__.__name__:16s} 目标{stat['target_rate']:6.1f}Hz "
+              f"实际{stat['achieved_rate']:7.2f}Hz "
+              f"抖动avg {stat['jitter_avg_ms']:6.3f}ms max {stat['jitter_max_ms']:7.3f}ms "
+              f"超时{stat['overruns']}")
+    print(f"新增线程数: {threads}")
+    print(f"CPU占用: {cpu / wall * 100:.1f}% ({cpu:.2f}s / {wall:.2f}s)")
+    print()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="线程运行时与asyncio运行时的对比测试")
+    parser.add_argument("--robots", type=int, default=4, help="TestRobot数量")
+    parser.add_argument("--vrs", type=int, default=2, help="TestVR数量")
+    parser.add_argument("--cameras", type=int, default=1, help="TestCamera数量")
+    parser.add_argument("--fps", type=int, default=100, help="机器人和VR的频率")
+    parser.add_argument("--camera-fps", type=int, default=30, help="摄像头帧率")
+    parser.add_argument("--seconds", type=float, default=10, help="统计时长(秒)")
+    parser.add_argument("--runtime", choices=["thread", "async", "both"], default="both")
+    args = parser.parse_args()
+
+    runtimes = ["thread", "async"] if args.runtime == "both" else [args.runtime]
+    for runtime in runtimes:
+        run(runtime, args)
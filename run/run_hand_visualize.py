@@ -10,7 +10,7 @@ if __name__ == '__main__':
         teleop = TeleopMiddleware()
         
         devices = [vrsocket]
-        @vrsocket.on("message")
+        @vrsocket.on("message", mailbox=True)
         def teleop_handle_socket_data(message):
             if message['type'] == "hand":
                 print(message)
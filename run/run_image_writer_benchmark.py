@@ -0,0 +1,70 @@
+from EasyTeleop.Components import DataCollect
+from EasyTeleop.Device.Camera import TestCamera
+import argparse
+import shutil
+import tempfile
+import time
+
+"""
+测量DataCollect在images模式下各图片格式的持续保存帧率：
+TestCamera以较高帧率产生720x1080帧，经frame事件放入采集队列，由保存线程池编码并写入临时目录，
+统计稳定后每秒写入的帧数、队列积压和摄像头因背压跳过的帧数
+用法: python run/run_image_writer_benchmark.py --codecs png jpeg webp npy --threads 4 --fps 120 --seconds 10
+"""
+
+
+def run(codec, quality, args):
+    save_dir = tempfile.mkdtemp(prefix="image_writer_benchmark_")
+    data_collect = DataCollect(save_dir=save_dir)
+    data_collect.image_codec = codec
+    data_collect.image_quality = quality
+    data_collect.image_writer_threads = args.threads
+    camera = TestCamera({"fps": args.fps})
+    camera.on("frame", lambda frame: data_collect.put_video_frame(frame, camera_id=0),
+              inline=True, backlog=data_collect.video_queue.qsize)
+
+    data_collect.start()
+    data_collect.set_capture_state(1)
+    camera.start()
+    # 等待摄像头连接、保存线程进入稳定状态后再开始统计
+    time.sleep(args.warmup)
+    written_start = data_collect.image_writer.written
+    wall_start = time.perf_counter()
+    time.sleep(args.seconds)
+    written = data_collect.image_writer.written - written_start
+    wall = time.perf_counter() - wall_start
+    backlog = data_collect.video_queue.qsize()
+    stats = data_collect.image_writer.get_stats()
+    camera_metrics = camera.get_metrics()
+
+    camera.stop()
+    data_collect.set_capture_state(0)
+    data_collect.stop()
+    shutil.rmtree(save_dir, ignore_errors=True)
+
+    label = codec if quality is None else f"{codec}({quality})"
+    print(f"{label:<12} 持续保存 {written / wall:7.1f} fps  编码avg {stats['encode_avg_ms']:7.2f}ms  "
+          f"文件avg {stats['size_avg_kb']:8.1f}KB  队列积压 {backlog}  "
+          f"背压跳过 {camera_metrics['backpressure']['skipped']}  失败 {stats['failures']}")
+
+
+def parse_codec(text):
+    """png、png:3、jpeg:80等形式"""
+    codec, _, quality = text.partition(":")
+    return codec, int(quality) if quality else None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="DataCollect图片保存帧率测试")
+    parser.add_argument("--codecs", nargs="+", default=["png", "png:3", "jpeg", "webp", "npy"],
+                        help="图片格式，可带质量参数，例如png:3 jpeg:80")
+    parser.add_argument("--threads", type=int, default=4, help="保存线程数")
+    parser.add_argument("--fps", type=int, default=120, help="TestCamera帧率，应高于预期的保存帧率")
+    parser.add_argument("--warmup", type=float, default=2, help="预热时长(秒)")
+    parser.add_argument("--seconds", type=float, default=10, help="统计时长(秒)")
+    args = parser.parse_args()
+
+    print(f"保存线程 {args.threads}，TestCamera {args.fps}fps，统计 {args.seconds}s")
+    for text in args.codecs:
+        codec, quality = parse_codec(text)
+        run(codec, quality, args)
@@ -0,0 +1,65 @@
+from EasyTeleop.Device import DeviceProcess
+from EasyTeleop.Device.Robot import TestRobot
+from EasyTeleop.Device.Camera import TestCamera
+import argparse
+import threading
+import time
+
+"""
+对比设备在本进程中运行和在子进程(DeviceProcess)中运行时控制循环的抖动：
+本进程中同时运行摄像头和若干个纯Python计算线程（模拟IK解算、数据处理等持有GIL的负载），
+统计TestRobot主循环的实际频率、唤醒抖动和迭代耗时
+用法: python run/run_process_benchmark.py --fps 200 --load-threads 2 --seconds 10
+"""
+
+
+def gil_load(stop_event):
+    """持有GIL的纯Python计算"""
+    while not stop_event.is_set():
+        total = 0
+        for i in range(20000):
+            total += i * i
+
+
+def run(mode, args):
+    if mode == "in-process":
+        robot = TestRobot({"fps": args.fps})
+    else:
+        robot = DeviceProcess("Robot.TestRobot", {"fps": args.fps})
+    camera = TestCamera({"fps": 30})
+    states = []
+    robot.on("state", states.append, inline=True)
+
+    stop_event = threading.Event()
+    loads = [threading.Thread(target=gil_load, args=(stop_event,), daemon=True) for _ in range(args.load_threads)]
+    camera.start()
+    for thread in loads:
+        thread.start()
+    robot.start()
+    time.sleep(args.seconds)
+    stats = robot.get_loop_stats()
+
+    stop_event.set()
+    robot.stop()
+    camera.stop()
+
+    print(f"===== {mode} =====")
+    print(f"目标{stats['target_rate']:.1f}Hz 实际{stats['achieved_rate']:.2f}Hz "
+          f"抖动avg {stats['jitter_avg_ms']:.3f}ms max {stats['jitter_max_ms']:.3f}ms "
+          f"迭代耗时p50 {stats['duration_p50_ms']:.3f}ms p99 {stats['duration_p99_ms']:.3f}ms "
+          f"超时{stats['overruns']} 跳过{stats['skipped']}")
+    print(f"本进程收到state事件: {len(states)}")
+    print()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="本进程与子进程运行设备的控制循环抖动对比")
+    parser.add_argument("--fps", type=int, default=200, help="TestRobot主循环频率")
+    parser.add_argument("--load-threads", type=int, default=2, help="本进程中持有GIL的计算线程数")
+    parser.add_argument("--seconds", type=float, default=10, help="统计时长(秒)")
+    parser.add_argument("--mode", choices=["in-process", "process", "both"], default="both")
+    args = parser.parse_args()
+
+    modes = ["in-process", "process"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        run(mode, args)
@@ -38,7 +38,7 @@ if __name__ == '__main__':
         
         #注册回调函数
         # vrsocket.on("message",teleop.handle_socket_data)
-        @vrsocket.on("message")
+        @vrsocket.on("message", mailbox=True)
         def teleop_handle_socket_data(message):
             # print(message)
             if message['type'] == "controller":
@@ -2,10 +2,8 @@ from EasyTeleop.Components import TeleopMiddleware, DataCollect
 from EasyTeleop.Device.VR import VRSocket
 from EasyTeleop.Device.Robot import RealMan
 from EasyTeleop.Device.Camera import RealSenseCamera
-from EasyTeleop.Components.WebRTC import CameraDeviceStreamTrack
-from EasyTeleop.Components.WebRTC import UnityWebRTC
+from EasyTeleop.Components.Transport import WebRTCTransport
 import time
-import asyncio
 
 if __name__ == '__main__':
     try:
@@ -16,24 +14,14 @@ if __name__ == '__main__':
         teleop = TeleopMiddleware()
         camera1 = RealSenseCamera({"serial":"427622270438","target_fps": 30}) 
         camera2 = RealSenseCamera({"serial":"427622270277","target_fps": 30}) 
-        tracker1 = CameraDeviceStreamTrack()
-        tracker2 = CameraDeviceStreamTrack()
-        client1 = UnityWebRTC(connection_id="LeftEye", signaling_url="wss://webrtc.chainpray.top",tracker=tracker1)
-        client2 = UnityWebRTC(connection_id="RightEye", signaling_url="wss://webrtc.chainpray.top",tracker=tracker2)
+        # 视频发送到传输层，传输层只保留最新帧，推流慢时不影响摄像头
+        transport1 = WebRTCTransport("LeftEye", signaling_url="wss://webrtc.chainpray.top", max_fps=30)
+        transport2 = WebRTCTransport("RightEye", signaling_url="wss://webrtc.chainpray.top", max_fps=30)
+        transport1.attach(camera1)
+        transport2.attach(camera2)
         
         devices = [l_arm, r_arm, vrsocket, camera1,camera2]
         
-        def callback1(frame):
-            # print("LeftEye")
-            tracker1.put_frame(frame)
-            
-        def callback2(frame):
-            # print("RightEye")
-            tracker2.put_frame(frame)
-    
-        camera1.on("frame",callback1 )
-        camera2.on("frame",callback2 )
-        
         # 注册回调函数
         teleop.on("leftGripDown",l_arm.start_control)
         teleop.on("leftGripUp",l_arm.stop_control)
@@ -46,19 +34,8 @@ if __name__ == '__main__':
         l_arm.start()
         r_arm.start()
         vrsocket.start() #启动数据接收线程,理论要在注册回调函数之后,但在前面启动也不影响
-        
-        async def main():
-            # 并发运行多个 connect()
-            await asyncio.gather(
-                client1.connect(),
-                client2.connect(),
-                # print(f"设备连接状态: {[device.get_conn_status() for device in devices]}")
-            )
-
-        try:
-            asyncio.run(main())
-        except KeyboardInterrupt:
-            print("🛑 Interrupted")
+        transport1.start()
+        transport2.start()
 
         while True:
             connect_states = [device.get_conn_status() for device in devices]
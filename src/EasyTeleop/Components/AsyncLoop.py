@@ -0,0 +1,91 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Coroutine, Optional
+from .ThreadPlacement import get_thread_placement
+
+
+class BackgroundLoop:
+    """
+    常驻后台线程的asyncio事件循环
+    协程回调通过run_coroutine_threadsafe调度到该循环上执行，避免每次事件都新建和关闭事件循环
+    """
+
+    def __init__(self, name: str = "EasyTeleop-asyncio"):
+        """
+        :param name: 事件循环线程名称
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """获取事件循环，第一次访问时启动后台线程"""
+        loop = self._loop
+        if loop is not None and self._thread is not None and self._thread.is_alive():
+            return loop
+        with self._lock:
+            if self._loop is None or self._thread is None or not self._thread.is_alive():
+                self._start()
+            return self._loop
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        在后台事件循环中执行协程
+        :param coro: 协程对象
+        :return: concurrent.futures.Future
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """停止后台事件循环（通常无需调用，线程为守护线程）"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None:
+                return
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=timeout)
+            self._loop = None
+            self._thread = None
+
+    def _start(self) -> None:
+        """创建事件循环并启动线程，调用方需持有self._lock"""
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            get_thread_placement().apply()
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            try:
+                loop.run_forever()
+            finally:
+                loop.close()
+
+        thread = threading.Thread(target=run, name=self.name, daemon=True)
+        thread.start()
+        ready.wait()
+        self._loop = loop
+        self._thread = thread
+
+
+_default_loop: Optional[BackgroundLoop] = None
+_default_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """
+    获取进程级共享的后台事件循环
+    :return: BackgroundLoop
+    """
+    global _default_loop
+    if _default_loop is None:
+        with _default_loop_lock:
+            if _default_loop is None:
+                _default_loop = BackgroundLoop()
+    return _default_loop
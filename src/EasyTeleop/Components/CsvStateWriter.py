@@ -0,0 +1,105 @@
+import csv
+import threading
+import time
+from typing import Any, Dict, List
+
+
+class CsvStateWriter:
+    """
+    机械臂状态流（位姿、关节、夹爪）的CSV写入器，一个臂的一个数据流对应一个实例
+    - 文件在第一个样本到来时打开并保持打开，每个样本写一行宽格式: timestamp,<列0>,<列1>,...
+      表头由第一个样本决定：列表/元组为元素序号0..n-1，字典为键名
+    - 行先写入内存缓冲区，积压行数达到flush_rows或距上次落盘超过flush_interval秒时才flush，
+      不再每个样本open/close一次文件
+    - write/flush/close线程安全，close之后的write直接丢弃（会话已结束）
+    """
+
+    # 文件缓冲区大小(字节)，应大于flush_rows行的数据量，落盘时机由flush_rows/flush_interval决定
+    buffer_size: int = 1 << 20
+
+    def __init__(self, path: str, flush_interval: float = 1.0, flush_rows: int = 256):
+        """
+        :param path: CSV文件路径
+        :param flush_interval: 最长落盘间隔(秒)
+        :param flush_rows: 积压多少行后落盘
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+        self.columns: List[str] = None
+        self._keys = None
+        self._file = None
+        self._writer = None
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._closed = False
+        self._lock = threading.Lock()
+        # 统计: 写入行数、落盘次数
+        self.rows = 0
+        self.flushes = 0
+
+    def _open(self, data) -> None:
+        if isinstance(data, dict):
+            self._keys = list(data.keys())
+            self.columns = [str(key) for key in self._keys]
+        else:
+            self.columns = [str(i) for i in range(len(data))]
+        self._file = open(self.path, "w", newline="", encoding="utf-8", buffering=self.buffer_size)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(["timestamp"] + self.columns)
+        self._last_flush = time.monotonic()
+
+    def write(self, ts: float, data) -> None:
+        """
+        写入一个样本
+        :param ts: 时间戳(秒)
+        :param data: 列表/元组，或字典（按表头的键取值，缺少的键留空，表头之外的键忽略）
+        """
+        with self._lock:
+            if self._closed:
+                return
+            if self._file is None:
+                self._open(data)
+            if isinstance(data, dict):
+                values = [data.get(key, "") for key in self._keys or ()]
+            else:
+                values = list(data)
+            self._writer.writerow([f"{ts:.6f}"] + values)
+            self.rows += 1
+            self._pending += 1
+            if self._pending >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def flush_if_due(self) -> None:
+        """距上次落盘超过flush_interval且有积压时落盘，消费线程空闲时调用，数据流停顿时缓冲区中的行也能及时写入"""
+        with self._lock:
+            if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending:
+                self._flush()
+
+    def _flush(self) -> None:
+        self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self.flushes += 1
+
+    def close(self) -> None:
+        """落盘并关闭文件"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._writer = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        :return: 路径、写入行数和落盘次数
+        """
+        return {"path": self.path, "rows": self.rows, "flushes": self.flushes}
@@ -2,22 +2,110 @@ import queue
 import threading
 import time
 import os
-import csv
 import asyncio
-import cv2
 import json
-from typing import Callable
+from typing import Callable, Dict, Union
+from .EventBus import EventBus, event_info
+from .SharedFrameRing import SharedFrameRing
+from .FrameEncoder import EncodedFrame
+from .CsvStateWriter import CsvStateWriter
+from .NpyStateWriter import NpyStateWriter
+from .VideoRecorder import VideoRecorder
+from .ImageWriterPool import ImageWriterPool
+from .ThreadPlacement import get_thread_placement
+
+
+def _clock_anchor(samples: int = 5):
+    """
+    同时读取单调时钟和系统时钟，取多次采样中两次单调时钟读数间隔最小的一次，误差通常在微秒级
+    :return: (单调时间戳ns, 对应的time.time())
+    """
+    best = None
+    for _ in range(samples):
+        before = time.monotonic_ns()
+        wall = time.time()
+        after = time.monotonic_ns()
+        if best is None or after - before < best[0]:
+            best = (after - before, (before + after) // 2, wall)
+    return best[1], best[2]
+
+
+# 状态数据的记录格式: {格式名: (写入器, 文件扩展名)}
+STATE_FORMATS = {
+    "npy": (NpyStateWriter, ".npy"),
+    "csv": (CsvStateWriter, ".csv"),
+}
+
+
+# 队列满时的策略: drop_oldest丢弃队列中最旧的数据（视频只关心最新帧），block等待消费线程写入（不丢数据）
+DROP_POLICIES = ("drop_oldest", "block")
+
 
 class DataCollect:
-    def __init__(self, save_dir="datasets/temp"):
+    # 各数据流队列的最大长度（0为不限制），磁盘写入停顿时限制内存增长
+    queue_limits: Dict[str, int] = {"video": 120, "pose": 100000, "joint": 100000, "end_effector": 100000}
+    # 各数据流队列满时的策略，见DROP_POLICIES；状态数据默认block，不丢样本
+    drop_policies: Dict[str, str] = {"video": "drop_oldest", "pose": "block", "joint": "block", "end_effector": "block"}
+    # block策略入队的最长等待时间(秒)，超时的数据计为丢弃，磁盘长时间停顿时不会卡住设备线程
+    block_timeout: float = 0.5
+    # 有数据被丢弃时通过dropped事件上报丢弃计数的最短间隔(秒)
+    drop_report_interval: float = 1.0
+    # 状态数据（位姿、关节、夹爪）的记录格式: npy为可内存映射的二进制结构化数组，csv为文本
+    state_format: str = "npy"
+    # 状态数据（位姿、关节、夹爪）的落盘间隔(秒)和积压行数，任一达到即写入磁盘
+    state_flush_interval: float = 1.0
+    state_flush_rows: int = 256
+    # images模式的图片格式(png/jpeg/webp/npy)、质量参数（png为压缩级别0~9，jpeg/webp为0~100，None为默认值）和保存线程数
+    image_codec: str = "png"
+    image_quality: int = None
+    image_writer_threads: int = 4
+    # 视频帧的记录方式: images为每帧一个图片文件，video为每个摄像头一个视频文件加逐帧时间戳文件
+    video_format: str = "images"
+    # video模式的容器参数: 编码器四字符码、文件扩展名、名义帧率和编码质量
+    video_fourcc: str = "MJPG"
+    video_ext: str = ".avi"
+    video_fps: float = 30.0
+    video_quality: int = 90
+
+    def __init__(self, save_dir="datasets/temp", queue_limits: Dict[str, int] = None,
+                 drop_policies: Dict[str, str] = None):
+        """
+        :param save_dir: 数据保存目录
+        :param queue_limits: 覆盖部分数据流的队列长度，例如{"video": 300}
+        :param drop_policies: 覆盖部分数据流的队列满策略，例如{"pose": "drop_oldest"}
+        """
         self._events = {
-            "status_change": self._default_callback
+            "status_change": self._default_callback,
+            "error": self._default_error_callback,
+            "dropped": self._default_callback,
         }
+        # 事件总线，支持多订阅者
+        self.event_bus = EventBus(
+            name="DataCollect-events",
+            defaults=self._events,
+            noop=self._default_callback,
+            on_error=self._on_dispatch_error,
+        )
 
-        self.video_queue = queue.Queue()
-        self.pose_queue = queue.Queue()
-        self.joint_queue = queue.Queue()
-        self.end_effector_queue = queue.Queue()
+        self.queue_limits = {**type(self).queue_limits, **(queue_limits or {})}
+        self.drop_policies = {**type(self).drop_policies, **(drop_policies or {})}
+        for stream, policy in self.drop_policies.items():
+            if policy not in DROP_POLICIES:
+                raise ValueError(f"数据流{stream}的队列策略{policy}无效，可选 {list(DROP_POLICIES)}")
+        self.video_queue = queue.Queue(maxsize=self.queue_limits["video"])
+        self.pose_queue = queue.Queue(maxsize=self.queue_limits["pose"])
+        self.joint_queue = queue.Queue(maxsize=self.queue_limits["joint"])
+        self.end_effector_queue = queue.Queue(maxsize=self.queue_limits["end_effector"])
+        self._queues = {
+            "video": self.video_queue,
+            "pose": self.pose_queue,
+            "joint": self.joint_queue,
+            "end_effector": self.end_effector_queue,
+        }
+        # 当前会话各数据流因队列满丢弃的数据数量，会话开始时清零，结束时写入metadata.json的dropped字段
+        self.dropped = {stream: 0 for stream in self._queues}
+        self._drop_lock = threading.Lock()
+        self._last_drop_report = 0.0
         self.running = False
         self.save_dir = save_dir
         self.capture_state = 0  # 0: not capturing, 1: capturing
@@ -26,31 +114,40 @@ class DataCollect:
         self.pose_files = {}  # 为每个臂创建独立的文件
         self.joint_files = {}
         self.end_effector_files = {}
+        # 当前会话的状态写入器: {(数据流, 臂ID): NpyStateWriter或CsvStateWriter}，会话开始时创建，finish_session时关闭
+        self.state_writers = {}
         self.video_dir = None
+        # video模式下当前会话的视频文件: {摄像头ID: VideoRecorder}，第一帧到来时创建；会话结束后为None
+        self.video_recorders = None
+        self._video_lock = threading.Lock()
         os.makedirs(self.save_dir, exist_ok=True)
         self.video_consumer_thread = None
+        # images模式的图片保存线程池，start时创建
+        self.image_writer = None
         self.pose_consumer_thread = None
         self.joint_consumer_thread = None
         self.end_effector_consumer_thread = None
+        # 从共享帧缓冲区读取的摄像头: [(SharedFrameRing, camera_id)]
+        self.frame_rings = []
+        self.frame_ring_threads = []
+        # 单调时钟到系统时钟的映射，每个会话开始时更新并写入metadata.json的clock字段
+        self._clock_mono_ns, self._clock_wall = _clock_anchor()
 
-    def on(self, event_name: str, callback: Callable = None) -> Callable:
+    def on(self, event_name: str, callback: Callable = None, mailbox: bool = False, inline: bool = False,
+           backlog: Callable[[], int] = None) -> Callable:
         """
         注册事件回调函数 - 可作为装饰器或普通方法使用
+        同一事件可以注册多个回调，事件触发时按注册顺序执行；需要订阅句柄时使用event_bus.subscribe
         :param event_name: 事件名称
         :param callback: 回调函数（可选，当作为装饰器使用时不需要）
+        :param mailbox: 只接收最新值，回调处理不过来时跳过旧事件（适合显示、推流等只关心最新帧的消费者）
+        :param inline: 在触发事件的线程中直接执行，省去线程切换，只适合非阻塞且很快的回调（例如队列append）
+        :param backlog: 积压探针，返回回调方尚未处理的数据量（例如queue.qsize），设备据此做背压
         :return: 装饰器函数或注册结果
         """
         # 装饰器工厂模式
         def decorator(func):
-            if not callable(func):
-                raise ValueError("回调函数必须是可调用对象")
-                
-            # 如果事件存在则更新回调
-            if event_name in self._events:
-                self._events[event_name] = func
-            else:
-                # 如果事件不存在，添加新的事件处理器
-                self._events[event_name] = func
+            self.event_bus.subscribe(event_name, func, mailbox=mailbox, inline=inline, backlog=backlog)
             return func
         
         # 如果提供了callback参数，则按照原来的方式工作
@@ -60,50 +157,32 @@ class DataCollect:
         # 否则返回装饰器
         return decorator
 
-    def off(self, event_name: str) -> bool:
+    def off(self, event_name: str, callback: Callable = None) -> bool:
         """
         移除事件回调函数，恢复默认回调
         :param event_name: 事件名称
+        :param callback: 要移除的回调函数（可选，不传则移除该事件的全部回调）
         """
-        if event_name in self._events:
-            self._events[event_name] = self._default_callback
-            return True
-        
-        return False
+        if callback is not None:
+            return self.event_bus.remove(event_name, callback)
+        removed = self.event_bus.clear(event_name)
+        return removed or event_name in self._events
 
     def emit(self, event_name: str, *args, **kwargs) -> None:
         """
-        触发事件，执行注册的回调函数
-        事件处理应是非阻塞的，对于耗时操作应该在独立线程中执行
+        触发事件，按事件的投递策略执行所有注册的回调函数
         :param event_name: 事件名称
         :param args: 位置参数
         :param kwargs: 关键字参数
         """
-        if event_name in self._events:
-            try:
-                # self._events[event_name](*args, **kwargs)
-                # 异步执行回调函数以避免阻塞事件循环
-                callback = self._events[event_name]
-                if asyncio.iscoroutinefunction(callback):
-                    # 如果是异步函数，在新事件循环中运行
-                    thread = threading.Thread(target=self._run_async_callback, args=(callback, args, kwargs), daemon=True)
-                    thread.start()
-                else:
-                    # 同步函数在新线程中运行以避免阻塞
-                    thread = threading.Thread(target=callback, args=args, kwargs=kwargs, daemon=True)
-                    thread.start()
-            except Exception as e:
-                self.emit("error", f"事件{event_name}执行失败: {str(e)}")
+        self.event_bus.publish(event_name, *args, **kwargs)
 
-    def _run_async_callback(self, callback, args, kwargs):
-        """运行异步回调函数"""
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(callback(*args, **kwargs))
-            loop.close()
-        except Exception as e:
-            self.emit("error", f"异步事件回调执行失败: {str(e)}")
+    def _on_dispatch_error(self, event_name: str, error: Exception) -> None:
+        """分发线程中回调执行失败时，通过error事件上报"""
+        if event_name == "error":
+            print(f"数据采集{self.__class__.__name__}的error回调执行失败: {error}")
+            return
+        self.emit("error", f"事件{event_name}执行失败: {str(error)}")
 
     def _default_callback(self, *args, **kwargs) -> None:
         """默认回调函数，什么也不做"""
@@ -112,29 +191,163 @@ class DataCollect:
         """默认错误回调函数，打印错误信息"""
         print(f"设备{self.__class__.__name__}发生错误: {error_msg}")
 
+    def _source_time(self) -> float:
+        """
+        当前事件在源头的时间，由事件信封中的单调时间戳按会话的时钟映射换算为time.time()刻度
+        同一会话内的时间戳只依赖单调时钟，不受系统时间调整影响；不在事件回调中调用时使用当前时间
+        """
+        info = event_info()
+        return self._session_time(info.mono_ns if info is not None else time.monotonic_ns())
+
+    def _session_time(self, mono_ns: int) -> float:
+        """把源头单调时间戳(ns)按会话的时钟映射换算为time.time()刻度"""
+        return self._clock_wall + (mono_ns - self._clock_mono_ns) / 1e9
+
+    def _put(self, stream: str, item) -> None:
+        """
+        按数据流的队列策略入队：block在队列满时等待消费线程（最多block_timeout秒），drop_oldest丢弃最旧的数据后入队，
+        丢弃的数据都会计数；消费线程没有运行时不等待
+        :param stream: 数据流名称 video / pose / joint / end_effector
+        :param item: 队列元素
+        """
+        q = self._queues[stream]
+        if self.drop_policies[stream] == "block":
+            try:
+                if self.running:
+                    q.put(item, timeout=self.block_timeout)
+                else:
+                    q.put_nowait(item)
+            except queue.Full:
+                self._count_drop(stream)
+            return
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                    q.task_done()
+                except queue.Empty:
+                    # 消费线程刚好取走了数据，重新入队
+                    continue
+                self._count_drop(stream)
+
+    def _count_drop(self, stream: str) -> None:
+        """记录一次丢弃，距上次上报超过drop_report_interval时通过dropped事件上报当前会话各数据流的丢弃计数"""
+        now = time.monotonic()
+        with self._drop_lock:
+            self.dropped[stream] += 1
+            report = now - self._last_drop_report >= self.drop_report_interval
+            if report:
+                self._last_drop_report = now
+        if report:
+            self.emit("dropped", self.get_dropped())
+
+    def get_dropped(self) -> Dict[str, int]:
+        """
+        :return: 当前会话各数据流因队列满丢弃的数据数量
+        """
+        with self._drop_lock:
+            return dict(self.dropped)
+
+    def get_queue_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        :return: 各数据流队列的积压、上限、策略和丢弃数量
+        """
+        dropped = self.get_dropped()
+        return {
+            stream: {
+                "size": q.qsize(),
+                "limit": self.queue_limits[stream],
+                "policy": self.drop_policies[stream],
+                "dropped": dropped[stream],
+            }
+            for stream, q in self._queues.items()
+        }
+
     def put_video_frame(self, frame, ts=None, camera_id=0):
         """向视频队列添加帧（frame为numpy数组），附带时间戳和摄像头ID"""
         if ts is None:
-            ts = time.time()
-        self.video_queue.put((ts, frame, camera_id))
+            # 使用事件在源头的单调时间戳，不包含分发和线程切换的延迟；emit_batch同一次读取的数据时间戳一致
+            ts = self._source_time()
+        self._put("video", (ts, frame, camera_id))
+
+    def put_encoded_frame(self, encoded: EncodedFrame, camera_id=0):
+        """向视频队列添加已经编码的帧（摄像头enable_encoding后的encoded_frame事件），保存时直接写入编码后的字节"""
+        # 由encoded_frame事件触发时信封中是原始帧的源头时间戳
+        ts = self._source_time() if event_info() is not None else encoded.ts
+        self._put("video", (ts, encoded, camera_id))
 
     def put_robot_pose(self, pose_data, arm_id=0, ts=None):
         """向机械臂位姿队列添加数据，附带时间戳和臂ID"""
         if ts is None:
-            ts = time.time()
-        self.pose_queue.put((ts, pose_data, arm_id))
+            # 使用事件在源头的单调时间戳，不包含分发和线程切换的延迟；emit_batch同一次读取的数据时间戳一致
+            ts = self._source_time()
+        self._put("pose", (ts, pose_data, arm_id))
         
     def put_robot_joint(self, joint_data, arm_id=0, ts=None):
         """向机械臂关节队列添加数据，附带时间戳和臂ID"""
         if ts is None:
-            ts = time.time()
-        self.joint_queue.put((ts, joint_data, arm_id))
+            # 使用事件在源头的单调时间戳，不包含分发和线程切换的延迟；emit_batch同一次读取的数据时间戳一致
+            ts = self._source_time()
+        self._put("joint", (ts, joint_data, arm_id))
 
     def put_end_effector_state(self, end_effector_state, arm_id=0, ts=None):
         """向夹爪状态队列添加状态，附带时间戳和臂ID"""
         if ts is None:
-            ts = time.time()
-        self.end_effector_queue.put((ts, end_effector_state, arm_id))
+            # 使用事件在源头的单调时间戳，不包含分发和线程切换的延迟；emit_batch同一次读取的数据时间戳一致
+            ts = self._source_time()
+        self._put("end_effector", (ts, end_effector_state, arm_id))
+
+    def attach_frame_ring(self, ring: Union[SharedFrameRing, str], camera_id=0) -> None:
+        """
+        从共享帧缓冲区读取摄像头帧，代替在相机的frame事件中调用put_video_frame
+        相机可以运行在另一个进程中，帧通过共享内存传递，不与采集共享GIL
+        :param ring: SharedFrameRing或共享内存名称（BaseCamera.enable_shared_frames的返回值），
+                     传名称时相机还没有写入第一帧也可以，读取线程会等待共享内存创建后再附加
+        :param camera_id: 摄像头ID
+        """
+        self.frame_rings.append((ring, camera_id))
+        if self.running:
+            self._start_frame_ring_thread(ring, camera_id)
+
+    def _start_frame_ring_thread(self, ring, camera_id):
+        thread = threading.Thread(target=get_thread_placement().wrap(self._consume_frame_ring), args=(ring, camera_id),
+                                  name=f"DataCollect-ring{camera_id}", daemon=True)
+        self.frame_ring_threads.append(thread)
+        thread.start()
+
+    def _consume_frame_ring(self, ring, camera_id):
+        """读取共享帧缓冲区线程：有新帧时拷贝出来放入视频队列"""
+        name = ring if isinstance(ring, str) else None
+        while name is not None and self.running:
+            try:
+                ring = SharedFrameRing(name)
+                break
+            except (FileNotFoundError, ValueError):
+                # 相机在第一帧到来时才创建共享内存；刚创建、头部还没写完时附加会得到ValueError，稍后重试
+                time.sleep(0.1)
+        if not self.running:
+            return
+        last_seq = ring.latest_seq
+        while self.running:
+            seq = ring.wait(last_seq, timeout=0.1)
+            if not seq:
+                continue
+            if self.capture_state != 1:
+                last_seq = seq
+                continue
+            # 依次读取错过的帧，已经被覆盖的帧跳过
+            for next_seq in range(max(last_seq + 1, seq - ring.slots + 1), seq + 1):
+                item = ring.read_stamped(next_seq)
+                if item is not None:
+                    # 与其他数据流一样使用源头单调时间戳按会话的时钟映射换算，旧版写入方没有记录时使用其时间戳
+                    ts = self._session_time(item[2]) if item[2] else item[1]
+                    self._put("video", (ts, item[3], camera_id))
+            last_seq = seq
+        if name is not None:
+            ring.close()
 
     def set_capture_state(self, state) -> bool:
         """设置采集状态"""
@@ -160,41 +373,104 @@ class DataCollect:
     def _start_new_session(self):
         """开始新的采集会话，创建时间戳文件夹"""
         self.session_timestamp = time.strftime("%Y%m%d_%H%M%S")
+        with self._drop_lock:
+            self.dropped = {stream: 0 for stream in self._queues}
+        # 记录时钟映射：数据中的时间戳 = wall + (源头单调时间 - monotonic)
+        self._clock_mono_ns, self._clock_wall = _clock_anchor()
+        self.metadata["clock"] = {
+            "monotonic": self._clock_mono_ns / 1e9,
+            "wall": self._clock_wall,
+            "source": "monotonic",
+        }
         session_dir = os.path.join(self.save_dir, self.session_timestamp)
         self.video_dir = os.path.join(session_dir, "frames")
         
-        # 为每个臂创建独立的数据文件
+        # 为每个臂创建独立的数据文件，文件在第一个样本到来时创建，表头（字段）由样本决定
+        writer_class, ext = STATE_FORMATS[self.state_format]
+        writers = {}
         for arm_id in [0, 1]:  # 支持两个臂
             arm_dir = os.path.join(session_dir, f"arm_{arm_id}")
             os.makedirs(arm_dir, exist_ok=True)
             
-            self.pose_files[arm_id] = os.path.join(arm_dir, "poses.csv")
-            self.joint_files[arm_id] = os.path.join(arm_dir, "joints.csv")
-            self.end_effector_files[arm_id] = os.path.join(arm_dir, "end_effector.csv")
-            
-            # Create CSV files with headers
-            with open(self.pose_files[arm_id], "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["timestamp", "index", "value"])
-                
-            with open(self.joint_files[arm_id], "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["timestamp", "index", "value"])
-                
-            with open(self.end_effector_files[arm_id], "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["timestamp", "index", "value"])
+            self.pose_files[arm_id] = os.path.join(arm_dir, f"poses{ext}")
+            self.joint_files[arm_id] = os.path.join(arm_dir, f"joints{ext}")
+            self.end_effector_files[arm_id] = os.path.join(arm_dir, f"end_effector{ext}")
+            for stream, path in (("pose", self.pose_files[arm_id]), ("joint", self.joint_files[arm_id]),
+                                 ("end_effector", self.end_effector_files[arm_id])):
+                writers[(stream, arm_id)] = writer_class(path, flush_interval=self.state_flush_interval,
+                                                         flush_rows=self.state_flush_rows)
+        self._close_state_writers()
+        self.state_writers = writers
 
         os.makedirs(self.video_dir, exist_ok=True)
+        with self._video_lock:
+            self.video_recorders = {}
         
     def register_device(self, device_name, device_info):
         """注册设备信息到元数据中"""
         self.metadata["devices"][device_name] = device_info
 
+    def _write_state(self, stream: str, arm_id, ts: float, data) -> None:
+        """把一个状态样本写入当前会话对应的写入器，没有对应写入器（未知臂ID或会话已结束）时丢弃"""
+        writer = self.state_writers.get((stream, arm_id))
+        if writer is not None:
+            writer.write(ts, data)
+
+    def _flush_state_writers(self, stream: str) -> None:
+        """消费线程空闲时调用，把超过落盘间隔的缓冲行写入磁盘"""
+        for (name, _), writer in list(self.state_writers.items()):
+            if name == stream:
+                writer.flush_if_due()
+
+    def _close_state_writers(self) -> None:
+        """落盘并关闭当前会话的所有状态文件"""
+        writers, self.state_writers = self.state_writers, {}
+        for writer in writers.values():
+            writer.close()
+
+    def _record_video_frame(self, ts, frame, camera_id) -> bool:
+        """
+        video模式：把帧写入摄像头对应的视频文件
+        视频文件创建或写入失败时上报错误，该摄像头本会话剩余的帧改为逐帧保存图片
+        :return: 是否已由视频文件处理，False表示应按images模式保存
+        """
+        with self._video_lock:
+            if self.video_recorders is None:
+                return True
+            if camera_id not in self.video_recorders:
+                path = os.path.join(self.video_dir, f"camera_{camera_id}{self.video_ext}")
+                self.video_recorders[camera_id] = VideoRecorder(path, fps=self.video_fps, fourcc=self.video_fourcc,
+                                                                quality=self.video_quality)
+            recorder = self.video_recorders[camera_id]
+        if recorder is None:
+            return False
+        try:
+            recorder.write(ts, frame)
+            return True
+        except Exception as e:
+            with self._video_lock:
+                if self.video_recorders is not None:
+                    self.video_recorders[camera_id] = None
+            recorder.close()
+            self.emit("error", f"摄像头{camera_id}视频写入失败，改为保存图片: {e}")
+            return False
+
+    def _close_video_recorders(self) -> None:
+        """结束当前会话的所有视频文件"""
+        with self._video_lock:
+            recorders, self.video_recorders = self.video_recorders, None
+        for recorder in (recorders or {}).values():
+            if recorder is not None:
+                recorder.close()
+
     def finish_session(self):
-        """结束当前会话，保存元数据"""
+        """结束当前会话，关闭状态文件和视频文件并保存元数据"""
+        self._close_state_writers()
+        self._close_video_recorders()
         if self.session_timestamp:
             self.metadata["end_time"] = time.time()
+            # 各数据流因队列满丢弃的数据数量
+            self.metadata["dropped"] = self.get_dropped()
             session_dir = os.path.join(self.save_dir, self.session_timestamp)
             metadata_file = os.path.join(session_dir, "metadata.json")
             
@@ -206,14 +482,21 @@ class DataCollect:
         if not self.running:
             self.running = True
             # 启动四个独立的消费线程
-            self.video_consumer_thread = threading.Thread(target=self._consume_video, daemon=True)
-            self.pose_consumer_thread = threading.Thread(target=self._consume_pose, daemon=True)
-            self.joint_consumer_thread = threading.Thread(target=self._consume_joint, daemon=True)
-            self.end_effector_consumer_thread = threading.Thread(target=self._consume_end_effector, daemon=True)
+            placement = get_thread_placement()
+            self.image_writer = ImageWriterPool(workers=self.image_writer_threads, codec=self.image_codec,
+                                                quality=self.image_quality, name="DataCollect-writer",
+                                                on_error=lambda error: self.emit("error", error))
+            self.image_writer.start()
+            self.video_consumer_thread = threading.Thread(target=placement.wrap(self._consume_video), name="DataCollect-video", daemon=True)
+            self.pose_consumer_thread = threading.Thread(target=placement.wrap(self._consume_pose), name="DataCollect-pose", daemon=True)
+            self.joint_consumer_thread = threading.Thread(target=placement.wrap(self._consume_joint), name="DataCollect-joint", daemon=True)
+            self.end_effector_consumer_thread = threading.Thread(target=placement.wrap(self._consume_end_effector), name="DataCollect-end_effector", daemon=True)
             self.video_consumer_thread.start()
             self.pose_consumer_thread.start()
             self.joint_consumer_thread.start()
             self.end_effector_consumer_thread.start()
+            for ring, camera_id in self.frame_rings:
+                self._start_frame_ring_thread(ring, camera_id)
 
     def stop(self):
         """停止消费线程"""
@@ -226,81 +509,82 @@ class DataCollect:
             self.joint_consumer_thread.join()
         if self.end_effector_consumer_thread:
             self.end_effector_consumer_thread.join()
+        for thread in self.frame_ring_threads:
+            thread.join()
+        self.frame_ring_threads = []
+        # 写完已经交给保存线程池的帧
+        if self.image_writer:
+            self.image_writer.stop()
+        # 采集中途停止时也把缓冲的状态数据写入磁盘，并结束视频文件
+        self._close_state_writers()
+        self._close_video_recorders()
+        self.event_bus.shutdown()
         
 
-    def _consume_video(self):
-        """消费视频帧线程：不断取出视频队列头部数据并存储到本地"""
+    def _consume(self, stream: str, handle: Callable, idle: Callable = None) -> None:
+        """
+        消费线程主循环：不断取出队列头部数据交给handle保存，保存失败时通过error事件上报，线程继续运行
+        :param stream: 数据流名称
+        :param handle: 处理一个队列元素
+        :param idle: 队列为空时调用（例如把缓冲的数据写入磁盘）
+        """
+        q = self._queues[stream]
         while self.running:
             try:
-                ts, frame, camera_id = self.video_queue.get(timeout=0.1)
-                # Check capture state before saving
-                if self.capture_state == 1 and self.video_dir:
-                    # 为每个摄像头创建独立的子目录
-                    camera_dir = os.path.join(self.video_dir, f"camera_{camera_id}")
-                    os.makedirs(camera_dir, exist_ok=True)
-                    # 保存为PNG格式以保留原始数据
-                    filename = os.path.join(camera_dir, f"frame_{ts:.3f}.png")
-                    cv2.imwrite(filename, frame)
-                self.video_queue.task_done()
+                item = q.get(timeout=0.1)
             except queue.Empty:
-                pass
+                if idle is not None:
+                    try:
+                        idle()
+                    except Exception as e:
+                        self.emit("error", f"写入{stream}数据失败: {e}")
+                continue
+            try:
+                handle(*item)
+            except Exception as e:
+                self.emit("error", f"保存{stream}数据失败: {e}")
+            finally:
+                q.task_done()
+
+    def _consume_video(self):
+        """消费视频帧线程：不断取出视频队列头部数据并存储到本地"""
+        self._consume("video", self._save_video_frame)
+
+    def _save_video_frame(self, ts, frame, camera_id):
+        # Check capture state before saving
+        if self.capture_state != 1 or not self.video_dir:
+            return
+        # 每个摄像头一个视频文件，视频文件不可用时退回逐帧保存图片
+        if self.video_format != "video" or not self._record_video_frame(ts, frame, camera_id):
+            # 为每个摄像头创建独立的子目录
+            camera_dir = os.path.join(self.video_dir, f"camera_{camera_id}")
+            os.makedirs(camera_dir, exist_ok=True)
+            # 编码和写入在保存线程池中进行，同一摄像头按顺序写入；摄像头已经编码过的帧直接写入字节
+            self.image_writer.submit(os.path.join(camera_dir, f"frame_{ts:.6f}"), frame, key=camera_id)
 
     def _consume_pose(self):
         """消费机械臂位姿线程：不断取出位姿队列头部数据并存储到本地"""
-        while self.running:
-            try:
-                ts, pose_data, arm_id = self.pose_queue.get(timeout=0.1)
-                # Check capture state before saving
-                if self.capture_state == 1 and arm_id in self.pose_files:
-                    # pose_data是位姿数组
-                    if isinstance(pose_data, (list, tuple)):
-                        with open(self.pose_files[arm_id], "a", newline="", encoding="utf-8") as f:
-                            writer = csv.writer(f)
-                            for i, value in enumerate(pose_data):
-                                writer.writerow([f"{ts:.3f}", i, value])
-                        
-                self.pose_queue.task_done()
-            except queue.Empty:
-                pass
+        self._consume("pose", self._save_pose, lambda: self._flush_state_writers("pose"))
+
+    def _save_pose(self, ts, pose_data, arm_id):
+        # pose_data是位姿数组，每个样本写一行
+        if self.capture_state == 1 and isinstance(pose_data, (list, tuple)):
+            self._write_state("pose", arm_id, ts, pose_data)
 
     def _consume_joint(self):
         """消费机械臂关节线程：不断取出关节队列头部数据并存储到本地"""
-        while self.running:
-            try:
-                ts, joint_data, arm_id = self.joint_queue.get(timeout=0.1)
-                # Check capture state before saving
-                if self.capture_state == 1 and arm_id in self.joint_files:
-                    # joint_data是关节数组
-                    if isinstance(joint_data, (list, tuple)):
-                        with open(self.joint_files[arm_id], "a", newline="", encoding="utf-8") as f:
-                            writer = csv.writer(f)
-                            for i, value in enumerate(joint_data):
-                                writer.writerow([f"{ts:.3f}", i, value])
-                        
-                self.joint_queue.task_done()
-            except queue.Empty:
-                pass
+        self._consume("joint", self._save_joint, lambda: self._flush_state_writers("joint"))
+
+    def _save_joint(self, ts, joint_data, arm_id):
+        # joint_data是关节数组，每个样本写一行
+        if self.capture_state == 1 and isinstance(joint_data, (list, tuple)):
+            self._write_state("joint", arm_id, ts, joint_data)
 
     def _consume_end_effector(self):
         """消费夹爪状态线程：不断取出夹爪队列头部数据并存储到本地"""
-        while self.running:
-            try:
-                ts, end_effector, arm_id = self.end_effector_queue.get(timeout=0.1)
-                # Check capture state before saving
-                if self.capture_state == 1 and arm_id in self.end_effector_files:
-                    # 写入夹爪数据到end_effector.csv
-                    if isinstance(end_effector, (list, tuple, dict)):
-                        with open(self.end_effector_files[arm_id], "a", newline="", encoding="utf-8") as f:
-                            writer = csv.writer(f)
-                            if isinstance(end_effector, dict):
-                                # 如果是字典，遍历键值对
-                                for key, value in end_effector.items():
-                                    writer.writerow([f"{ts:.3f}", key, value])
-                            else:
-                                # 如果是列表或元组，遍历索引和值
-                                for i, value in enumerate(end_effector):
-                                    writer.writerow([f"{ts:.3f}", i, value])
-                        
-                self.end_effector_queue.task_done()
-            except queue.Empty:
-                pass
\ No newline at end of file
+        self._consume("end_effector", self._save_end_effector, lambda: self._flush_state_writers("end_effector"))
+
+    def _save_end_effector(self, ts, end_effector, arm_id):
+        # 写入夹爪数据，字典的列为键名，列表或元组的列为索引
+        if self.capture_state == 1 and isinstance(end_effector, (list, tuple, dict)):
+            self._write_state("end_effector", arm_id, ts, end_effector)
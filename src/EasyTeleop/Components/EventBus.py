@@ -0,0 +1,740 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from .EventDispatcher import EventDispatcher
+from .AsyncLoop import get_background_loop
+from .EventTrace import EventTrace, get_event_trace, TRACE_PUBLISH, TRACE_DELIVER, TRACE_INLINE, TRACE_MAILBOX
+
+# 投递策略
+POLICY_INLINE = "inline"    # 在触发事件的线程中直接执行回调
+POLICY_POOLED = "pooled"    # 提交到分发器的工作线程执行，同名事件按顺序执行
+POLICY_LATEST = "latest"    # 只保留最新一次未执行的事件，旧的事件被合并(跳过)
+POLICIES = (POLICY_INLINE, POLICY_POOLED, POLICY_LATEST)
+
+# 同一主题(订阅)的延迟/超时告警最短间隔
+_LATENCY_WARN_INTERVAL_NS = 1_000_000_000
+
+
+# 正在执行的回调所属事件的信封字段(topic, seq, mono_ns, ts)，event_info()被调用时才生成EventInfo
+_event_context = threading.local()
+
+
+class EventInfo:
+    """
+    事件信封：发布时在源头记录字段，随事件一起投递，回调中调用event_info()时才生成对象，
+    不读取信封的订阅者不需要为每次发布分配EventInfo
+    - mono_ns: 源头的time.monotonic_ns()，emit_batch可以传入取数时刻的值，不受分发线程切换和系统时间调整影响
+    - seq: 主题在该总线上的发布序号，从1开始，可以用来发现丢失的事件
+    - ts: 批量事件共享的time.time()时间戳，单独发布时为None
+    """
+    __slots__ = ("topic", "seq", "mono_ns", "ts")
+
+    def __init__(self, topic: str, seq: int, mono_ns: int, ts: Optional[float] = None):
+        self.topic = topic
+        self.seq = seq
+        self.mono_ns = mono_ns
+        self.ts = ts
+
+    def __repr__(self) -> str:
+        return f"EventInfo(topic={self.topic!r}, seq={self.seq}, mono_ns={self.mono_ns}, ts={self.ts})"
+
+
+def event_info() -> Optional[EventInfo]:
+    """
+    获取当前回调所属事件的信封（源头单调时间戳和序号）
+    在同步回调中调用（inline/pooled/mailbox均可），协程回调和总线之外调用时返回None
+    :return: EventInfo或None
+    """
+    envelope = getattr(_event_context, "envelope", None)
+    return EventInfo(*envelope) if envelope is not None else None
+
+
+def event_time() -> Optional[float]:
+    """
+    获取当前回调所属批量事件的共享时间戳
+    在publish_batch/emit_batch投递的同步回调中调用，返回整批事件共用的time.time()时间戳，其他情况返回None
+    :return: 时间戳（秒）或None
+    """
+    envelope = getattr(_event_context, "envelope", None)
+    return envelope[3] if envelope is not None else None
+
+
+def _swap_event_info(envelope: Optional[tuple]) -> Optional[tuple]:
+    """设置当前线程的事件信封字段，返回之前的值以便恢复"""
+    prev = getattr(_event_context, "envelope", None)
+    _event_context.envelope = envelope
+    return prev
+
+
+class EventLatencyWarning(RuntimeError):
+    """协程回调从调度到开始执行的延迟超过阈值，通过on_error上报"""
+
+
+class EventBudgetWarning(RuntimeError):
+    """inline订阅的回调执行时间超过预算，会拖慢触发事件的线程（例如设备主循环），通过on_error上报"""
+
+
+class Subscription:
+    """
+    订阅句柄，由EventBus.subscribe返回，可用于取消订阅
+    mailbox订阅只保存最新一次未处理的事件，处理不过来时旧事件被合并，合并次数记录在coalesced中
+    inline订阅在触发事件的线程中直接执行，执行时间超过budget_ns的次数记录在overruns中
+    backlog为订阅者提供的积压探针，返回订阅者内部尚未处理的数据量（例如队列长度），用于背压
+    """
+    __slots__ = (
+        "topic", "callback", "is_async", "active", "mailbox", "inline", "backlog", "_bus",
+        "delivered", "coalesced", "lock", "latest", "scheduled", "lane", "drain_args",
+        "budget_ns", "overruns", "max_duration_ns", "warned_ns", "latency_max_ns",
+    )
+
+    def __init__(self, bus: "EventBus", topic: str, callback: Callable, mailbox: bool = False,
+                 inline: bool = False, budget_ns: int = 0, backlog: Callable[[], int] = None):
+        self._bus = bus
+        self.topic = topic
+        self.callback = callback
+        self.is_async = asyncio.iscoroutinefunction(callback)
+        self.active = True
+        self.mailbox = mailbox
+        self.inline = inline
+        self.backlog = backlog
+
+        self.delivered = 0
+        self.coalesced = 0
+        # inline订阅的执行时间预算与超时统计
+        self.budget_ns = budget_ns
+        self.overruns = 0
+        self.max_duration_ns = 0
+        self.warned_ns = 0
+        # mailbox使用的待投递槽位，每个mailbox订阅使用独立的分发lane
+        self.lock = threading.Lock() if mailbox else None
+        self.latest = None
+        self.scheduled = False
+        self.lane = f"{topic}@mailbox-{id(self):x}" if mailbox else topic
+        self.drain_args = None
+        # mailbox投递的最大延迟，单独统计，不计入主题的投递延迟
+        self.latency_max_ns = 0
+
+    def unsubscribe(self) -> bool:
+        """
+        取消订阅
+        :return: 是否取消成功（已经取消过返回False）
+        """
+        return self._bus.unsubscribe(self)
+
+    def __repr__(self) -> str:
+        return f"Subscription(topic={self.topic!r}, callback={self.callback!r}, active={self.active})"
+
+
+class _Topic:
+    """单个事件主题：订阅者列表、投递策略和统计计数"""
+    __slots__ = (
+        "name", "policy", "subscribers", "inlines", "mailboxes", "fallback",
+        "inline_calls", "inline_overruns",
+        "published", "delivered", "dropped", "coalesced",
+        "latency_total_ns", "latency_max_ns",
+        "async_delivered", "async_failed", "async_latency_total_ns", "async_latency_max_ns", "async_warned_ns",
+        "lock", "latest", "scheduled", "drain_args",
+    )
+
+    def __init__(self, name: str, policy: str):
+        self.name = name
+        self.policy = policy
+        # 订阅者元组，变更时整体替换(copy-on-write)，发布时无需加锁和复制
+        self.subscribers: Tuple[Subscription, ...] = ()
+        # inline订阅者元组，不论主题的投递策略，总是在触发事件的线程中执行
+        self.inlines: Tuple[Subscription, ...] = ()
+        # mailbox订阅者元组，每个订阅者只接收最新值
+        self.mailboxes: Tuple[Subscription, ...] = ()
+        # 没有订阅者时使用的默认回调
+        self.fallback: Optional[Subscription] = None
+
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.latency_total_ns = 0
+        self.latency_max_ns = 0
+        self.inline_calls = 0
+        self.inline_overruns = 0
+        # 协程回调的调度延迟（提交到事件循环 -> 开始执行）
+        self.async_delivered = 0
+        self.async_failed = 0
+        self.async_latency_total_ns = 0
+        self.async_latency_max_ns = 0
+        self.async_warned_ns = 0
+
+        # latest策略使用的待投递槽位
+        self.lock = threading.Lock()
+        self.latest = None
+        self.scheduled = False
+        self.drain_args = (self,)
+
+
+class EventBus:
+    """
+    多订阅者事件总线，供设备、遥操中间件、数据采集和遥操组共用
+    - 每个主题可以有多个订阅者，subscribe返回订阅句柄
+    - 主题没有订阅者时回退到defaults中的默认回调（与原先_events字典的语义一致）
+    - 每个主题可以单独设置投递策略：inline / pooled / latest
+    - 单个订阅可以使用mailbox模式：处理慢的订阅者只看到最新值，不会拖慢其他订阅者的队列
+    - 单个订阅可以声明inline：开销很小的回调直接在触发线程执行，省去线程切换；超过时间预算时计数并上报
+    - 每个主题统计发布次数、投递次数、丢弃/合并次数和投递延迟
+    """
+
+    def __init__(self, name: str = "EventBus", defaults: Dict[str, Callable] = None, noop: Callable = None,
+                 policy: str = POLICY_POOLED, dispatcher: EventDispatcher = None,
+                 num_workers: int = 0, queue_size: int = 64,
+                 on_error: Optional[Callable[[str, Exception], None]] = None,
+                 loop: asyncio.AbstractEventLoop = None, async_latency_budget_ms: float = 100.0,
+                 inline_budget_ms: float = 2.0, trace: EventTrace = None):
+        """
+        :param name: 总线名称，用作分发线程名前缀
+        :param defaults: 默认回调字典，事件名 -> 回调，传入所属对象的_events以便子类继续扩展
+        :param noop: 空回调，等于它的默认回调不会被投递
+        :param policy: 主题的默认投递策略
+        :param dispatcher: 共享的事件分发器，不传则创建独立的分发器
+        :param num_workers: 独立分发器的工作线程数量，0为每个主题一个工作线程
+        :param queue_size: 独立分发器每个线程的队列深度
+        :param on_error: 回调执行异常时的处理函数，参数为(事件名, 异常)
+        :param loop: 执行协程回调的事件循环，不传则使用进程共享的后台事件循环
+        :param async_latency_budget_ms: 协程回调调度延迟阈值（毫秒），超过时通过on_error上报，0为不检查
+        :param inline_budget_ms: inline订阅的默认执行时间预算（毫秒），超过时通过on_error上报，0为不检查
+        :param trace: 事件追踪器，不传则使用进程共享的追踪器（默认关闭）
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"不支持的投递策略: {policy}")
+        self.name = name
+        self.policy = policy
+        self._defaults = defaults if defaults is not None else {}
+        self._noop = noop
+        self._on_error = on_error
+        self._loop = loop
+        self.async_latency_budget_ns = int(async_latency_budget_ms * 1e6)
+        self.inline_budget_ns = int(inline_budget_ms * 1e6)
+        self.trace = trace or get_event_trace()
+        self._topics: Dict[str, _Topic] = {}
+        # 仅在订阅关系变更时加锁
+        self._lock = threading.Lock()
+        self.dispatcher = dispatcher or EventDispatcher(
+            name=name,
+            num_workers=num_workers,
+            queue_size=queue_size,
+            on_error=self._report_error,
+            on_drop=self._on_drop,
+        )
+
+    # ------------------------------------------------------------------
+    # 订阅管理
+    # ------------------------------------------------------------------
+    def subscribe(self, topic: str, callback: Callable, mailbox: bool = False, inline: bool = False,
+                  budget_ms: float = None, backlog: Callable[[], int] = None) -> Subscription:
+        """
+        订阅主题
+        :param topic: 主题（事件名称）
+        :param callback: 回调函数，可以是普通函数或协程函数
+        :param mailbox: 是否使用mailbox模式，只投递最新一次未处理的事件
+        :param inline: 是否在触发事件的线程中直接执行，只适合非阻塞且很快的回调（例如队列append）
+        :param budget_ms: inline回调的执行时间预算（毫秒），不传使用总线的inline_budget_ms
+        :param backlog: 积压探针，返回订阅者尚未处理的数据量（例如queue.qsize），发布方据此做背压
+        :return: 订阅句柄
+        """
+        if not callable(callback):
+            raise ValueError("回调函数必须是可调用对象")
+        if mailbox and inline:
+            raise ValueError("mailbox和inline不能同时使用")
+        budget_ns = self.inline_budget_ns if budget_ms is None else int(budget_ms * 1e6)
+        subscription = Subscription(self, topic, callback, mailbox, inline, budget_ns, backlog)
+        with self._lock:
+            t = self._get_topic(topic)
+            if mailbox:
+                subscription.drain_args = (t, subscription)
+                t.mailboxes = t.mailboxes + (subscription,)
+            elif inline:
+                t.inlines = t.inlines + (subscription,)
+            else:
+                t.subscribers = t.subscribers + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        """
+        取消一个订阅
+        :param subscription: subscribe返回的订阅句柄
+        :return: 是否取消成功
+        """
+        with self._lock:
+            t = self._topics.get(subscription.topic)
+            if t is None or subscription not in t.subscribers + t.inlines + t.mailboxes:
+                return False
+            subscription.active = False
+            t.subscribers = tuple(s for s in t.subscribers if s is not subscription)
+            t.inlines = tuple(s for s in t.inlines if s is not subscription)
+            t.mailboxes = tuple(s for s in t.mailboxes if s is not subscription)
+        self._release_lanes((subscription,))
+        return True
+
+    def remove(self, topic: str, callback: Callable) -> bool:
+        """
+        取消某个回调函数在主题上的所有订阅
+        :param topic: 主题
+        :param callback: 回调函数
+        :return: 是否有订阅被取消
+        """
+        with self._lock:
+            t = self._topics.get(topic)
+            if t is None:
+                return False
+            removed = [s for s in t.subscribers + t.inlines + t.mailboxes if s.callback == callback]
+            if not removed:
+                return False
+            for s in removed:
+                s.active = False
+            t.subscribers = tuple(s for s in t.subscribers if s.active)
+            t.inlines = tuple(s for s in t.inlines if s.active)
+            t.mailboxes = tuple(s for s in t.mailboxes if s.active)
+        self._release_lanes(removed)
+        return True
+
+    def clear(self, topic: str) -> bool:
+        """
+        取消主题的全部订阅，恢复默认回调
+        :param topic: 主题
+        :return: 是否有订阅被取消
+        """
+        with self._lock:
+            t = self._topics.get(topic)
+            if t is None or not (t.subscribers or t.inlines or t.mailboxes):
+                return False
+            removed = t.subscribers + t.inlines + t.mailboxes
+            for s in removed:
+                s.active = False
+            t.subscribers = ()
+            t.inlines = ()
+            t.mailboxes = ()
+        self._release_lanes(removed)
+        return True
+
+    def _release_lanes(self, removed) -> None:
+        """释放已取消的mailbox订阅独占的分发lane"""
+        for s in removed:
+            if s.mailbox:
+                self.dispatcher.release(s.lane)
+
+    def subscribers(self, topic: str) -> Tuple[Subscription, ...]:
+        """获取主题当前的订阅句柄"""
+        t = self._topics.get(topic)
+        return t.subscribers + t.inlines + t.mailboxes if t is not None else ()
+
+    def has_subscribers(self, topic: str) -> bool:
+        """
+        主题是否有消费者（订阅者或非空的默认回调），发布方据此跳过没有人需要的数据获取、转换和打包
+        只读取订阅者元组，不加锁，可以在设备主循环中每次迭代调用
+        :param topic: 主题
+        :return: 是否有消费者
+        """
+        t = self._topics.get(topic)
+        if t is not None and (t.subscribers or t.inlines or t.mailboxes):
+            return True
+        default = self._defaults.get(topic)
+        return default is not None and default != self._noop
+
+    def backlog(self, topic: str) -> int:
+        """
+        获取主题的积压量：订阅者积压探针和分发队列排队数中的最大值
+        :param topic: 主题
+        :return: 积压量
+        """
+        t = self._topics.get(topic)
+        if t is None:
+            return 0
+        depth = self.dispatcher.pending(topic)
+        for sub in t.subscribers + t.inlines + t.mailboxes:
+            probe = sub.backlog
+            if probe is None:
+                continue
+            try:
+                value = probe()
+            except Exception as e:
+                self._report_error(topic, e)
+                continue
+            if value > depth:
+                depth = value
+        return depth
+
+    def topics(self) -> Tuple[str, ...]:
+        """获取所有已知主题"""
+        return tuple(self._topics)
+
+    def set_policy(self, topic: str, policy: str) -> None:
+        """
+        设置主题的投递策略
+        :param topic: 主题
+        :param policy: inline / pooled / latest
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"不支持的投递策略: {policy}")
+        with self._lock:
+            self._get_topic(topic).policy = policy
+
+    def set_loop(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """
+        设置执行协程回调的事件循环
+        :param loop: 调用方持有的事件循环，传None恢复使用进程共享的后台事件循环
+        """
+        self._loop = loop
+
+    def get_policy(self, topic: str) -> str:
+        t = self._topics.get(topic)
+        return t.policy if t is not None else self.policy
+
+    # ------------------------------------------------------------------
+    # 发布
+    # ------------------------------------------------------------------
+    def publish(self, topic: str, *args, **kwargs) -> None:
+        """
+        发布事件，按主题的投递策略执行订阅者回调
+        :param topic: 主题
+        :param args: 位置参数
+        :param kwargs: 关键字参数
+        """
+        self._publish(topic, args, kwargs, None, None, None)
+
+    def forward(self, topic: str, args: tuple, kwargs: dict = None, ts: float = None, mono_ns: int = None) -> None:
+        """
+        转发来自其他总线或进程的事件，保留源头的时间戳（序号由本总线重新编号）
+        :param topic: 主题
+        :param args: 位置参数
+        :param kwargs: 关键字参数
+        :param ts: 源头批量事件的共享时间戳，没有时为None
+        :param mono_ns: 源头的单调时间戳，没有时使用当前时间
+        """
+        self._publish(topic, args, kwargs or {}, ts, mono_ns, None)
+
+    def publish_batch(self, events: Dict[str, Any], ts: float = None, mono_ns: int = None) -> None:
+        """
+        一次发布多个主题，作为同一时刻的快照投递
+        - 所有主题共享同一个时间戳，回调中可以通过event_time()获取
+        - pooled策略的订阅者合并为一次分发，按events的顺序在同一个分发线程中执行
+        - inline/mailbox订阅和其他投递策略与publish相同
+        :param events: {主题: 事件参数}，每个主题的回调以该参数作为唯一的位置参数
+        :param ts: 共享时间戳(time.time())，不传则使用当前时间
+        :param mono_ns: 源头的单调时间戳(time.monotonic_ns())，应与ts在取数时一起获取，不传则使用当前时间
+        """
+        if mono_ns is None:
+            mono_ns = time.monotonic_ns()
+        if ts is None:
+            ts = time.time()
+        batch = []
+        for topic, payload in events.items():
+            self._publish(topic, (payload,), {}, ts, mono_ns, batch)
+        if batch:
+            # 同一组主题的批量事件固定使用同一个lane，保证批次之间按顺序执行
+            self.dispatcher.submit("+".join(events), self._deliver_batch, (batch,))
+
+    def _publish(self, topic: str, args: tuple, kwargs: dict, ts: Optional[float], mono_ns: Optional[int],
+                 batch: Optional[list]) -> None:
+        """
+        发布单个主题
+        :param ts: 批量事件的共享时间戳，单独发布时为None
+        :param mono_ns: 源头的单调时间戳，单独发布时为None（使用发布时刻）
+        :param batch: 批量发布时收集pooled投递的列表，单独发布时为None
+        """
+        t = self._topics.get(topic)
+        if t is None:
+            with self._lock:
+                t = self._get_topic(topic)
+        t.published += 1
+        seq = t.published
+        trace = self.trace
+        if trace.enabled and topic == "error":
+            # 错误事件即使没有订阅者也保存追踪快照
+            trace.on_error(topic, self.name, args[0] if args else "")
+
+        subs = t.subscribers
+        inlines = t.inlines
+        boxes = t.mailboxes
+        if not subs and not inlines and not boxes:
+            fallback = self._fallback(t)
+            if fallback is None:
+                return
+            subs = (fallback,)
+
+        stamp = time.monotonic_ns()
+        info = (topic, seq, stamp if mono_ns is None else mono_ns, ts)
+        if trace.enabled:
+            trace.record(TRACE_PUBLISH, topic, self.name, stamp)
+        if inlines:
+            self._call_inline(t, inlines, args, kwargs, info)
+        for box in boxes:
+            self._post(box, args, kwargs, stamp, info)
+        if not subs:
+            return
+
+        policy = t.policy
+        if policy == POLICY_INLINE:
+            self._deliver(t, subs, args, kwargs, stamp, info)
+        elif policy == POLICY_POOLED:
+            if batch is not None:
+                batch.append((t, subs, args, kwargs, stamp, info))
+            else:
+                self.dispatcher.submit(topic, self._deliver, (t, subs, args, kwargs, stamp, info))
+        else:
+            with t.lock:
+                if t.latest is not None:
+                    t.coalesced += 1
+                t.latest = (t, subs, args, kwargs, stamp, info)
+                schedule = not t.scheduled
+                t.scheduled = True
+            if schedule:
+                self.dispatcher.submit(topic, self._drain_latest, t.drain_args)
+
+    def shutdown(self, timeout: float = 1.0) -> None:
+        """执行完已排队的事件后回收分发线程"""
+        self.dispatcher.shutdown(timeout)
+
+    # ------------------------------------------------------------------
+    # 统计
+    # ------------------------------------------------------------------
+    def get_stats(self, topic: str = None) -> Dict[str, Any]:
+        """
+        获取主题统计信息
+        :param topic: 主题，不传则返回全部主题 {主题: 统计}
+        :return: 包含发布/投递/丢弃/合并次数和投递延迟(毫秒)的字典
+        """
+        if topic is not None:
+            t = self._topics.get(topic)
+            return self._topic_stats(t) if t is not None else {}
+        return {name: self._topic_stats(t) for name, t in list(self._topics.items())}
+
+    def _topic_stats(self, t: _Topic) -> Dict[str, Any]:
+        delivered = t.delivered
+        return {
+            "policy": t.policy,
+            "subscribers": len(t.subscribers) + len(t.inlines) + len(t.mailboxes),
+            "published": t.published,
+            "delivered": delivered,
+            "dropped": t.dropped,
+            "coalesced": t.coalesced,
+            "latency_avg_ms": (t.latency_total_ns / delivered / 1e6) if delivered else 0.0,
+            "latency_max_ms": t.latency_max_ns / 1e6,
+            "async_delivered": t.async_delivered,
+            "async_failed": t.async_failed,
+            "async_latency_avg_ms": (t.async_latency_total_ns / t.async_delivered / 1e6) if t.async_delivered else 0.0,
+            "async_latency_max_ms": t.async_latency_max_ns / 1e6,
+            "inline_calls": t.inline_calls,
+            "inline_overruns": t.inline_overruns,
+            "inlines": [
+                {
+                    "callback": getattr(sub.callback, "__qualname__", repr(sub.callback)),
+                    "overruns": sub.overruns,
+                    "max_duration_ms": sub.max_duration_ns / 1e6,
+                }
+                for sub in t.inlines
+            ],
+            "mailboxes": [
+                {
+                    "callback": getattr(box.callback, "__qualname__", repr(box.callback)),
+                    "delivered": box.delivered,
+                    "coalesced": box.coalesced,
+                    "latency_max_ms": box.latency_max_ns / 1e6,
+                }
+                for box in t.mailboxes
+            ],
+        }
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+    def _get_topic(self, topic: str) -> _Topic:
+        """获取或创建主题，调用方需持有self._lock"""
+        t = self._topics.get(topic)
+        if t is None:
+            t = _Topic(topic, self.policy)
+            self._topics[topic] = t
+        return t
+
+    def _fallback(self, t: _Topic) -> Optional[Subscription]:
+        """没有订阅者时的默认回调，defaults可能被子类更新，每次按需刷新"""
+        default = self._defaults.get(t.name)
+        if default is None or default == self._noop:
+            return None
+        fallback = t.fallback
+        if fallback is None or fallback.callback is not default:
+            fallback = Subscription(self, t.name, default)
+            t.fallback = fallback
+        return fallback
+
+    def _deliver(self, t: _Topic, subs: Tuple[Subscription, ...], args: tuple, kwargs: dict, stamp: int,
+                 info: Optional[tuple] = None) -> None:
+        now = time.monotonic_ns()
+        latency = now - stamp
+        t.delivered += 1
+        t.latency_total_ns += latency
+        if latency > t.latency_max_ns:
+            t.latency_max_ns = latency
+        if self.trace.enabled:
+            self.trace.record(TRACE_DELIVER, t.name, self.name, now, latency)
+
+        prev = _swap_event_info(info)
+        for sub in subs:
+            if not sub.active:
+                continue
+            try:
+                if sub.is_async:
+                    self._schedule_coroutine(t, sub.callback, args, kwargs)
+                else:
+                    sub.callback(*args, **kwargs)
+            except Exception as e:
+                self._report_error(t.name, e)
+        _swap_event_info(prev)
+
+    def _deliver_batch(self, batch: list) -> None:
+        """按顺序投递一次批量发布中的全部pooled主题"""
+        for item in batch:
+            self._deliver(*item)
+
+    def _call_inline(self, t: _Topic, inlines: Tuple[Subscription, ...], args: tuple, kwargs: dict,
+                     info: Optional[tuple] = None) -> None:
+        """在触发事件的线程中执行inline订阅，超过时间预算时计数并限频上报"""
+        prev = _swap_event_info(info)
+        try:
+            self._call_inline_subs(t, inlines, args, kwargs)
+        finally:
+            _swap_event_info(prev)
+
+    def _call_inline_subs(self, t: _Topic, inlines: Tuple[Subscription, ...], args: tuple, kwargs: dict) -> None:
+        for sub in inlines:
+            if not sub.active:
+                continue
+            start = time.monotonic_ns()
+            try:
+                if sub.is_async:
+                    self._schedule_coroutine(t, sub.callback, args, kwargs)
+                else:
+                    sub.callback(*args, **kwargs)
+            except Exception as e:
+                self._report_error(t.name, e)
+            duration = time.monotonic_ns() - start
+            if self.trace.enabled:
+                self.trace.record(TRACE_INLINE, t.name, getattr(sub.callback, "__qualname__", self.name),
+                                  start, duration)
+            t.inline_calls += 1
+            sub.delivered += 1
+            if duration > sub.max_duration_ns:
+                sub.max_duration_ns = duration
+            budget = sub.budget_ns
+            if budget and duration > budget:
+                sub.overruns += 1
+                t.inline_overruns += 1
+                now = start + duration
+                if now - sub.warned_ns > _LATENCY_WARN_INTERVAL_NS:
+                    sub.warned_ns = now
+                    name = getattr(sub.callback, "__qualname__", repr(sub.callback))
+                    self._report_error(t.name, EventBudgetWarning(
+                        f"inline回调{name}执行{duration / 1e6:.2f}ms，超过预算{budget / 1e6:.2f}ms"
+                        f"（累计{sub.overruns}次），请改为普通订阅"
+                    ))
+
+    def _post(self, box: Subscription, args: tuple, kwargs: dict, stamp: int, info: Optional[tuple] = None) -> None:
+        """把事件放入mailbox，覆盖尚未处理的旧值"""
+        with box.lock:
+            if box.latest is not None:
+                box.coalesced += 1
+                box.drain_args[0].coalesced += 1
+            box.latest = (args, kwargs, stamp, info)
+            schedule = not box.scheduled
+            box.scheduled = True
+        if schedule:
+            self.dispatcher.submit(box.lane, self._drain_mailbox, box.drain_args)
+
+    def _drain_mailbox(self, t: _Topic, box: Subscription) -> None:
+        with box.lock:
+            pending = box.latest
+            box.latest = None
+            box.scheduled = False
+        if pending is None or not box.active:
+            return
+        args, kwargs, stamp, info = pending
+        now = time.monotonic_ns()
+        latency = now - stamp
+        if latency > box.latency_max_ns:
+            box.latency_max_ns = latency
+        if self.trace.enabled:
+            self.trace.record(TRACE_MAILBOX, t.name, getattr(box.callback, "__qualname__", self.name), now, latency)
+        box.delivered += 1
+        prev = _swap_event_info(info)
+        try:
+            if box.is_async:
+                self._schedule_coroutine(t, box.callback, args, kwargs)
+            else:
+                box.callback(*args, **kwargs)
+        except Exception as e:
+            self._report_error(t.name, e)
+        finally:
+            _swap_event_info(prev)
+
+    def _drain_latest(self, t: _Topic) -> None:
+        with t.lock:
+            pending = t.latest
+            t.latest = None
+            t.scheduled = False
+        if pending is not None:
+            self._deliver(*pending)
+
+    def _schedule_coroutine(self, t: _Topic, callback: Callable, args: tuple, kwargs: dict) -> None:
+        """将协程回调调度到事件循环执行，不阻塞当前线程"""
+        loop = self._loop or get_background_loop().loop
+        asyncio.run_coroutine_threadsafe(
+            self._run_coroutine(t, callback, args, kwargs, time.monotonic_ns()), loop
+        )
+
+    async def _run_coroutine(self, t: _Topic, callback: Callable, args: tuple, kwargs: dict, scheduled: int) -> None:
+        """在事件循环中执行协程回调，统计调度延迟并上报异常"""
+        now = time.monotonic_ns()
+        latency = now - scheduled
+        t.async_delivered += 1
+        t.async_latency_total_ns += latency
+        if latency > t.async_latency_max_ns:
+            t.async_latency_max_ns = latency
+        budget = self.async_latency_budget_ns
+        if budget and latency > budget and now - t.async_warned_ns > _LATENCY_WARN_INTERVAL_NS:
+            t.async_warned_ns = now
+            self._report_error(t.name, EventLatencyWarning(
+                f"协程回调调度延迟{latency / 1e6:.1f}ms，超过阈值{budget / 1e6:.1f}ms"
+            ))
+        try:
+            await callback(*args, **kwargs)
+        except Exception as e:
+            t.async_failed += 1
+            self._report_error(t.name, e)
+
+    def _on_drop(self, topic: str, func: Callable, args: tuple) -> None:
+        """分发队列满时被丢弃的事件计入对应主题"""
+        if func == self._deliver_batch:
+            for item in args[0]:
+                item[0].dropped += 1
+            return
+        if not args or not isinstance(args[0], _Topic):
+            return
+        t = args[0]
+        t.dropped += 1
+        if func == self._drain_latest:
+            # 等待投递的latest事件被丢弃，允许下一次发布重新调度
+            with t.lock:
+                t.scheduled = False
+        elif func == self._drain_mailbox:
+            box = args[1]
+            with box.lock:
+                box.scheduled = False
+
+    def _report_error(self, topic: str, error: Exception) -> None:
+        # 交给on_error时通常会再发布error事件，由发布路径保存追踪快照
+        if self._on_error is None and self.trace.enabled:
+            self.trace.on_error(topic, self.name, error)
+        if self._on_error is not None:
+            try:
+                self._on_error(topic, error)
+                return
+            except Exception:
+                pass
+        print(f"[{self.name}] 事件{topic}执行失败: {error}")
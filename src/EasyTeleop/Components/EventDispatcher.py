@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from .ThreadPlacement import get_thread_placement
+
+# 控制类事件：数量很少且丢失后状态无法恢复（例如错过一次断开连接），队列满时不会被丢弃
+CONTROL_EVENTS = ("status_change", "error")
+
+
+class _Lane:
+    """一个工作线程及其有界队列"""
+    __slots__ = ("name", "queue", "cond", "thread", "retired")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queue = deque()
+        self.cond = threading.Condition(threading.Lock())
+        self.thread: Optional[threading.Thread] = None
+        # 专属lane被release后不再接收新事件，工作线程执行完已排队的事件后退出
+        self.retired = False
+
+
+class EventDispatcher:
+    """
+    有界事件分发器，用固定数量的工作线程代替每次emit新建线程
+    - 每个工作线程(lane)拥有一个有界队列，队列满时丢弃最旧的事件并计数，生产者永远不会被阻塞
+    - 控制类事件（lossless，默认status_change和error）不会被丢弃，队列满时丢弃最旧的其他事件，
+      队列中只剩控制类事件时允许暂时超过队列深度
+    - num_workers为0（默认）时每个事件名使用独立的工作线程，处理慢的回调只会拖慢同名事件；
+      大于0时使用固定数量的工作线程，事件名按首次出现的顺序轮流分配
+    - 同一事件名固定分配到同一个lane，保证同名事件按触发顺序执行
+    - 工作线程在第一次提交事件时才创建，空闲时阻塞等待，不占用CPU
+    """
+
+    def __init__(self, name: str = "EventDispatcher", num_workers: int = 0, queue_size: int = 64,
+                 on_error: Optional[Callable[[str, Exception], None]] = None,
+                 on_drop: Optional[Callable[[str, Callable, tuple], None]] = None,
+                 lossless: Iterable[str] = CONTROL_EVENTS):
+        """
+        :param name: 分发器名称，用作工作线程名前缀
+        :param num_workers: 工作线程数量，0为每个事件名一个工作线程
+        :param queue_size: 每个工作线程的最大排队事件数
+        :param on_error: 回调执行异常时的处理函数，参数为(事件名, 异常)
+        :param on_drop: 队列满丢弃事件时的通知函数，参数为(事件名, 回调函数, 位置参数)
+        :param lossless: 队列满时也不丢弃的事件名
+        """
+        if num_workers < 0:
+            raise ValueError("num_workers 必须大于等于0")
+        if queue_size < 1:
+            raise ValueError("queue_size 必须大于等于1")
+
+        self.name = name
+        self.num_workers = num_workers
+        self.queue_size = queue_size
+        self.lossless = frozenset(lossless)
+        self._on_error = on_error
+        self._on_drop = on_drop
+
+        # 固定数量的工作线程，num_workers为0时为空，lane按事件名创建
+        self._pool: List[_Lane] = [_Lane(f"{name}-{i}") for i in range(num_workers)]
+        self._assigned = 0
+        self._stopping = False
+
+        # 事件名 -> lane 的映射
+        self._lanes: Dict[str, _Lane] = {}
+        self._lanes_lock = threading.Lock()
+
+        # 统计信息
+        self.submitted = 0
+        self.dropped = 0
+
+    def submit(self, event_name: str, func: Callable, args: tuple = (), kwargs: Dict[str, Any] = None) -> bool:
+        """
+        提交一次回调执行
+        :param event_name: 事件名称，决定回调由哪个lane执行
+        :param func: 回调函数
+        :param args: 位置参数
+        :param kwargs: 关键字参数
+        :return: 是否未发生丢弃（队列已满时会丢弃最旧的非控制类事件并返回False）
+        """
+        item = (event_name, func, args, kwargs)
+        dropped = None
+        while True:
+            lane = self._lanes.get(event_name)
+            if lane is None:
+                lane = self._assign_lane(event_name)
+            cond = lane.cond
+            with cond:
+                if lane.retired:
+                    # lane刚被release，重新分配
+                    continue
+                queue = lane.queue
+                if len(queue) >= self.queue_size:
+                    dropped = self._evict(queue, item)
+                if dropped is not item:
+                    queue.append(item)
+                    self.submitted += 1
+                    if lane.thread is None:
+                        self._start_worker(lane)
+                    cond.notify()
+            break
+        if dropped is None:
+            return True
+        if self._on_drop is not None:
+            try:
+                self._on_drop(dropped[0], dropped[1], dropped[2])
+            except Exception as e:
+                self._report_error(dropped[0], e)
+        return False
+
+    def _evict(self, queue: deque, item: tuple) -> Optional[tuple]:
+        """
+        队列满时选出要丢弃的事件，调用方需持有该lane的锁
+        :return: 被丢弃的事件（可能就是新提交的item），队列中只有控制类事件且item也是控制类事件时返回None
+        """
+        lossless = self.lossless
+        for i, queued in enumerate(queue):
+            if queued[0] not in lossless:
+                del queue[i]
+                self.dropped += 1
+                return queued
+        if item[0] in lossless:
+            return None
+        self.dropped += 1
+        return item
+
+    def release(self, event_name: str) -> None:
+        """
+        不再使用某个事件名（例如取消的mailbox订阅），释放它的lane映射
+        专属的工作线程执行完已排队的事件后退出
+        :param event_name: 事件名称
+        """
+        with self._lanes_lock:
+            lane = self._lanes.pop(event_name, None)
+        if lane is None or self.num_workers:
+            return
+        with lane.cond:
+            lane.retired = True
+            lane.cond.notify_all()
+
+    def pending(self, event_name: str = None) -> int:
+        """
+        当前排队中的事件数
+        :param event_name: 事件名称，传入时返回该事件所在lane的排队数（共享工作线程时同一lane的其他事件也会计入）
+        :return: 排队事件数
+        """
+        if event_name is not None:
+            lane = self._lanes.get(event_name)
+            return len(lane.queue) if lane is not None else 0
+        return sum(len(lane.queue) for lane in self._all_lanes())
+
+    def shutdown(self, timeout: float = 1.0) -> None:
+        """
+        停止所有工作线程，线程会先执行完已排队的事件再退出
+        停止后再次submit会重新创建工作线程
+        :param timeout: 等待所有线程退出的总时间上限（秒），与lane的数量无关
+        """
+        self._stopping = True
+        lanes = self._all_lanes()
+        for lane in lanes:
+            with lane.cond:
+                lane.cond.notify_all()
+        current = threading.current_thread()
+        deadline = time.monotonic() + timeout
+        for lane in lanes:
+            thread = lane.thread
+            if thread is not None and thread is not current:
+                thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._stopping = False
+
+    def _all_lanes(self) -> List[_Lane]:
+        with self._lanes_lock:
+            if self.num_workers:
+                return list(self._pool)
+            return list(self._lanes.values())
+
+    def _assign_lane(self, event_name: str) -> _Lane:
+        with self._lanes_lock:
+            lane = self._lanes.get(event_name)
+            if lane is None:
+                if self.num_workers:
+                    lane = self._pool[self._assigned % self.num_workers]
+                    self._assigned += 1
+                else:
+                    lane = _Lane(f"{self.name}-{event_name}")
+                self._lanes[event_name] = lane
+            return lane
+
+    def _start_worker(self, lane: _Lane) -> None:
+        """创建工作线程，调用方需持有该lane的锁"""
+        thread = threading.Thread(target=get_thread_placement().wrap(self._worker), args=(lane,), name=lane.name, daemon=True)
+        lane.thread = thread
+        thread.start()
+
+    def _worker(self, lane: _Lane) -> None:
+        queue = lane.queue
+        cond = lane.cond
+        while True:
+            with cond:
+                while not queue:
+                    if self._stopping or lane.retired:
+                        lane.thread = None
+                        return
+                    cond.wait()
+                event_name, func, args, kwargs = queue.popleft()
+            try:
+                if kwargs:
+                    func(*args, **kwargs)
+                else:
+                    func(*args)
+            except Exception as e:
+                self._report_error(event_name, e)
+
+    def _report_error(self, event_name: str, error: Exception) -> None:
+        if self._on_error is not None:
+            try:
+                self._on_error(event_name, error)
+                return
+            except Exception:
+                pass
+        print(f"[{self.name}] 事件{event_name}执行失败: {error}")
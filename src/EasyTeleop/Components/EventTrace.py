@@ -0,0 +1,197 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# 记录类型
+TRACE_PUBLISH = "publish"   # 事件发布
+TRACE_DELIVER = "deliver"   # 分发线程开始投递（latency为发布到投递的延迟）
+TRACE_INLINE = "inline"     # inline回调执行完毕（latency为回调耗时）
+TRACE_MAILBOX = "mailbox"   # mailbox订阅开始投递
+TRACE_MARK = "mark"         # 业务代码中的自定义打点，例如下发IK指令
+TRACE_ERROR = "error"       # 错误
+
+# 两次错误快照之间的最短间隔，错误连续出现时避免反复复制缓冲区
+_SNAPSHOT_INTERVAL_NS = 1_000_000_000
+
+
+class _Ring:
+    """单个线程的环形缓冲区，只由所属线程写入，无需加锁"""
+    __slots__ = ("thread", "slots", "index")
+
+    def __init__(self, thread: str, capacity: int):
+        self.thread = thread
+        self.slots: List[Optional[tuple]] = [None] * capacity
+        self.index = 0
+
+
+class EventTrace:
+    """
+    低开销的事件追踪环形缓冲区，用于事后分析事件顺序和延迟
+    - 每个线程写入自己的环形缓冲区，记录路径上没有锁，只有一次元组创建和列表赋值
+    - 每个线程保留最近capacity条记录，dump/snapshot时按时间戳合并所有线程
+    - 发生错误时自动保存一份快照，便于排查"机械臂突然跳动"这类问题
+    """
+
+    def __init__(self, capacity: int = 2048, enabled: bool = False, error_snapshots: int = 4):
+        """
+        :param capacity: 每个线程保留的记录条数
+        :param enabled: 是否启用
+        :param error_snapshots: 最多保留的错误快照数量
+        """
+        self.capacity = capacity
+        self.enabled = enabled
+        self.error_snapshots = error_snapshots
+        self._local = threading.local()
+        self._rings: List[_Ring] = []
+        self._rings_lock = threading.Lock()
+        self._snapshots: List[Dict[str, Any]] = []
+        self._last_snapshot_ns = 0
+        # 错误快照的写入目录，为None时只保存在内存中
+        self.snapshot_dir: Optional[str] = None
+
+    def enable(self, capacity: int = None, snapshot_dir: str = None) -> None:
+        """
+        启用追踪
+        :param capacity: 每个线程保留的记录条数，修改后清空已有记录
+        :param snapshot_dir: 错误快照的写入目录
+        """
+        if capacity is not None and capacity != self.capacity:
+            self.capacity = capacity
+            self.clear()
+        if snapshot_dir is not None:
+            self.snapshot_dir = snapshot_dir
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        """清空所有线程的记录，各线程下次记录时重新创建缓冲区"""
+        with self._rings_lock:
+            self._rings = []
+            self._local = threading.local()
+
+    def record(self, kind: str, topic: str, source: str, stamp_ns: int = None, latency_ns: int = 0) -> None:
+        """
+        写入一条记录
+        :param kind: 记录类型，publish / deliver / inline / mailbox / mark / error
+        :param topic: 主题（事件名称）
+        :param source: 来源，例如事件总线名称或回调名称
+        :param stamp_ns: time.monotonic_ns()时间戳，不传则取当前时间
+        :param latency_ns: 延迟或耗时(ns)
+        """
+        if not self.enabled:
+            return
+        ring = getattr(self._local, "ring", None)
+        if ring is None:
+            ring = self._new_ring()
+        slots = ring.slots
+        index = ring.index
+        slots[index % len(slots)] = (stamp_ns or time.monotonic_ns(), kind, topic, source, latency_ns)
+        ring.index = index + 1
+
+    def mark(self, topic: str, source: str = "", latency_ns: int = 0) -> None:
+        """在业务代码中打点，例如IK指令下发"""
+        if self.enabled:
+            self.record(TRACE_MARK, topic, source, None, latency_ns)
+
+    def snapshot(self, last: int = None) -> List[Dict[str, Any]]:
+        """
+        合并所有线程的记录，按时间排序
+        :param last: 只返回最近的last条
+        :return: 记录列表，每条包含t_ns/kind/topic/source/latency_ms/thread
+        """
+        entries = []
+        with self._rings_lock:
+            rings = list(self._rings)
+        for ring in rings:
+            slots = list(ring.slots)
+            for item in slots:
+                if item is not None:
+                    entries.append((item, ring.thread))
+        entries.sort(key=lambda entry: entry[0][0])
+        if last is not None:
+            entries = entries[-last:]
+        return [
+            {
+                "t_ns": item[0],
+                "kind": item[1],
+                "topic": item[2],
+                "source": item[3],
+                "latency_ms": item[4] / 1e6,
+                "thread": thread,
+            }
+            for item, thread in entries
+        ]
+
+    def dump(self, path: str = None, last: int = None) -> str:
+        """
+        导出记录为JSON Lines，每行一条
+        :param path: 输出文件路径，不传则只返回文本
+        :param last: 只导出最近的last条
+        :return: JSON Lines文本
+        """
+        text = "\n".join(json.dumps(entry, ensure_ascii=False) for entry in self.snapshot(last))
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        return text
+
+    def on_error(self, topic: str, source: str, error: Any) -> None:
+        """
+        记录错误并保存一份快照（每秒最多一份）
+        :param topic: 出错的主题
+        :param source: 来源
+        :param error: 异常或错误信息
+        """
+        if not self.enabled:
+            return
+        now = time.monotonic_ns()
+        self.record(TRACE_ERROR, topic, source, now)
+        if self._snapshots and now - self._last_snapshot_ns < _SNAPSHOT_INTERVAL_NS:
+            return
+        self._last_snapshot_ns = now
+        snapshot = {
+            "time": time.time(),
+            "topic": topic,
+            "source": source,
+            "error": str(error),
+            "events": self.snapshot(),
+        }
+        self._snapshots.append(snapshot)
+        del self._snapshots[:-self.error_snapshots]
+        if self.snapshot_dir:
+            try:
+                os.makedirs(self.snapshot_dir, exist_ok=True)
+                path = os.path.join(self.snapshot_dir, f"trace_{time.strftime('%Y%m%d_%H%M%S')}_{topic}.json")
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, ensure_ascii=False, indent=1)
+            except Exception as e:
+                print(f"[EventTrace] 保存错误快照失败: {e}")
+
+    def get_error_snapshots(self) -> List[Dict[str, Any]]:
+        """获取最近的错误快照，每个快照包含错误信息和当时的事件记录"""
+        return list(self._snapshots)
+
+    def _new_ring(self) -> _Ring:
+        ring = _Ring(threading.current_thread().name, self.capacity)
+        self._local.ring = ring
+        with self._rings_lock:
+            # 线程数量过多时丢弃最早创建的缓冲区，避免短生命周期线程无限累积
+            if len(self._rings) >= 256:
+                self._rings.pop(0)
+            self._rings.append(ring)
+        return ring
+
+
+_default_trace = EventTrace()
+
+
+def get_event_trace() -> EventTrace:
+    """
+    获取进程共享的事件追踪器，默认关闭，调用enable()启用
+    :return: EventTrace
+    """
+    return _default_trace
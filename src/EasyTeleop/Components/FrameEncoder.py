@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+import cv2
+import numpy as np
+
+# 编码格式: (文件扩展名, cv2.imencode的扩展名, 质量参数, 默认质量)
+CODECS = {
+    "jpeg": ("jpg", ".jpg", cv2.IMWRITE_JPEG_QUALITY, 90),
+    "png": ("png", ".png", cv2.IMWRITE_PNG_COMPRESSION, 1),
+    "webp": ("webp", ".webp", cv2.IMWRITE_WEBP_QUALITY, 90),
+}
+
+
+class EncodedFrame:
+    """
+    编码一次、多个订阅者共享的帧：原始数组和编码后的字节
+    订阅者不应修改raw；需要RGB时使用rgb属性，转换结果在订阅者之间共享
+    """
+    __slots__ = ("raw", "data", "codec", "ts", "seq", "_rgb", "_lock")
+
+    def __init__(self, raw: np.ndarray, data: bytes, codec: str, ts: float, seq: int):
+        self.raw = raw
+        self.data = data
+        self.codec = codec
+        self.ts = ts
+        self.seq = seq
+        self._rgb = None
+        self._lock = threading.Lock()
+
+    @property
+    def ext(self) -> str:
+        """保存为文件时的扩展名"""
+        return CODECS[self.codec][0]
+
+    @property
+    def shape(self):
+        return self.raw.shape
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """BGR转RGB的结果，第一次访问时转换，之后直接复用（例如多路推流）"""
+        if self._rgb is None:
+            with self._lock:
+                if self._rgb is None:
+                    raw = self.raw
+                    if raw.ndim == 3 and raw.shape[2] == 3:
+                        self._rgb = cv2.cvtColor(raw, cv2.COLOR_BGR2RGB)
+                    else:
+                        self._rgb = raw
+        return self._rgb
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+class FrameEncoder:
+    """
+    每个摄像头一个的编码阶段：每帧只编码一次，编码结果和原始数组一起交给所有订阅者
+    """
+
+    def __init__(self, codec: str = "jpeg", quality: int = None):
+        """
+        :param codec: 编码格式，jpeg / png / webp
+        :param quality: 质量参数，jpeg/webp为0~100，png为压缩级别0~9，不传则使用默认值
+        """
+        if codec not in CODECS:
+            raise ValueError(f"不支持的编码格式: {codec}，可选 {list(CODECS)}")
+        self.codec = codec
+        _, self._imencode_ext, param, default = CODECS[codec]
+        self.quality = default if quality is None else int(quality)
+        self._params = [int(param), self.quality]
+        self._seq = 0
+        # 统计: 编码帧数、失败次数、累计编码耗时、累计编码字节数
+        self.frames = 0
+        self.failures = 0
+        self._encode_ns = 0
+        self._bytes = 0
+
+    def encode(self, frame: np.ndarray, ts: float = None) -> Optional[EncodedFrame]:
+        """
+        编码一帧
+        :param frame: BGR图像
+        :param ts: 时间戳，不传则取当前时间
+        :return: EncodedFrame，编码失败时返回None
+        """
+        start = time.perf_counter_ns()
+        ok, buffer = cv2.imencode(self._imencode_ext, frame, self._params)
+        if not ok:
+            self.failures += 1
+            return None
+        data = buffer.tobytes()
+        self._encode_ns += time.perf_counter_ns() - start
+        self._bytes += len(data)
+        self._seq += 1
+        self.frames += 1
+        return EncodedFrame(frame, data, self.codec, time.time() if ts is None else ts, self._seq)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        :return: 编码格式、质量、帧数、失败次数、平均编码耗时(ms)和平均帧大小(KB)
+        """
+        frames = self.frames
+        return {
+            "codec": self.codec,
+            "quality": self.quality,
+            "frames": frames,
+            "failures": self.failures,
+            "encode_avg_ms": self._encode_ns / frames / 1e6 if frames else 0.0,
+            "size_avg_kb": self._bytes / frames / 1024 if frames else 0.0,
+        }
@@ -0,0 +1,110 @@
+import sys
+import threading
+from typing import Any, Dict, List, Tuple
+import numpy as np
+
+
+def _baseline_refcount() -> int:
+    """空闲缓冲区（只被池本身引用）在_is_free中测得的引用计数"""
+    buffers = [np.empty(1)]
+    return sys.getrefcount(buffers[0])
+
+
+class FramePool:
+    """
+    预分配、循环使用的帧缓冲区池
+    - 摄像头用acquire/copy从池中借出缓冲区并填入新帧，SDK的帧内存（例如librealsense的frame）随即释放，
+      不会因为下游队列持有帧而耗尽SDK的帧队列
+    - 借出的缓冲区由Python引用计数管理：订阅者（队列、编码结果、推流）持有帧时缓冲区不会被复用，
+      全部释放（del或出队后不再引用）后自动归还，订阅者不需要调用release，也不会读到被覆盖的数据
+    - 需要更早归还时，借用方丢弃所有引用即可；池满且没有空闲缓冲区时临时分配新数组，记录在overflow中
+    - 没有显式的release：缓冲区只有在引用计数回到池自身的引用时才会复用。numpy视图通过base引用缓冲区，同样计入；
+      只保存数据指针、不持有Python引用的使用方式（ctypes指针、C扩展在调用返回后继续异步读取等）不受保护，
+      这类使用方必须在返回前拷贝数据。库内的订阅者（采集队列、保存线程池、视频写入、编码、推流、共享帧缓冲区）
+      都持有Python引用或在回调内同步拷贝
+    """
+
+    def __init__(self, max_buffers: int = 32):
+        """
+        :param max_buffers: 池中最多保留的缓冲区数量，按需增长，应不小于下游队列的最大积压帧数
+        """
+        self.max_buffers = max_buffers
+        self._buffers: List[np.ndarray] = []
+        self._shape: Tuple[int, ...] = None
+        self._dtype: np.dtype = None
+        self._next = 0
+        self._lock = threading.Lock()
+        self._baseline = _baseline_refcount()
+        # 统计: 复用次数、新分配的池缓冲区、池满时临时分配的数组
+        self.reused = 0
+        self.allocated = 0
+        self.overflow = 0
+
+    def _is_free(self, index: int) -> bool:
+        return sys.getrefcount(self._buffers[index]) <= self._baseline
+
+    def acquire(self, shape: Tuple[int, ...], dtype="uint8") -> np.ndarray:
+        """
+        借出一个缓冲区，内容未初始化
+        :param shape: 帧形状，与之前不同时清空池（例如分辨率改变）
+        :param dtype: 数据类型
+        :return: 缓冲区
+        """
+        shape = tuple(shape)
+        dtype = np.dtype(dtype)
+        with self._lock:
+            if shape != self._shape or dtype != self._dtype:
+                self._buffers = []
+                self._shape, self._dtype = shape, dtype
+                self._next = 0
+            count = len(self._buffers)
+            # 缓冲区大多按借出顺序归还，从上一次的位置开始查找
+            for offset in range(count):
+                index = (self._next + offset) % count
+                if self._is_free(index):
+                    self._next = index + 1
+                    self.reused += 1
+                    return self._buffers[index]
+            if count < self.max_buffers:
+                buffer = np.empty(shape, dtype=dtype)
+                self._buffers.append(buffer)
+                self._next = 0
+                self.allocated += 1
+                return buffer
+            self.overflow += 1
+        return np.empty(shape, dtype=dtype)
+
+    def copy(self, src: np.ndarray) -> np.ndarray:
+        """
+        借出缓冲区并拷贝src（例如SDK帧内存上的视图）
+        :param src: 源数组
+        :return: 内容与src相同的缓冲区
+        """
+        buffer = self.acquire(src.shape, src.dtype)
+        np.copyto(buffer, src)
+        return buffer
+
+    def in_use(self) -> int:
+        """当前被借出的池缓冲区数量"""
+        with self._lock:
+            return sum(1 for index in range(len(self._buffers)) if not self._is_free(index))
+
+    def clear(self) -> None:
+        """释放池中的缓冲区，仍被借用的数组由借用方持有直到释放"""
+        with self._lock:
+            self._buffers = []
+            self._shape = self._dtype = None
+            self._next = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        :return: 池大小、借出数量、复用次数、新分配次数和池满临时分配次数
+        """
+        return {
+            "buffers": len(self._buffers),
+            "max_buffers": self.max_buffers,
+            "in_use": self.in_use(),
+            "reused": self.reused,
+            "allocated": self.allocated,
+            "overflow": self.overflow,
+        }
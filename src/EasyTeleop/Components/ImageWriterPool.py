@@ -0,0 +1,174 @@
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable
+import cv2
+import numpy as np
+from .FrameEncoder import CODECS, EncodedFrame
+from .ThreadPlacement import get_thread_placement
+
+# 可选的图像保存格式：FrameEncoder的编码格式，加上不压缩的npy
+IMAGE_CODECS = list(CODECS) + ["npy"]
+
+
+class ImageWriterPool:
+    """
+    多线程的图像保存池：编码（cv2.imencode会释放GIL）在多个线程中并行，同一摄像头的文件按提交顺序写入
+    - submit按摄像头分配递增序号，工作线程编码完成后等待同一摄像头的前一帧写完再写文件，
+      任意时刻磁盘上每个摄像头的帧都是连续的前缀，不同摄像头之间互不等待
+    - 等待写入的帧数超过max_pending时submit阻塞，积压留在调用方的队列中，背压探针仍然有效
+    - 已经编码的EncodedFrame直接写入字节，不再重新编码
+    """
+
+    def __init__(self, workers: int = 4, codec: str = "png", quality: int = None, max_pending: int = None,
+                 name: str = "ImageWriter", on_error: Callable[[str], None] = None):
+        """
+        :param workers: 工作线程数
+        :param codec: 保存格式，png / jpeg / webp / npy
+        :param quality: 质量参数，png为压缩级别0~9，jpeg/webp为0~100，不传则使用FrameEncoder的默认值，npy忽略
+        :param max_pending: 最多等待写入的帧数，默认为工作线程数的2倍
+        :param name: 线程名前缀
+        :param on_error: 保存失败时的回调，参数为错误信息
+        """
+        if codec not in IMAGE_CODECS:
+            raise ValueError(f"不支持的保存格式: {codec}，可选 {IMAGE_CODECS}")
+        self.workers = max(1, int(workers))
+        self.codec = codec
+        self.name = name
+        self.on_error = on_error
+        if codec == "npy":
+            self.quality = None
+            self.ext = "npy"
+        else:
+            self.ext, self._imencode_ext, param, default = CODECS[codec]
+            self.quality = default if quality is None else int(quality)
+            self._params = [int(param), self.quality]
+        self._jobs = queue.Queue(maxsize=max_pending or self.workers * 2)
+        self._threads = []
+        # 每个摄像头的顺序控制: 已提交序号、下一个应写入的序号、条件变量
+        self._submitted: Dict[Hashable, int] = {}
+        self._next: Dict[Hashable, int] = {}
+        self._orders: Dict[Hashable, threading.Condition] = {}
+        self._lock = threading.Lock()
+        # 统计: 写入帧数、失败次数、累计编码耗时、累计写入字节数
+        self.written = 0
+        self.failures = 0
+        self._encode_ns = 0
+        self._bytes = 0
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        placement = get_thread_placement()
+        for i in range(self.workers):
+            thread = threading.Thread(target=placement.wrap(self._run), name=f"{self.name}-{i}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def stop(self) -> None:
+        """写完已提交的帧后停止工作线程"""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, path: str, frame, key: Hashable = 0) -> None:
+        """
+        提交一帧
+        :param path: 文件路径（不含扩展名），扩展名由保存格式决定，EncodedFrame使用其自身的扩展名
+        :param frame: BGR图像或EncodedFrame
+        :param key: 顺序保证的分组（摄像头ID），同一分组的文件按提交顺序写入
+        """
+        with self._lock:
+            if key not in self._orders:
+                self._orders[key] = threading.Condition()
+                self._submitted[key] = 0
+                self._next[key] = 0
+            seq = self._submitted[key]
+            self._submitted[key] = seq + 1
+        self._jobs.put((key, seq, path, frame))
+
+    def pending(self) -> int:
+        """等待编码或写入的帧数"""
+        return self._jobs.qsize()
+
+    def _encode(self, path: str, frame):
+        """返回(文件路径, 编码后的字节)，npy格式不编码，返回原数组"""
+        if isinstance(frame, EncodedFrame):
+            return f"{path}.{frame.ext}", frame.data
+        if self.codec == "npy":
+            return f"{path}.npy", frame
+        start = time.perf_counter_ns()
+        ok, buffer = cv2.imencode(self._imencode_ext, frame, self._params)
+        if not ok:
+            raise RuntimeError(f"{self.codec}编码失败")
+        elapsed = time.perf_counter_ns() - start
+        with self._lock:
+            self._encode_ns += elapsed
+        return f"{path}.{self.ext}", buffer
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            key, seq, path, frame = job
+            error = None
+            try:
+                filename, data = self._encode(path, frame)
+            except Exception as e:
+                filename, data, error = path, None, e
+            order = self._orders[key]
+            with order:
+                # 等待同一摄像头的前一帧写完
+                while self._next[key] != seq:
+                    order.wait()
+                try:
+                    if data is not None:
+                        with open(filename, "wb") as f:
+                            if self.codec == "npy" and not isinstance(frame, EncodedFrame):
+                                np.save(f, data, allow_pickle=False)
+                            else:
+                                f.write(data)
+                        with self._lock:
+                            self.written += 1
+                            self._bytes += data.nbytes if isinstance(data, np.ndarray) else len(data)
+                except Exception as e:
+                    error = e
+                    # 删除写了一半的文件
+                    if data is not None and os.path.exists(filename):
+                        try:
+                            os.remove(filename)
+                        except OSError:
+                            pass
+                finally:
+                    # 无论写入是否成功都放行同一摄像头的下一帧，否则后续帧会一直等待
+                    self._next[key] = seq + 1
+                    order.notify_all()
+            if error is not None:
+                with self._lock:
+                    self.failures += 1
+                if self.on_error:
+                    try:
+                        self.on_error(f"保存图像{filename}失败: {error}")
+                    except Exception as e:
+                        print(f"{self.name}: 错误回调执行失败: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        :return: 保存格式、质量、线程数、写入帧数、失败次数、等待帧数、平均编码耗时(ms)和平均文件大小(KB)
+        """
+        written = self.written
+        return {
+            "codec": self.codec,
+            "quality": self.quality,
+            "workers": self.workers,
+            "written": written,
+            "failures": self.failures,
+            "pending": self.pending(),
+            "encode_avg_ms": self._encode_ns / written / 1e6 if written else 0.0,
+            "size_avg_kb": self._bytes / written / 1024 if written else 0.0,
+        }
+
@@ -5,6 +5,7 @@ from collections import deque
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from typing import List, Dict, Any, Tuple, Callable
+from .ThreadPlacement import get_thread_placement
 
 class Interpolation:
     """
@@ -123,11 +124,12 @@ class Interpolation:
         self.running = True
         
         # 启动插值线程
-        self.interpolation_thread = threading.Thread(target=self._interpolation_loop, daemon=True)
+        self.interpolation_thread = threading.Thread(target=get_thread_placement().wrap(self._interpolation_loop),
+                                                     name="Interpolation-loop", daemon=True)
         self.interpolation_thread.start()
         
         # 启动可视化线程
-        self.visualization_thread = threading.Thread(target=self._visualization_loop, daemon=True)
+        self.visualization_thread = threading.Thread(target=self._visualization_loop, name="Interpolation-plot", daemon=True)
         self.visualization_thread.start()
         
     def stop(self) -> None:
@@ -0,0 +1,138 @@
+import struct
+import threading
+import time
+from typing import Any, Dict, List
+import numpy as np
+
+
+def _to_float(value) -> float:
+    """非数值（None、字符串等）记录为NaN"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class NpyStateWriter:
+    """
+    机械臂状态流（位姿、关节、夹爪）的二进制写入器，接口与CsvStateWriter相同，一个臂的一个数据流对应一个实例
+    - 文件是标准的.npy结构化数组，可以用np.load(path, mmap_mode="r")直接内存映射读取，不需要解析文本
+    - 字段: timestamp(float64) + 数据；列表/元组为values(float64, (n,))，字典为每个键一个float64字段，缺少的键和非数值为NaN
+      字段在第一个样本到来时确定
+    - 样本先写入预分配的块，块满（flush_rows行）或距上次落盘超过flush_interval秒时整块追加到文件，
+      同时改写文件头中的行数，文件在每次落盘后都是完整可读的
+    """
+
+    # 文件头预留的长度(字节)，行数改写时文件头长度不变
+    header_size: int = 256
+
+    def __init__(self, path: str, flush_interval: float = 1.0, flush_rows: int = 256):
+        """
+        :param path: .npy文件路径
+        :param flush_interval: 最长落盘间隔(秒)
+        :param flush_rows: 每块的行数，块满后落盘
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+        self.columns: List[str] = None
+        self.dtype: np.dtype = None
+        self._keys = None
+        self._file = None
+        self._block: np.ndarray = None
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._closed = False
+        self._lock = threading.Lock()
+        # 统计: 写入行数、落盘次数
+        self.rows = 0
+        self.flushes = 0
+
+    def _open(self, data) -> None:
+        if isinstance(data, dict):
+            self._keys = list(data.keys())
+            self.columns = [str(key) for key in self._keys]
+            self.dtype = np.dtype([("timestamp", "<f8")] + [(column, "<f8") for column in self.columns])
+        else:
+            self.columns = [str(i) for i in range(len(data))]
+            self.dtype = np.dtype([("timestamp", "<f8"), ("values", "<f8", (len(self.columns),))])
+        self._block = np.zeros(self.flush_rows, dtype=self.dtype)
+        self._file = open(self.path, "wb")
+        self._write_header(0)
+        self._last_flush = time.monotonic()
+
+    def _write_header(self, rows: int) -> None:
+        """在文件开头写入.npy 1.0文件头，用空格填充到header_size，行数变化时原位改写"""
+        header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+            np.lib.format.dtype_to_descr(self.dtype), rows)
+        prefix = np.lib.format.magic(1, 0)
+        size = max(self.header_size, -(-(len(prefix) + 2 + len(header) + 1 + 20) // 64) * 64)
+        self.header_size = size
+        header = header.ljust(size - len(prefix) - 2 - 1) + "\n"
+        self._file.seek(0)
+        self._file.write(prefix + struct.pack("<H", len(header)) + header.encode("latin1"))
+
+    def write(self, ts: float, data) -> None:
+        """
+        写入一个样本
+        :param ts: 时间戳(秒)
+        :param data: 列表/元组，或字典（按字段取值，缺少的键为NaN，字段之外的键忽略）
+        """
+        with self._lock:
+            if self._closed:
+                return
+            if self._file is None:
+                self._open(data)
+            row = self._block[self._pending]
+            row["timestamp"] = ts
+            if self._keys is not None:
+                for key, column in zip(self._keys, self.columns):
+                    row[column] = _to_float(data.get(key))
+            else:
+                values = row["values"]
+                values[:] = np.nan
+                for i, value in enumerate(data[:len(values)]):
+                    values[i] = _to_float(value)
+            self.rows += 1
+            self._pending += 1
+            if self._pending >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def flush_if_due(self) -> None:
+        """距上次落盘超过flush_interval且有积压时落盘，消费线程空闲时调用，数据流停顿时块中的行也能及时写入"""
+        with self._lock:
+            if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending:
+                self._flush()
+
+    def _flush(self) -> None:
+        self._file.seek(0, 2)
+        self._file.write(self._block[:self._pending].tobytes())
+        self._write_header(self.rows)
+        self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self.flushes += 1
+
+    def close(self) -> None:
+        """落盘并关闭文件"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._file is not None:
+                if self._pending:
+                    self._flush()
+                self._file.close()
+                self._file = None
+                self._block = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        :return: 路径、写入行数和落盘次数
+        """
+        return {"path": self.path, "rows": self.rows, "flushes": self.flushes}
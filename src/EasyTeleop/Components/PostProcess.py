@@ -2,6 +2,7 @@ import os
 import json
 import csv
 import h5py
+import cv2
 import numpy as np
 from PIL import Image
 from scipy.interpolate import interp1d
@@ -24,6 +25,8 @@ class DataPostProcessor:
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
         self._placeholder_bytes = None
+        # 打开的视频文件: {路径: [VideoCapture, 下一次read返回的帧序号]}，按顺序读取时不需要seek
+        self._video_captures = {}
         
     def find_sessions(self):
         """
@@ -68,71 +71,176 @@ class DataPostProcessor:
                         image_data[camera_id] = {}
                     
                     for frame_file in os.listdir(camera_path):
-                        if frame_file.startswith("frame_") and (frame_file.endswith(".png") or frame_file.endswith(".jpg")):
-                            # 支持PNG和JPG格式
-                            timestamp = float(frame_file[6:-4])  # 去掉"frame_"前缀和文件扩展名
+                        if frame_file.startswith("frame_") and frame_file.endswith((".png", ".jpg", ".webp", ".npy")):
+                            # 支持PNG、JPG、WebP格式和未压缩的npy数组（由DataCollect.image_codec选择）
+                            timestamp = float(os.path.splitext(frame_file)[0][6:])  # 去掉"frame_"前缀和文件扩展名
                             image_data[camera_id][timestamp] = os.path.join(camera_path, frame_file)
+                elif camera_dir.startswith("camera_") and camera_dir.endswith("_timestamps.csv"):
+                    # 视频容器模式（DataCollect.video_format为video）: 帧为(视频文件, 帧序号)
+                    camera_id = int(camera_dir[len("camera_"):-len("_timestamps.csv")])
+                    video_file = self._find_video_file(frames_path, camera_id)
+                    if video_file is None:
+                        print(f"No video file found for {camera_path}")
+                        continue
+                    frames = image_data.setdefault(camera_id, {})
+                    with open(camera_path, "r", encoding="utf-8") as f:
+                        reader = csv.reader(f)
+                        next(reader, None)  # 跳过标题行
+                        for row in reader:
+                            if len(row) >= 2:
+                                frames[float(row[1])] = (video_file, int(row[0]))
                     
         # 加载双臂数据
         arm_data = {}
         for arm_id in [0, 1]:  # 支持两个臂
             arm_path = os.path.join(session_path, f"arm_{arm_id}")
             if os.path.exists(arm_path):
-                arm_data[arm_id] = {"pose": {}, "joint": {}, "end_effector": {}}
-                
-                # 加载位姿数据
-                pose_file = os.path.join(arm_path, "poses.csv")
-                if os.path.exists(pose_file):
-                    with open(pose_file, "r", encoding="utf-8") as f:
-                        reader = csv.reader(f)
-                        next(reader)  # 跳过标题行
-                        for row in reader:
-                            if len(row) >= 3:
-                                timestamp = float(row[0])
-                                index = int(row[1])
-                                value = float(row[2])
-                                
-                                if timestamp not in arm_data[arm_id]["pose"]:
-                                    arm_data[arm_id]["pose"][timestamp] = {}
-                                    
-                                arm_data[arm_id]["pose"][timestamp][index] = value
-                
-                # 加载关节数据
-                joint_file = os.path.join(arm_path, "joints.csv")
-                if os.path.exists(joint_file):
-                    with open(joint_file, "r", encoding="utf-8") as f:
-                        reader = csv.reader(f)
-                        next(reader)  # 跳过标题行
-                        for row in reader:
-                            if len(row) >= 3:
-                                timestamp = float(row[0])
-                                index = int(row[1])
-                                value = float(row[2])
-                                
-                                if timestamp not in arm_data[arm_id]["joint"]:
-                                    arm_data[arm_id]["joint"][timestamp] = {}
-                                    
-                                arm_data[arm_id]["joint"][timestamp][index] = value
-                
-                # 加载末端执行器数据
-                end_effector_file = os.path.join(arm_path, "end_effector.csv")
-                if os.path.exists(end_effector_file):
-                    with open(end_effector_file, "r", encoding="utf-8") as f:
-                        reader = csv.reader(f)
-                        next(reader)  # 跳过标题行
-                        for row in reader:
-                            if len(row) >= 3:
-                                timestamp = float(row[0])
-                                index = row[1]  # 末端执行器数据的索引可能是字符串
-                                value = float(row[2])
-                                
-                                if timestamp not in arm_data[arm_id]["end_effector"]:
-                                    arm_data[arm_id]["end_effector"][timestamp] = {}
-                                    
-                                arm_data[arm_id]["end_effector"][timestamp][index] = value
+                # 加载位姿、关节和末端执行器数据（末端执行器数据的索引可能是字符串）
+                arm_data[arm_id] = {
+                    "pose": self._load_state(arm_path, "poses"),
+                    "joint": self._load_state(arm_path, "joints"),
+                    "end_effector": self._load_state(arm_path, "end_effector", string_keys=True),
+                }
                     
         return metadata, image_data, arm_data
     
+    def _load_state(self, arm_path, name, string_keys=False):
+        """
+        加载一个状态数据流，优先读取二进制的.npy文件，没有时读取.csv文件
+        
+        Args:
+            arm_path (str): 机械臂数据目录
+            name (str): 数据流文件名（不含扩展名）
+            string_keys (bool): 索引保留为字符串（末端执行器数据），否则转换为整数
+            
+        Returns:
+            dict: {timestamp: {index: value}}
+        """
+        npy_file = os.path.join(arm_path, f"{name}.npy")
+        if os.path.exists(npy_file):
+            return self._load_state_npy(npy_file, string_keys)
+        return self._load_state_csv(os.path.join(arm_path, f"{name}.csv"), string_keys)
+    
+    @staticmethod
+    def load_state_array(npy_file):
+        """
+        以内存映射方式打开二进制状态文件（DataCollect.state_format为npy时记录）
+        
+        Args:
+            npy_file (str): .npy文件路径
+            
+        Returns:
+            tuple: (timestamps, values, columns)，timestamps为float64 (N,)，values为float64 (N, D)，
+                   columns为D个列名；values中缺失的数据为NaN
+        """
+        array = np.load(npy_file, mmap_mode="r")
+        timestamps = array["timestamp"]
+        if "values" in array.dtype.names:
+            values = array["values"]
+            columns = [str(i) for i in range(values.shape[1])]
+        else:
+            columns = [field for field in array.dtype.names if field != "timestamp"]
+            values = np.stack([array[column] for column in columns], axis=1) if columns else np.empty((len(array), 0))
+        return timestamps, values, columns
+    
+    def _load_state_npy(self, npy_file, string_keys=False):
+        """
+        加载一个二进制状态文件，返回与_load_state_csv相同的结构
+        
+        Args:
+            npy_file (str): .npy文件路径
+            string_keys (bool): 索引保留为字符串（末端执行器数据），否则转换为整数
+            
+        Returns:
+            dict: {timestamp: {index: value}}，NaN（缺失的数据）不包含在内
+        """
+        timestamps, values, columns = self.load_state_array(npy_file)
+        keys = [column if string_keys else int(column) for column in columns]
+        data = {}
+        for timestamp, row in zip(timestamps.tolist(), np.asarray(values).tolist()):
+            data[timestamp] = {key: value for key, value in zip(keys, row) if value == value}
+        return data
+    
+    def _load_state_csv(self, csv_file, string_keys=False):
+        """
+        加载一个状态CSV文件，支持两种格式：
+        - 宽格式: timestamp,<列0>,<列1>,...，每行一个样本
+        - 旧的长格式: timestamp,index,value，每行一个元素
+        
+        Args:
+            csv_file (str): CSV文件路径
+            string_keys (bool): 索引保留为字符串（末端执行器数据），否则转换为整数
+            
+        Returns:
+            dict: {timestamp: {index: value}}，文件不存在时为空字典
+        """
+        data = {}
+        if not os.path.exists(csv_file):
+            return data
+        with open(csv_file, "r", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return data
+            if header == ["timestamp", "index", "value"]:
+                for row in reader:
+                    if len(row) >= 3:
+                        timestamp = float(row[0])
+                        index = row[1] if string_keys else int(row[1])
+                        data.setdefault(timestamp, {})[index] = float(row[2])
+            else:
+                columns = [column if string_keys else int(column) for column in header[1:]]
+                for row in reader:
+                    if len(row) < 2:
+                        continue
+                    values = data.setdefault(float(row[0]), {})
+                    for index, value in zip(columns, row[1:]):
+                        try:
+                            values[index] = float(value)
+                        except ValueError:
+                            # 缺失的数据（空）和非数值跳过
+                            pass
+        return data
+    
+    @staticmethod
+    def _find_video_file(frames_path, camera_id):
+        """查找摄像头的视频文件camera_<id>.<扩展名>（时间戳文件除外）"""
+        prefix = f"camera_{camera_id}."
+        for name in sorted(os.listdir(frames_path)):
+            if name.startswith(prefix) and not name.endswith(".csv"):
+                return os.path.join(frames_path, name)
+        return None
+    
+    def read_video_frame(self, video_file, index):
+        """
+        按帧序号从视频文件中解码一帧，顺序读取时复用已打开的文件，不需要seek
+        
+        Args:
+            video_file (str): 视频文件路径
+            index (int): 帧序号（时间戳文件中的frame列）
+            
+        Returns:
+            np.ndarray: BGR图像，读取失败时为None
+        """
+        entry = self._video_captures.get(video_file)
+        if entry is None:
+            capture = cv2.VideoCapture(video_file)
+            if not capture.isOpened():
+                return None
+            entry = self._video_captures[video_file] = [capture, 0]
+        capture = entry[0]
+        if entry[1] != index:
+            capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+        ok, frame = capture.read()
+        entry[1] = index + 1 if ok else -1
+        return frame if ok else None
+    
+    def _release_videos(self):
+        """关闭打开的视频文件"""
+        for capture, _ in self._video_captures.values():
+            capture.release()
+        self._video_captures = {}
+    
     def _get_placeholder_image_bytes(self):
         """
         返回一个缓存的占位图像字节数据，避免重复创建。
@@ -146,13 +254,30 @@ class DataPostProcessor:
     
     def _load_image_bytes(self, image_path):
         """
-        将任意支持的图像文件读取为JPEG字节，失败时返回占位图像。
+        将任意支持的图像文件，或视频文件中的一帧（(视频文件, 帧序号)），读取为JPEG字节，失败时返回占位图像。
         """
+        if isinstance(image_path, tuple):
+            frame = self.read_video_frame(*image_path)
+            if frame is None:
+                print(f"Missing frame {image_path[1]} in {image_path[0]}, using placeholder.")
+                return self._get_placeholder_image_bytes()
+            ok, data = cv2.imencode(".jpg", frame)
+            return data.tobytes() if ok else self._get_placeholder_image_bytes()
         if not image_path or not os.path.exists(image_path):
             print(f"Missing image at {image_path}, using placeholder.")
             return self._get_placeholder_image_bytes()
         
         try:
+            if image_path.endswith(".npy"):
+                # 未压缩的BGR数组
+                ok, data = cv2.imencode(".jpg", np.load(image_path, allow_pickle=False))
+                return data.tobytes() if ok else self._get_placeholder_image_bytes()
+            # 采集时已经编码为JPEG的帧直接使用，不再解码后重新编码
+            if image_path.lower().endswith((".jpg", ".jpeg")):
+                with open(image_path, "rb") as f:
+                    data = f.read()
+                if data[:2] == b"\xff\xd8":
+                    return data
             with Image.open(image_path) as image:
                 buffer = io.BytesIO()
                 image.save(buffer, format='JPEG')
@@ -357,57 +482,25 @@ class DataPostProcessor:
                     # camera_0是主时间轴，直接使用其数据
                     for timestamp in master_timestamps:
                         if timestamp in image_data[camera_id]:
-                            image_path = image_data[camera_id][timestamp]
-                            try:
-                                # 读取图像并转换为JPEG格式的字节数据
-                                image = Image.open(image_path)
-                                buffer = io.BytesIO()
-                                image.save(buffer, format='JPEG')
-                                image_bytes = buffer.getvalue()
-                                image_list.append(image_bytes)  # 直接使用bytes而不是np.void
-                            except Exception as e:
-                                print(f"Error loading image {image_path}: {e}")
-                                # 添加一个空图像作为占位符
-                                buffer = io.BytesIO()
-                                placeholder = Image.new('RGB', (224, 224), color='black')
-                                placeholder.save(buffer, format='JPEG')
-                                image_list.append(buffer.getvalue())  # 直接使用bytes而不是np.void
+                            # 读取图像（或视频中的帧）并转换为JPEG格式的字节数据，直接使用bytes而不是np.void
+                            image_list.append(self._load_image_bytes(image_data[camera_id][timestamp]))
                         else:
                             print(f"No image found for timestamp {timestamp} in camera {camera_id}")
                             # 添加一个空图像作为占位符
-                            buffer = io.BytesIO()
-                            placeholder = Image.new('RGB', (224, 224), color='black')
-                            placeholder.save(buffer, format='JPEG')
-                            image_list.append(buffer.getvalue())  # 直接使用bytes而不是np.void
+                            image_list.append(self._get_placeholder_image_bytes())
                 else:
                     # 对于其他摄像头，需要基于主时间轴进行时间戳匹配
+                    camera_timestamps = sorted(image_data[camera_id].keys())
                     for master_ts in master_timestamps:
                         # 在当前摄像头中找到最接近主时间轴的时间戳
-                        closest_ts = self.find_closest_timestamp(master_ts, list(image_data[camera_id].keys()))
+                        closest_ts = self.find_closest_timestamp(master_ts, camera_timestamps)
                         
                         if closest_ts and closest_ts in image_data[camera_id]:
-                            image_path = image_data[camera_id][closest_ts]
-                            try:
-                                # 读取图像并转换为JPEG格式的字节数据
-                                image = Image.open(image_path)
-                                buffer = io.BytesIO()
-                                image.save(buffer, format='JPEG')
-                                image_bytes = buffer.getvalue()
-                                image_list.append(image_bytes)  # 直接使用bytes而不是np.void
-                            except Exception as e:
-                                print(f"Error loading image {image_path}: {e}")
-                                # 添加一个空图像作为占位符
-                                buffer = io.BytesIO()
-                                placeholder = Image.new('RGB', (224, 224), color='black')
-                                placeholder.save(buffer, format='JPEG')
-                                image_list.append(buffer.getvalue())  # 直接使用bytes而不是np.void
+                            image_list.append(self._load_image_bytes(image_data[camera_id][closest_ts]))
                         else:
                             print(f"No image found for timestamp {master_ts} in camera {camera_id}")
                             # 添加一个空图像作为占位符
-                            buffer = io.BytesIO()
-                            placeholder = Image.new('RGB', (224, 224), color='black')
-                            placeholder.save(buffer, format='JPEG')
-                            image_list.append(buffer.getvalue())  # 直接使用bytes而不是np.void
+                            image_list.append(self._get_placeholder_image_bytes())
                 print(f"Saved {len(image_list)} images for camera {camera_name}")
                 # 创建数据集
                 try:
@@ -422,6 +515,8 @@ class DataPostProcessor:
                     )
                 except Exception as e:
                     print(f"Error creating dataset with string_dtype for {camera_name}: {e}")
+            # 图像已全部读取，关闭视频文件
+            self._release_videos()
                    
             # 保存状态数据（观测值）
             # 为每个臂创建子组
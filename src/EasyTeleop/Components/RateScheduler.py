@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+# 超时策略
+OVERRUN_SKIP = "skip"
+OVERRUN_CATCH_UP = "catch_up"
+OVERRUN_POLICIES = (OVERRUN_SKIP, OVERRUN_CATCH_UP)
+
+# 统计信息的指数平滑系数
+_EWMA_ALPHA = 0.05
+
+
+class RateScheduler:
+    """
+    基于time.monotonic_ns绝对截止时间的固定频率调度器
+    每个周期的截止时间 = 起始时间 + n * 周期，睡眠时间自动扣除循环体和循环外的全部耗时，不会累积漂移
+    - skip: 某次迭代超时后跳过已经错过的周期，下一次在最近的未来截止时间执行（频率可能降低，但不会连续执行）
+    - catch_up: 超时后立即连续执行以补回错过的周期，保证长期平均频率；落后超过catch_up_limit个周期时放弃补偿
+    """
+
+    def __init__(self, rate: float = 0, overrun_policy: str = OVERRUN_SKIP, catch_up_limit: int = 10,
+                 window: int = 256):
+        """
+        :param rate: 目标频率(Hz)，小于等于0表示不控制频率
+        :param overrun_policy: 超时策略，"skip"或"catch_up"
+        :param catch_up_limit: catch_up策略下最多补偿的周期数
+        :param window: 统计迭代耗时分位数时保留的最近迭代数
+        """
+        self._period_ns = 0
+        self._policy = OVERRUN_SKIP
+        self.catch_up_limit = max(1, int(catch_up_limit))
+        self._window = max(1, int(window))
+        self.set_rate(rate)
+        self.set_overrun_policy(overrun_policy)
+        self.reset()
+
+    @property
+    def rate(self) -> float:
+        return 1e9 / self._period_ns if self._period_ns else 0
+
+    @property
+    def overrun_policy(self) -> str:
+        return self._policy
+
+    def set_rate(self, rate: float) -> None:
+        """
+        设置目标频率，下一个周期开始生效
+        :param rate: 目标频率(Hz)，小于等于0表示不控制频率
+        """
+        self._period_ns = int(1e9 / rate) if rate and rate > 0 else 0
+        self._deadline = None
+        self._last_start = None
+
+    def set_overrun_policy(self, policy: str) -> None:
+        if policy not in OVERRUN_POLICIES:
+            raise ValueError(f"不支持的超时策略: {policy}，可选: {OVERRUN_POLICIES}")
+        self._policy = policy
+
+    def resync(self) -> None:
+        """丢弃当前截止时间，下一次tick重新开始计时（例如重连之后），保留统计信息"""
+        self._deadline: Optional[int] = None
+        self._last_start: Optional[int] = None
+
+    def reset(self) -> None:
+        """清空截止时间和统计信息"""
+        self.resync()
+        self.iterations = 0
+        self.overruns = 0
+        self.skipped = 0
+        self._interval_ewma_ns = 0.0
+        self._jitter_ewma_ns = 0.0
+        self._jitter_max_ns = 0
+        self.last_duration_ns = 0
+        self._durations = deque(maxlen=self._window)
+
+    def tick(self) -> int:
+        """
+        一次迭代开始时调用，记录实际频率和唤醒抖动
+        :return: 本次迭代开始的时间(ns)
+        """
+        now = time.monotonic_ns()
+        if self._last_start is not None:
+            interval = now - self._last_start
+            if self._interval_ewma_ns:
+                self._interval_ewma_ns += _EWMA_ALPHA * (interval - self._interval_ewma_ns)
+            else:
+                self._interval_ewma_ns = float(interval)
+        if self._deadline is None:
+            self._deadline = now
+        elif self._period_ns:
+            jitter = now - self._deadline
+            if jitter < 0:
+                jitter = -jitter
+            self._jitter_ewma_ns += _EWMA_ALPHA * (jitter - self._jitter_ewma_ns)
+            if jitter > self._jitter_max_ns:
+                self._jitter_max_ns = jitter
+        self._last_start = now
+        self.iterations += 1
+        return now
+
+    def wait(self, stop_event: Optional[threading.Event] = None) -> None:
+        """
+        一次迭代结束时调用，记录迭代耗时并睡眠到下一个截止时间
+        :param stop_event: 停止信号，被设置时立即结束睡眠
+        """
+        delay = self.next_delay()
+        if delay <= 0:
+            return
+        if stop_event is not None:
+            stop_event.wait(delay)
+        else:
+            time.sleep(delay)
+
+    def next_delay(self) -> float:
+        """
+        一次迭代结束时调用，记录迭代耗时并推进截止时间，由调用方自行睡眠（例如asyncio.sleep）
+        :return: 距离下一个截止时间的秒数，0表示立即执行下一次迭代
+        """
+        now = time.monotonic_ns()
+        if self._last_start is not None:
+            self.last_duration_ns = now - self._last_start
+            self._durations.append(self.last_duration_ns)
+        if not self._period_ns or self._deadline is None:
+            return 0.0
+        period = self._period_ns
+        self._deadline += period
+        late = now - self._deadline
+        if late > 0:
+            self.overruns += 1
+            missed = late // period + 1
+            if self._policy == OVERRUN_SKIP or missed > self.catch_up_limit:
+                # 放弃错过的周期，对齐到下一个未来的截止时间
+                self.skipped += missed
+                self._deadline += missed * period
+            else:
+                # 立即执行下一次迭代，逐步追回
+                return 0.0
+        return (self._deadline - now) / 1e9
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取调度统计信息
+        :return: 目标频率、实际频率、平均/最大唤醒抖动(ms)、迭代耗时(ms)、超时和跳过的周期数
+        """
+        interval = self._interval_ewma_ns
+        durations = sorted(self._durations)
+        count = len(durations)
+        return {
+            "target_rate": self.rate,
+            "achieved_rate": 1e9 / interval if interval else 0.0,
+            "iterations": self.iterations,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "jitter_avg_ms": self._jitter_ewma_ns / 1e6,
+            "jitter_max_ms": self._jitter_max_ns / 1e6,
+            "last_duration_ms": self.last_duration_ns / 1e6,
+            "duration_p50_ms": durations[count // 2] / 1e6 if count else 0.0,
+            "duration_p99_ms": durations[min(count - 1, count * 99 // 100)] / 1e6 if count else 0.0,
+            "overrun_policy": self._policy,
+        }
@@ -0,0 +1,240 @@
+import threading
+import time
+import uuid
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+import numpy as np
+
+# 共享内存布局：
+#   [0, 128)          头部 int64[16]：魔数、槽位数、最新序号、维数、形状(最多4维)、dtype字符串
+#   [128, data)       每个槽位32字节：写入开始序号、写入结束序号、时间戳、单调时间戳(ns)
+#   [data, ...)       槽位数据，每个槽位按64字节对齐
+_MAGIC = 0x45544652494E4731  # "ETFRING1"
+_HEADER_SIZE = 128
+_SLOT_META_SIZE = 32
+_MAX_DIMS = 4
+_H_MAGIC, _H_SLOTS, _H_LATEST, _H_NDIM, _H_SHAPE = 0, 1, 2, 3, 4
+_H_DTYPE = _H_SHAPE + _MAX_DIMS  # dtype字符串占用的第一个int64
+_DTYPE_BYTES = 16
+
+
+_attach_lock = threading.Lock()
+
+
+def _align(size: int, alignment: int = 64) -> int:
+    return (size + alignment - 1) // alignment * alignment
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    附加已有的共享内存，不登记到resource_tracker
+    Python 3.10/3.11附加时也会登记，读取方进程退出时会误删写入方的缓冲区；
+    事后unregister又会删掉同一进程（或共享同一个tracker的子进程）中写入方的登记，所以在附加期间跳过登记
+    """
+    with _attach_lock:
+        register = resource_tracker.register
+
+        def skip_register(res_name, rtype):
+            if rtype == "shared_memory" and res_name.lstrip("/") == name.lstrip("/"):
+                return
+            register(res_name, rtype)
+
+        resource_tracker.register = skip_register
+        try:
+            return shared_memory.SharedMemory(name=name, create=False)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedFrameRing:
+    """
+    基于multiprocessing.shared_memory的固定形状帧环形缓冲区，用于跨进程传递相机帧
+    - 单写多读：写入方（相机进程）创建，读取方（采集、推流进程）按名称附加
+    - 每个槽位带序号和时间戳，写入时先更新开始序号、写完数据后更新结束序号，读取方据此判断帧是否完整（seqlock）
+    - read(copy=False)直接返回共享内存上的numpy视图，不拷贝；视图在写入方绕回该槽位前有效，用is_valid(seq)确认
+    - 读取方不需要和写入方在同一个进程，也不共享GIL
+    """
+
+    def __init__(self, name: str = None, shape: Tuple[int, ...] = None, dtype="uint8", slots: int = 4):
+        """
+        传入shape时创建新的缓冲区（写入方），不传shape时按名称附加已有的缓冲区（读取方）
+        :param name: 共享内存名称，创建时不传则自动生成
+        :param shape: 每帧的形状，例如(480, 640, 3)
+        :param dtype: 每帧的数据类型
+        :param slots: 槽位数量，读取方需要在slots-1帧的时间内处理完零拷贝视图
+        """
+        self.owner = shape is not None
+        if self.owner:
+            shape = tuple(int(dim) for dim in shape)
+            dtype = np.dtype(dtype)
+            if not 0 < len(shape) <= _MAX_DIMS:
+                raise ValueError(f"帧维数需要在1~{_MAX_DIMS}之间: {shape}")
+            if slots < 2:
+                raise ValueError("槽位数量至少为2")
+            if len(dtype.str) > _DTYPE_BYTES:
+                raise ValueError(f"不支持的数据类型: {dtype}")
+            size = self._layout(shape, dtype, slots)
+            name = name or f"easyteleop_{uuid.uuid4().hex[:12]}"
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self._header = np.ndarray((_HEADER_SIZE // 8,), dtype=np.int64, buffer=self.shm.buf)
+            self._header[:] = 0
+            self._header[_H_SLOTS] = slots
+            self._header[_H_NDIM] = len(shape)
+            self._header[_H_SHAPE:_H_SHAPE + len(shape)] = shape
+            dtype_bytes = dtype.str.encode("ascii").ljust(_DTYPE_BYTES, b"\0")
+            self.shm.buf[_H_DTYPE * 8:_H_DTYPE * 8 + _DTYPE_BYTES] = dtype_bytes
+            # 魔数最后写入，读取方看到魔数时头部已经完整
+            self._header[_H_MAGIC] = _MAGIC
+        else:
+            if not name:
+                raise ValueError("附加共享帧缓冲区需要提供名称")
+            self.shm = _attach(name)
+            self._header = np.ndarray((_HEADER_SIZE // 8,), dtype=np.int64, buffer=self.shm.buf)
+            if self._header[_H_MAGIC] != _MAGIC:
+                self.shm.close()
+                raise ValueError(f"共享内存{name}不是帧缓冲区")
+            slots = int(self._header[_H_SLOTS])
+            ndim = int(self._header[_H_NDIM])
+            shape = tuple(int(dim) for dim in self._header[_H_SHAPE:_H_SHAPE + ndim])
+            raw = bytes(self.shm.buf[_H_DTYPE * 8:_H_DTYPE * 8 + _DTYPE_BYTES])
+            dtype = np.dtype(raw.rstrip(b"\0").decode("ascii"))
+            self._layout(shape, dtype, slots)
+
+        self.name = self.shm.name
+        self.shape = shape
+        self.dtype = dtype
+        self.slots = slots
+        self._meta = np.ndarray((slots, _SLOT_META_SIZE // 8), dtype=np.int64,
+                                buffer=self.shm.buf, offset=_HEADER_SIZE)
+        self._stamps = self._meta.view(np.float64)
+        self._frames = [
+            np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=self._data_offset + i * self._slot_stride)
+            for i in range(slots)
+        ]
+        self._seq = int(self._header[_H_LATEST])
+        # 统计：写入帧数；读取时发现帧在拷贝期间被覆盖而放弃的次数
+        self.writes = 0
+        self.torn_reads = 0
+
+    def _layout(self, shape: Tuple[int, ...], dtype: np.dtype, slots: int) -> int:
+        """计算数据区偏移和槽位间隔，返回共享内存总大小"""
+        frame_bytes = int(np.prod(shape)) * dtype.itemsize
+        self.frame_bytes = frame_bytes
+        self._data_offset = _align(_HEADER_SIZE + slots * _SLOT_META_SIZE)
+        self._slot_stride = _align(frame_bytes)
+        return self._data_offset + slots * self._slot_stride
+
+    @property
+    def latest_seq(self) -> int:
+        """最新一帧的序号，从1开始，0表示还没有写入"""
+        return int(self._header[_H_LATEST])
+
+    def write(self, frame: np.ndarray, ts: float = None, mono_ns: int = None) -> int:
+        """
+        写入一帧（只允许一个写入方）
+        :param frame: 与缓冲区形状和类型相同的数组
+        :param ts: 时间戳，不传则取time.time()
+        :param mono_ns: 源头单调时间戳(ns)，不传则取time.monotonic_ns()；读取方按自己的时钟映射换算
+        :return: 该帧的序号
+        """
+        if frame.shape != self.shape:
+            raise ValueError(f"帧形状{frame.shape}与共享缓冲区{self.shape}不一致")
+        seq = self._seq + 1
+        slot = seq % self.slots
+        meta = self._meta[slot]
+        # 先标记开始写入，读取方拷贝完成后检查开始序号，发现被改写即丢弃
+        meta[0] = seq
+        np.copyto(self._frames[slot], frame, casting="unsafe")
+        self._stamps[slot, 2] = time.time() if ts is None else ts
+        meta[3] = time.monotonic_ns() if mono_ns is None else mono_ns
+        meta[1] = seq
+        self._header[_H_LATEST] = seq
+        self._seq = seq
+        self.writes += 1
+        return seq
+
+    def read(self, seq: int = None, copy: bool = True) -> Optional[Tuple[int, float, np.ndarray]]:
+        """
+        读取一帧
+        :param seq: 帧序号，不传则读取最新一帧
+        :param copy: 是否拷贝；False时返回共享内存上的视图，使用完后可用is_valid(seq)确认没有被覆盖
+        :return: (序号, 时间戳, 帧)，帧不存在或已经被覆盖时返回None
+        """
+        item = self.read_stamped(seq, copy)
+        if item is None:
+            return None
+        return item[0], item[1], item[3]
+
+    def read_stamped(self, seq: int = None, copy: bool = True) -> Optional[Tuple[int, float, int, np.ndarray]]:
+        """
+        与read相同，同时返回写入方记录的源头单调时间戳
+        :return: (序号, 时间戳, 单调时间戳ns, 帧)，帧不存在或已经被覆盖时返回None
+        """
+        if seq is None:
+            seq = self.latest_seq
+        if seq <= 0:
+            return None
+        slot = seq % self.slots
+        meta = self._meta[slot]
+        if meta[1] != seq:
+            return None
+        ts = float(self._stamps[slot, 2])
+        mono_ns = int(meta[3])
+        frame = self._frames[slot]
+        if copy:
+            frame = frame.copy()
+        # 拷贝期间写入方绕回了该槽位，数据可能不完整
+        if meta[0] != seq:
+            self.torn_reads += 1
+            return None
+        return seq, ts, mono_ns, frame
+
+    def is_valid(self, seq: int) -> bool:
+        """序号为seq的帧是否仍在缓冲区中（零拷贝视图使用完后检查）"""
+        meta = self._meta[seq % self.slots]
+        return seq > 0 and meta[0] == seq and meta[1] == seq
+
+    def wait(self, after_seq: int, timeout: float = 1.0, poll_interval: float = 0.002) -> int:
+        """
+        等待序号大于after_seq的新帧（轮询共享内存，适合跨进程）
+        :param after_seq: 上一次读取的序号
+        :param timeout: 超时时间(秒)
+        :param poll_interval: 轮询间隔(秒)
+        :return: 最新序号，超时返回0
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            seq = self.latest_seq
+            if seq > after_seq:
+                return seq
+            if time.monotonic() >= deadline:
+                return 0
+            time.sleep(poll_interval)
+
+    def close(self) -> None:
+        """关闭映射；写入方同时删除共享内存"""
+        # 先释放指向共享内存的numpy视图，否则close会因为仍有导出的缓冲区而失败
+        self._frames = []
+        self._header = None
+        self._meta = None
+        self._stamps = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # 读取方仍持有零拷贝视图，映射在视图释放后由GC回收
+            pass
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __reduce__(self):
+        # 传给子进程时只传名称，在子进程中重新附加
+        return (SharedFrameRing, (self.name,))
@@ -5,6 +5,10 @@ from aiortc import VideoStreamTrack
 import pyrealsense2 as rs
 import threading
 import queue
+import asyncio
+import time
+from .SharedFrameRing import SharedFrameRing
+from .FrameEncoder import EncodedFrame
 
 class CameraStreamTrack(VideoStreamTrack):
     def __init__(self, device_index):
@@ -69,21 +73,24 @@ class CameraDeviceStreamTrack(VideoStreamTrack):
     """
     A VideoStreamTrack that wraps a RealSenseCamera device to provide frames for WebRTC
     """
-    def __init__(self):
+    def __init__(self, queue_size: int = 1):
         """
-        :param realsense_camera: An instance of RealSenseCamera from Device.Camera.RealSenseCamera
+        :param queue_size: Max frames buffered for the encoder; older frames are skipped so the
+            stream always shows the newest image (skipped frames are counted in coalesced_frames)
         """
         super().__init__()
-        self._frame_queue = queue.Queue(maxsize=30)  # Limit queue size to prevent memory issues
+        self._frame_queue = queue.Queue(maxsize=queue_size)
         self._lock = threading.Lock()
+        self.coalesced_frames = 0
 
     def put_frame(self, color_frame):
-        """Callback when RealSenseCamera emits a frame"""
+        """Callback for a camera's frame event; also accepts the EncodedFrame from its encoded_frame event"""
         if color_frame is not None:
             # Remove oldest frame if queue is full
             if self._frame_queue.full():
                 try:
                     self._frame_queue.get_nowait()
+                    self.coalesced_frames += 1
                 except queue.Empty:
                     pass
             # Add new frame to queue
@@ -105,8 +112,10 @@ class CameraDeviceStreamTrack(VideoStreamTrack):
         if frame is None:
             raise Exception("Received empty frame from RealSense camera")
         
-        # Convert BGR to RGB
-        if len(frame.shape) == 3 and frame.shape[2] == 3:
+        # Convert BGR to RGB; an EncodedFrame converts once and shares the result with other tracks
+        if isinstance(frame, EncodedFrame):
+            frame = frame.rgb
+        elif len(frame.shape) == 3 and frame.shape[2] == 3:
             frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         
         # Create VideoFrame for WebRTC
@@ -123,4 +132,68 @@ class CameraDeviceStreamTrack(VideoStreamTrack):
                     self._frame_queue.get_nowait()
                 except queue.Empty:
                     break
-        super().stop()
\ No newline at end of file
+        super().stop()
+
+
+class SharedFrameStreamTrack(VideoStreamTrack):
+    """
+    A VideoStreamTrack that reads the newest frame from a SharedFrameRing, so the encoder can run
+    in a different process than the camera
+    """
+    def __init__(self, ring, poll_interval: float = 0.002, timeout: float = 5.0):
+        """
+        :param ring: SharedFrameRing or the shared memory name returned by BaseCamera.enable_shared_frames
+        :param poll_interval: Seconds between checks for a new frame
+        :param timeout: Seconds to wait for a frame before failing
+        """
+        super().__init__()
+        # Attach lazily: the camera creates the shared memory when its first frame arrives
+        self._name = ring if isinstance(ring, str) else None
+        self.ring = None if isinstance(ring, str) else ring
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._last_seq = 0
+        self.coalesced_frames = 0
+
+    async def recv(self):
+        """
+        Receive the newest frame; frames written while the encoder was busy are skipped
+        """
+        deadline = time.monotonic() + self.timeout
+        while self.ring is None:
+            try:
+                self.ring = SharedFrameRing(self._name)
+            except (FileNotFoundError, ValueError):
+                # ValueError: the segment exists but the camera has not finished writing its header yet
+                if time.monotonic() >= deadline:
+                    raise Exception(f"Shared camera frames {self._name} not found")
+                await asyncio.sleep(0.1)
+        while True:
+            seq = self.ring.latest_seq
+            if seq > self._last_seq:
+                # The BGR->RGB conversion reads straight from shared memory and produces the copy
+                item = self.ring.read(seq, copy=False)
+                if item is not None:
+                    frame = item[2]
+                    if len(frame.shape) == 3 and frame.shape[2] == 3:
+                        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    else:
+                        frame = frame.copy()
+                    if self.ring.is_valid(seq):
+                        break
+            if time.monotonic() >= deadline:
+                raise Exception("Timeout waiting for shared camera frame")
+            await asyncio.sleep(self.poll_interval)
+        if self._last_seq:
+            self.coalesced_frames += max(0, seq - self._last_seq - 1)
+        self._last_seq = seq
+
+        video_frame = VideoFrame.from_ndarray(frame, format="rgb24")
+        video_frame.pts, video_frame.time_base = await self.next_timestamp()
+        return video_frame
+
+    def stop(self):
+        """Stop the stream track and detach from the shared memory"""
+        super().stop()
+        if self.ring is not None and self._name is not None:
+            self.ring.close()
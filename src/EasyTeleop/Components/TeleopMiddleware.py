@@ -4,10 +4,28 @@ import time
 import math
 from typing import Dict, Any, Tuple, Callable
 from scipy.spatial.transform import Rotation as R  # 需要安装 scipy
+from .EventBus import EventBus, POLICY_INLINE, POLICY_POOLED
+
+# 状态类事件（Up/Down）: (字段, 按下事件, 松开事件)
+STATE_EVENTS = (
+    ("buttonA", "buttonADown", "buttonAUp"),
+    ("buttonB", "buttonBDown", "buttonBUp"),
+    ("buttonX", "buttonXDown", "buttonXUp"),
+    ("buttonY", "buttonYDown", "buttonYUp"),
+)
+# 触发类事件（TurnDown/TurnUp等，只在True时触发）
+TRIGGER_EVENTS = (
+    "buttonATurnDown", "buttonATurnUp",
+    "buttonBTurnDown", "buttonBTurnUp",
+    "buttonXTurnDown", "buttonXTurnUp",
+    "buttonYTurnDown", "buttonYTurnUp",
+    "rightGripTurnDown", "rightGripTurnUp",
+    "leftGripTurnDown", "leftGripTurnUp",
+)
 
 class TeleopMiddleware:
     def __init__(self):
-        # 用字典存储事件与回调的映射，格式: {事件名: [回调1, 回调2, ...]}
+        # 默认回调字典，格式: {事件名: 默认回调}，事件没有订阅者时执行
         self._events = {
             "buttonAUp": self._default_callback,
             "buttonADown": self._default_callback,
@@ -41,26 +59,37 @@ class TeleopMiddleware:
             "rightPosRot": self._default_callback,
             "leftPosQuat": self._default_callback,
             "rightPosQuat": self._default_callback,
+            "error": self._default_error_callback,
         }
+        # 事件总线，支持多订阅者；VR数据包的解析线程直接执行回调，保持原有的同步语义
+        # 按键切换事件的回调（切换采集状态、开始/停止控制）可能涉及文件或网络I/O，不在解析VR数据包的线程中执行，
+        # 交给一个分发线程按触发顺序执行（同一个线程保证按下和松开的回调不会乱序）
+        self.event_bus = EventBus(
+            name="TeleopMiddleware-events",
+            defaults=self._events,
+            noop=self._default_callback,
+            policy=POLICY_INLINE,
+            num_workers=1,
+            on_error=self._on_dispatch_error,
+        )
+        for event_name in TRIGGER_EVENTS:
+            self.event_bus.set_policy(event_name, POLICY_POOLED)
         
-    def on(self, event_name: str, callback: Callable = None) -> Callable:
+    def on(self, event_name: str, callback: Callable = None, mailbox: bool = False, inline: bool = False,
+           backlog: Callable[[], int] = None) -> Callable:
         """
         注册事件回调函数 - 可作为装饰器或普通方法使用
+        同一事件可以注册多个回调，事件触发时按注册顺序执行；需要订阅句柄时使用event_bus.subscribe
         :param event_name: 事件名称
         :param callback: 回调函数（可选，当作为装饰器使用时不需要）
+        :param mailbox: 只接收最新值，回调处理不过来时跳过旧事件（适合显示、推流等只关心最新帧的消费者）
+        :param inline: 在触发事件的线程中直接执行，省去线程切换，只适合非阻塞且很快的回调（例如队列append）
+        :param backlog: 积压探针，返回回调方尚未处理的数据量（例如queue.qsize），设备据此做背压
         :return: 装饰器函数或注册结果
         """
         # 装饰器工厂模式
         def decorator(func):
-            if not callable(func):
-                raise ValueError("回调函数必须是可调用对象")
-                
-            # 如果事件存在则更新回调
-            if event_name in self._events:
-                self._events[event_name] = func
-            else:
-                # 如果事件不存在，添加新的事件处理器
-                self._events[event_name] = func
+            self.event_bus.subscribe(event_name, func, mailbox=mailbox, inline=inline, backlog=backlog)
             return func
         
         # 如果提供了callback参数，则按照原来的方式工作
@@ -70,50 +99,43 @@ class TeleopMiddleware:
         # 否则返回装饰器
         return decorator
 
-    def off(self, event_name: str) -> bool:
+    def off(self, event_name: str, callback: Callable = None) -> bool:
         """
         移除事件回调函数，恢复默认回调
         :param event_name: 事件名称
+        :param callback: 要移除的回调函数（可选，不传则移除该事件的全部回调）
         """
-        if event_name in self._events:
-            self._events[event_name] = self._default_callback
-            return True
-        
-        return False
+        if callback is not None:
+            return self.event_bus.remove(event_name, callback)
+        removed = self.event_bus.clear(event_name)
+        return removed or event_name in self._events
 
     def emit(self, event_name: str, *args, **kwargs) -> None:
         """
-        触发事件，执行注册的回调函数
-        事件处理应是非阻塞的，对于耗时操作应该在独立线程中执行
+        触发事件，按事件的投递策略执行所有注册的回调函数（默认在当前线程中直接执行）
         :param event_name: 事件名称
         :param args: 位置参数
         :param kwargs: 关键字参数
         """
-        if event_name in self._events:
-            try:
-                self._events[event_name](*args, **kwargs)
-                # # 异步执行回调函数以避免阻塞事件循环
-                # callback = self._events[event_name]
-                # if asyncio.iscoroutinefunction(callback):
-                #     # 如果是异步函数，在新事件循环中运行
-                #     thread = threading.Thread(target=self._run_async_callback, args=(callback, args, kwargs), daemon=True)
-                #     thread.start()
-                # else:
-                #     # 同步函数在新线程中运行以避免阻塞
-                #     thread = threading.Thread(target=callback, args=args, kwargs=kwargs, daemon=True)
-                #     thread.start()
-            except Exception as e:
-                self.emit("error", f"事件{event_name}执行失败: {str(e)}")
+        self.event_bus.publish(event_name, *args, **kwargs)
 
-    def _run_async_callback(self, callback, args, kwargs):
-        """运行异步回调函数"""
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(callback(*args, **kwargs))
-            loop.close()
-        except Exception as e:
-            self.emit("error", f"异步事件回调执行失败: {str(e)}")
+    def has_subscribers(self, event_name: str) -> bool:
+        """
+        事件是否有回调（只有默认空回调时为False）
+        :param event_name: 事件名称
+        """
+        return self.event_bus.has_subscribers(event_name)
+
+    def _on_dispatch_error(self, event_name: str, error: Exception) -> None:
+        """回调执行失败时，通过error事件上报"""
+        if event_name == "error":
+            debug_print(f"error回调执行失败: {error}", True)
+            return
+        self.emit("error", f"事件{event_name}执行失败: {str(error)}")
+
+    def _default_error_callback(self, error_msg: str) -> None:
+        """默认错误回调函数，打印错误信息"""
+        debug_print(error_msg, True)
         
     def _default_callback(self,*args, **kwargs):
         pass
@@ -179,6 +201,11 @@ class TeleopMiddleware:
             msg_type = data_dict['type']
             payload = data_dict['payload']
             if msg_type == 'controller':
+                # 没有订阅者的位姿事件不做四元数转欧拉角，也不打包列表
+                has_subscribers = self.event_bus.has_subscribers
+                want_rot_l, want_quat_l = has_subscribers("leftPosRot"), has_subscribers("leftPosQuat")
+                want_rot_r, want_quat_r = has_subscribers("rightPosRot"), has_subscribers("rightPosQuat")
+
                 # 提取左臂位置和旋转角度
                 left_pos = payload['leftPos']
                 left_rot = payload['leftRot']
@@ -186,7 +213,8 @@ class TeleopMiddleware:
                 x_l, y_l, z_l = left_pos['x'], left_pos['y'], left_pos['z']
                 # roll_l, pitch_l, yaw_l = left_rot['x']*math.pi/180, left_rot['y']*math.pi/180, left_rot['z']*math.pi/180
                 quat_l = [left_quat['x'], left_quat['y'], left_quat['z'], left_quat['w']]
-                roll_l,pitch_l, yaw_l = euler_from_quaternion(quat_l)
+                if want_rot_l:
+                    roll_l,pitch_l, yaw_l = euler_from_quaternion(quat_l)
                 # roll_l = -roll_l  # 翻转 pitch 角度
 
                 # 提取右臂位置和旋转角度
@@ -196,7 +224,8 @@ class TeleopMiddleware:
                 x_r, y_r, z_r = right_pos['x'], right_pos['y'], right_pos['z']
                 # roll_r, pitch_r, yaw_r = right_rot['x']*math.pi/180, right_rot['y']*math.pi/180, right_rot['z']*math.pi/180
                 quat_r = [right_quat['x'], right_quat['y'], right_quat['z'], right_quat['w']]
-                roll_r,pitch_r, yaw_r = euler_from_quaternion(quat_r)
+                if want_rot_r:
+                    roll_r,pitch_r, yaw_r = euler_from_quaternion(quat_r)
                 # roll_r = -roll_r  # 翻转 pitch 角度
 
                 # 提取抓手状态
@@ -210,8 +239,10 @@ class TeleopMiddleware:
                     debug_print("左手坐标为0，丢弃该条信息", True)
                     pass
                 else:
-                    self.emit("leftPosRot",[x_l, y_l, z_l, roll_l, pitch_l, yaw_l])
-                    self.emit("leftPosQuat", [x_l, y_l, z_l, quat_l[0], quat_l[1], quat_l[2], quat_l[3]])
+                    if want_rot_l:
+                        self.emit("leftPosRot",[x_l, y_l, z_l, roll_l, pitch_l, yaw_l])
+                    if want_quat_l:
+                        self.emit("leftPosQuat", [x_l, y_l, z_l, quat_l[0], quat_l[1], quat_l[2], quat_l[3]])
                     # if payload['leftGrip']==True:
                     #     self.emit("leftGripDown",[x_l, y_l, z_l, roll_l, pitch_l, yaw_l],left_trigger)
                     # else:
@@ -221,21 +252,17 @@ class TeleopMiddleware:
                     debug_print("右手坐标为0，丢弃该条信息", True)
                     pass
                 else:
-                    self.emit("rightPosRot",[x_r, y_r, z_r, roll_r, pitch_r, yaw_r])
-                    self.emit("rightPosQuat", [x_r, y_r, z_r, quat_r[0], quat_r[1], quat_r[2], quat_r[3]])
+                    if want_rot_r:
+                        self.emit("rightPosRot",[x_r, y_r, z_r, roll_r, pitch_r, yaw_r])
+                    if want_quat_r:
+                        self.emit("rightPosQuat", [x_r, y_r, z_r, quat_r[0], quat_r[1], quat_r[2], quat_r[3]])
                     # if payload['rightGrip']==True:
                     #     self.emit("rightGripDown",[x_r, y_r, z_r, roll_r, pitch_r, yaw_r],right_trigger)
                     # else:
                     #     self.emit("rightGripUp")
 
                 # 状态类事件（Up/Down）
-                state_events = [
-                    ("buttonA", "buttonADown", "buttonAUp"),
-                    ("buttonB", "buttonBDown", "buttonBUp"),
-                    ("buttonX", "buttonXDown", "buttonXUp"),
-                    ("buttonY", "buttonYDown", "buttonYUp"),
-                ]
-                for field, down_evt, up_evt in state_events:
+                for field, down_evt, up_evt in STATE_EVENTS:
                     if field in payload:
                         if payload[field]:
                             self.emit(down_evt)
@@ -243,15 +270,7 @@ class TeleopMiddleware:
                             self.emit(up_evt)
 
                 # 触发类事件（TurnDown/TurnUp等，只在True时触发）
-                trigger_events = [
-                    "buttonATurnDown", "buttonATurnUp",
-                    "buttonBTurnDown", "buttonBTurnUp",
-                    "buttonXTurnDown", "buttonXTurnUp",
-                    "buttonYTurnDown", "buttonYTurnUp",
-                    "rightGripTurnDown", "rightGripTurnUp",
-                    "leftGripTurnDown", "leftGripTurnUp"
-                ]
-                for evt in trigger_events:
+                for evt in TRIGGER_EVENTS:
                     if payload.get(evt, False):
                         self.emit(evt)
 
@@ -0,0 +1,230 @@
+import fnmatch
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+# 调度策略名称 -> os模块中的常量名
+_POLICIES = {
+    "other": "SCHED_OTHER",
+    "fifo": "SCHED_FIFO",
+    "rr": "SCHED_RR",
+    "batch": "SCHED_BATCH",
+    "idle": "SCHED_IDLE",
+}
+# 从环境变量读取规则（JSON），子进程（例如DeviceProcess）同样生效
+ENV_VAR = "EASYTELEOP_THREAD_PLACEMENT"
+
+
+class ThreadPlacement:
+    """
+    线程放置：按线程名称为设备和控制线程设置CPU亲和性和实时调度策略（Linux）
+    - 规则按线程名匹配（fnmatch通配符），按添加顺序取第一条匹配的规则，例如
+      {"RealManWithIK-control": {"cpus": [2], "policy": "fifo", "priority": 80}, "*-main": {"cpus": [3]}}
+    - 线程在启动后第一时间调用apply()（或用wrap包装线程函数），只对调用线程本身生效
+    - 没有权限（SCHED_FIFO/SCHED_RR通常需要root或CAP_SYS_NICE）或不是Linux时跳过并记录原因，不影响线程运行
+    - 同时把线程名写入内核（/proc/self/task/<tid>/comm），top -H、perf、py-spy中可以看到线程属于哪个设备
+    """
+
+    def __init__(self, rules: Dict[str, Dict[str, Any]] = None):
+        """
+        :param rules: {线程名通配符: {"cpus": CPU列表, "policy": other/fifo/rr/batch/idle, "priority": 实时优先级, "nice": nice值}}
+        """
+        self._rules: List[tuple] = []
+        self._lock = threading.Lock()
+        # 每个线程的放置结果: {线程名: {...}}
+        self._applied: Dict[str, Dict[str, Any]] = {}
+        # 已经打印过的失败原因，避免每个线程重复打印
+        self._warned = set()
+        # 进程主线程的CPU亲和性，用于恢复没有规则的线程
+        try:
+            self._default_cpus = os.sched_getaffinity(os.getpid())
+        except (AttributeError, OSError):
+            self._default_cpus = None
+        if rules:
+            self.configure(rules)
+
+    def configure(self, rules: Dict[str, Dict[str, Any]], replace: bool = True) -> None:
+        """
+        设置放置规则，只影响之后调用apply的线程
+        :param rules: {线程名通配符: 放置参数}
+        :param replace: 是否替换已有规则，False时追加在已有规则之后
+        """
+        parsed = []
+        for pattern, rule in rules.items():
+            policy = rule.get("policy")
+            if policy is not None and policy not in _POLICIES:
+                raise ValueError(f"不支持的调度策略: {policy}，可选 {list(_POLICIES)}")
+            cpus = rule.get("cpus")
+            parsed.append((pattern, {
+                "cpus": set(int(cpu) for cpu in cpus) if cpus is not None else None,
+                "policy": policy,
+                "priority": int(rule.get("priority", 0)),
+                "nice": rule.get("nice"),
+            }))
+        with self._lock:
+            self._rules = parsed if replace else self._rules + parsed
+
+    def configure_from_env(self) -> bool:
+        """
+        从环境变量EASYTELEOP_THREAD_PLACEMENT(JSON)读取规则
+        :return: 是否读取到规则
+        """
+        text = os.environ.get(ENV_VAR)
+        if not text:
+            return False
+        try:
+            self.configure(json.loads(text))
+            return True
+        except Exception as e:
+            print(f"[ThreadPlacement] 环境变量{ENV_VAR}解析失败: {e}")
+            return False
+
+    def match(self, name: str) -> Optional[Dict[str, Any]]:
+        """按线程名查找第一条匹配的规则"""
+        for pattern, rule in self._rules:
+            if fnmatch.fnmatchcase(name, pattern):
+                return rule
+        return None
+
+    def apply(self, name: str = None) -> Dict[str, Any]:
+        """
+        对调用线程应用放置规则，在线程函数开头调用
+        :param name: 线程名，不传则使用当前线程名；传入时同时修改当前线程名
+        :return: 放置结果，包含cpus/policy/priority和失败原因errors
+        """
+        thread = threading.current_thread()
+        if name:
+            thread.name = name
+        name = thread.name
+        _set_native_name(name)
+        result: Dict[str, Any] = {"tid": threading.get_native_id(), "cpus": None, "policy": "other",
+                                  "priority": 0, "errors": []}
+        rule = self.match(name) or {"cpus": None, "policy": None, "priority": 0, "nice": None}
+        if rule["cpus"] is not None:
+            self._set_affinity(rule["cpus"], result)
+        else:
+            self._restore_affinity()
+        if rule["policy"] is not None:
+            self._set_policy(rule["policy"], rule["priority"], result)
+        else:
+            self._restore_policy()
+        if rule["nice"] is not None:
+            self._set_nice(int(rule["nice"]), result)
+        with self._lock:
+            self._applied[name] = result
+        for error in result["errors"]:
+            if error not in self._warned:
+                self._warned.add(error)
+                print(f"[ThreadPlacement] {name}: {error}")
+        return result
+
+    def wrap(self, target: Callable, name: str = None) -> Callable:
+        """
+        包装线程函数，线程启动后先应用放置规则再执行target
+        用法: threading.Thread(target=placement.wrap(self._control_loop), name="RealMan-control")
+        """
+        def run(*args, **kwargs):
+            self.apply(name)
+            return target(*args, **kwargs)
+        run.__name__ = getattr(target, "__name__", "run")
+        return run
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """获取已经应用过放置规则的线程及结果"""
+        with self._lock:
+            return {name: dict(result) for name, result in self._applied.items()}
+
+    def _restore_affinity(self) -> None:
+        """新线程继承创建它的线程的亲和性（例如由控制线程惰性创建的分发线程），没有规则时恢复为进程默认值"""
+        if self._default_cpus is None:
+            return
+        try:
+            if os.sched_getaffinity(0) != self._default_cpus:
+                os.sched_setaffinity(0, self._default_cpus)
+        except OSError:
+            pass
+
+    def _restore_policy(self) -> None:
+        """新线程同样继承实时调度策略，没有规则时恢复为SCHED_OTHER"""
+        if not hasattr(os, "sched_getscheduler"):
+            return
+        try:
+            if os.sched_getscheduler(0) in (os.SCHED_FIFO, os.SCHED_RR):
+                os.sched_setscheduler(0, os.SCHED_OTHER, os.sched_param(0))
+        except OSError:
+            pass
+
+    def _set_affinity(self, cpus, result) -> None:
+        if not hasattr(os, "sched_setaffinity"):
+            result["errors"].append("当前系统不支持设置CPU亲和性")
+            return
+        try:
+            available = os.sched_getaffinity(0)
+            wanted = cpus & available
+            if not wanted:
+                result["errors"].append(f"CPU{sorted(cpus)}不可用（可用{sorted(available)}），保持默认亲和性")
+                return
+            # Linux上pid为0表示调用线程本身
+            os.sched_setaffinity(0, wanted)
+            result["cpus"] = sorted(wanted)
+        except OSError as e:
+            result["errors"].append(f"设置CPU亲和性失败: {e}")
+
+    def _set_policy(self, policy: str, priority: int, result) -> None:
+        constant = getattr(os, _POLICIES[policy], None)
+        if constant is None or not hasattr(os, "sched_setscheduler"):
+            result["errors"].append(f"当前系统不支持调度策略{policy}")
+            return
+        if policy in ("fifo", "rr"):
+            low, high = os.sched_get_priority_min(constant), os.sched_get_priority_max(constant)
+            priority = min(max(priority or low, low), high)
+        else:
+            priority = 0
+        try:
+            os.sched_setscheduler(0, constant, os.sched_param(priority))
+            result["policy"] = policy
+            result["priority"] = priority
+        except PermissionError:
+            result["errors"].append(f"没有权限使用调度策略{policy}（需要root或CAP_SYS_NICE），保持默认调度")
+        except OSError as e:
+            result["errors"].append(f"设置调度策略{policy}失败: {e}")
+
+    def _set_nice(self, nice: int, result) -> None:
+        if not hasattr(os, "setpriority"):
+            result["errors"].append("当前系统不支持设置nice值")
+            return
+        try:
+            # Linux上nice值按线程生效
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), nice)
+            result["nice"] = nice
+        except OSError as e:
+            result["errors"].append(f"设置nice值{nice}失败: {e}")
+
+
+def _set_native_name(name: str) -> None:
+    """把线程名写入内核，最多15个字符（Linux）"""
+    try:
+        with open(f"/proc/self/task/{threading.get_native_id()}/comm", "w") as f:
+            f.write(name[:15])
+    except OSError:
+        pass
+
+
+_default_placement: Optional[ThreadPlacement] = None
+_default_placement_lock = threading.Lock()
+
+
+def get_thread_placement() -> ThreadPlacement:
+    """
+    获取进程共享的线程放置配置，第一次调用时读取环境变量EASYTELEOP_THREAD_PLACEMENT
+    :return: ThreadPlacement
+    """
+    global _default_placement
+    if _default_placement is None:
+        with _default_placement_lock:
+            if _default_placement is None:
+                placement = ThreadPlacement()
+                placement.configure_from_env()
+                _default_placement = placement
+    return _default_placement
@@ -0,0 +1,191 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+import cv2
+import numpy as np
+from ..FrameEncoder import EncodedFrame
+from ..ThreadPlacement import get_thread_placement
+
+
+class BaseTransport(ABC):
+    """
+    视频传输层接口抽象类：摄像头把帧交给传输层，由传输层发送到VR、其他进程或文件
+    - publish在摄像头线程中调用（inline订阅），只做限速判断和替换最新帧，不会阻塞摄像头和采集
+    - 每个传输层有独立的发送线程，发送慢时只保留最新一帧，跳过的帧记录在coalesced中
+    - max_fps限制发送帧率，max_size限制分辨率（按比例缩小），每个传输层单独设置
+    """
+
+    def __init__(self, name: str, max_fps: float = None, max_size: Tuple[int, int] = None):
+        """
+        :param name: 传输层名称，遥操组按名称管理
+        :param max_fps: 最大发送帧率，None表示不限制
+        :param max_size: 最大分辨率(宽, 高)，超过时按比例缩小，None表示不限制
+        """
+        self.name = name
+        self.max_fps = max_fps
+        self.max_size = tuple(max_size) if max_size else None
+        self.running = False
+        self._cond = threading.Condition()
+        # 待发送的最新帧: (帧, 时间戳)
+        self._pending = None
+        # 限速的下一个接收时刻，每接收一帧累加一个周期，摄像头帧间隔的抖动不会导致丢帧
+        self._next_accept = 0.0
+        self._thread: Optional[threading.Thread] = None
+        # 已经订阅的摄像头: [(摄像头, 事件名称)]
+        self._sources = []
+        # 统计: 收到帧数、限速丢弃、发送慢被合并、发送成功、发送失败、累计发送耗时
+        self.published = 0
+        self.rate_dropped = 0
+        self.coalesced = 0
+        self.sent = 0
+        self.errors = 0
+        self._send_ns = 0
+        self._last_error = None
+
+    def attach(self, camera, event_name: str = "frame") -> None:
+        """
+        订阅摄像头的帧
+        :param camera: 摄像头设备（BaseCamera或DeviceProcess代理）
+        :param event_name: frame或encoded_frame
+        """
+        camera.on(event_name, self.publish, inline=True)
+        self._sources.append((camera, event_name))
+
+    def detach(self) -> None:
+        """取消订阅所有摄像头"""
+        for camera, event_name in self._sources:
+            camera.off(event_name, self.publish)
+        self._sources = []
+
+    def publish(self, frame, ts: float = None) -> bool:
+        """
+        提交一帧，超过max_fps的帧直接丢弃，发送线程还没取走的旧帧被替换
+        :param frame: BGR图像或EncodedFrame
+        :param ts: 时间戳，不传则使用EncodedFrame的时间戳或当前时间
+        :return: 是否被接受
+        """
+        if not self.running or frame is None:
+            return False
+        self.published += 1
+        if self.max_fps:
+            now = time.monotonic()
+            period = 1.0 / self.max_fps
+            # 允许半个周期的提前量：摄像头帧率等于max_fps时，抖动的帧不会被丢弃，长期帧率仍不超过max_fps
+            if now < self._next_accept - period / 2:
+                self.rate_dropped += 1
+                return False
+            # 停顿之后不积累额度，避免恢复时连续放行
+            self._next_accept = max(self._next_accept + period, now)
+        if ts is None:
+            ts = frame.ts if isinstance(frame, EncodedFrame) else time.time()
+        with self._cond:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = (frame, ts)
+            self._cond.notify()
+        return True
+
+    def start(self) -> bool:
+        """启动发送线程"""
+        if self.running:
+            return True
+        try:
+            self._open()
+        except Exception as e:
+            print(f"传输层{self.name}启动失败: {e}")
+            return False
+        self.running = True
+        self._thread = threading.Thread(target=get_thread_placement().wrap(self._run), name=f"Transport-{self.name}",
+                                        daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 1.0) -> bool:
+        """停止发送线程并释放资源"""
+        if not self.running:
+            return True
+        with self._cond:
+            self.running = False
+            self._pending = None
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        try:
+            self._close()
+        except Exception as e:
+            print(f"传输层{self.name}关闭失败: {e}")
+        return self._thread is None or not self._thread.is_alive()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self.running and self._pending is None:
+                    self._cond.wait()
+                if not self.running:
+                    return
+                frame, ts = self._pending
+                self._pending = None
+            start = time.perf_counter_ns()
+            try:
+                encoded = frame if isinstance(frame, EncodedFrame) else None
+                image = self._resize(encoded.raw if encoded is not None else frame)
+                # 缩小后编码结果不再对应，发送端自行编码
+                if encoded is not None and image is not encoded.raw:
+                    encoded = None
+                if self._send(image, ts, encoded) is not False:
+                    self._send_ns += time.perf_counter_ns() - start
+                    self.sent += 1
+            except Exception as e:
+                self.errors += 1
+                message = str(e)
+                if message != self._last_error:
+                    self._last_error = message
+                    print(f"传输层{self.name}发送失败: {message}")
+
+    def _resize(self, frame: np.ndarray) -> np.ndarray:
+        """超过max_size时按比例缩小"""
+        if self.max_size is None:
+            return frame
+        height, width = frame.shape[:2]
+        scale = min(self.max_size[0] / width, self.max_size[1] / height)
+        if scale >= 1.0:
+            return frame
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        :return: 收到帧数、限速丢弃、合并、发送成功、发送失败和平均发送耗时(ms)
+        """
+        return {
+            "type": self.__class__.__name__,
+            "running": self.running,
+            "max_fps": self.max_fps,
+            "max_size": self.max_size,
+            "published": self.published,
+            "rate_dropped": self.rate_dropped,
+            "coalesced": self.coalesced,
+            "sent": self.sent,
+            "errors": self.errors,
+            "send_avg_ms": self._send_ns / self.sent / 1e6 if self.sent else 0.0,
+        }
+
+    def _open(self) -> None:
+        """启动时打开连接或资源，默认什么也不做"""
+        pass
+
+    def _close(self) -> None:
+        """停止时释放连接或资源，默认什么也不做"""
+        pass
+
+    @abstractmethod
+    def _send(self, frame: np.ndarray, ts: float, encoded: Optional[EncodedFrame]) -> Optional[bool]:
+        """
+        在发送线程中发送一帧，发送失败时抛出异常
+        :param frame: 已经按max_size缩小的BGR图像
+        :param ts: 时间戳
+        :param encoded: 摄像头编码阶段的结果，没有启用编码或帧被缩小时为None
+        :return: 返回False表示跳过了该帧（例如没有接收方），不计入sent
+        """
+        pass
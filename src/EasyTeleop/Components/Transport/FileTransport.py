@@ -0,0 +1,88 @@
+import os
+import stat
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+from .BaseTransport import BaseTransport
+from ..FrameEncoder import EncodedFrame
+
+
+class FileTransport(BaseTransport):
+    """
+    把帧写入本地文件或命名管道(FIFO)，供ffplay/ffmpeg或其他程序读取
+    - mjpeg: 连续写入JPEG图像，例如 ffplay -f mjpeg <path>；摄像头已经编码为JPEG时直接写入编码结果
+    - raw: 写入原始BGR字节，例如 ffplay -f rawvideo -pixel_format bgr24 -video_size 640x480 <path>
+    - 命名管道没有读取方时跳过该帧，读取方断开后等待重新连接，不影响摄像头和采集
+    """
+    FORMATS = ("mjpeg", "raw")
+
+    def __init__(self, name: str, path: str, format: str = "mjpeg", quality: int = 80,
+                 max_fps: float = None, max_size: Tuple[int, int] = None):
+        """
+        :param name: 传输层名称
+        :param path: 文件或命名管道路径
+        :param format: mjpeg或raw
+        :param quality: mjpeg的JPEG质量(0~100)
+        :param max_fps: 最大发送帧率
+        :param max_size: 最大分辨率(宽, 高)
+        """
+        if format not in self.FORMATS:
+            raise ValueError(f"不支持的格式: {format}，可选 {list(self.FORMATS)}")
+        super().__init__(name, max_fps, max_size)
+        self.path = path
+        self.format = format
+        self.quality = quality
+        self._file = None
+        # 统计: 命名管道没有读取方而跳过的帧数
+        self.no_reader = 0
+
+    def _is_fifo(self) -> bool:
+        try:
+            return stat.S_ISFIFO(os.stat(self.path).st_mode)
+        except FileNotFoundError:
+            return False
+
+    def _ensure_open(self) -> bool:
+        if self._file is not None:
+            return True
+        if self._is_fifo():
+            # 非阻塞打开，没有读取方时立即失败，不会卡住发送线程
+            try:
+                fd = os.open(self.path, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError:
+                self.no_reader += 1
+                return False
+            os.set_blocking(fd, True)
+            self._file = os.fdopen(fd, "wb")
+        else:
+            self._file = open(self.path, "wb")
+        return True
+
+    def _close(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _send(self, frame: np.ndarray, ts: float, encoded: Optional[EncodedFrame]) -> bool:
+        if not self._ensure_open():
+            return False
+        if self.format == "raw":
+            data = np.ascontiguousarray(frame).data
+        elif encoded is not None and encoded.codec == "jpeg":
+            data = encoded.data
+        else:
+            ok, buffer = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), self.quality])
+            if not ok:
+                raise RuntimeError("JPEG编码失败")
+            data = buffer.data
+        try:
+            self._file.write(data)
+            self._file.flush()
+        except BrokenPipeError:
+            # 读取方断开，下一帧重新打开
+            self._close()
+            raise
+        return True
@@ -0,0 +1,37 @@
+from typing import Optional, Tuple
+import numpy as np
+from .BaseTransport import BaseTransport
+from ..FrameEncoder import EncodedFrame
+from ..SharedFrameRing import SharedFrameRing
+
+
+class SharedMemoryTransport(BaseTransport):
+    """
+    把帧写入SharedFrameRing，其他进程（显示、推流、录制）用SharedFrameRing(ring_name)附加后读取
+    共享内存在第一帧到来时按（缩小后的）帧形状创建
+    """
+
+    def __init__(self, name: str, ring_name: str = None, slots: int = 4,
+                 max_fps: float = None, max_size: Tuple[int, int] = None):
+        """
+        :param name: 传输层名称
+        :param ring_name: 共享内存名称，不传则根据name生成
+        :param slots: 槽位数量
+        :param max_fps: 最大发送帧率
+        :param max_size: 最大分辨率(宽, 高)
+        """
+        super().__init__(name, max_fps, max_size)
+        self.ring_name = ring_name or f"easyteleop_{name.lower()}_{id(self):x}"
+        self.slots = slots
+        self.ring: Optional[SharedFrameRing] = None
+
+    def _close(self) -> None:
+        ring = self.ring
+        self.ring = None
+        if ring is not None:
+            ring.close()
+
+    def _send(self, frame: np.ndarray, ts: float, encoded: Optional[EncodedFrame]) -> None:
+        if self.ring is None:
+            self.ring = SharedFrameRing(self.ring_name, frame.shape, frame.dtype, self.slots)
+        self.ring.write(frame, ts)
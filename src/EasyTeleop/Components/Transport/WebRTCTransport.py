@@ -0,0 +1,49 @@
+from typing import Optional, Tuple
+import numpy as np
+from .BaseTransport import BaseTransport
+from ..FrameEncoder import EncodedFrame
+from ..StreamTracker import CameraDeviceStreamTrack
+from ..WebRTC import UnityWebRTC
+from ..AsyncLoop import get_background_loop
+
+
+class WebRTCTransport(BaseTransport):
+    """
+    通过WebRTC把帧推送到VR端（UnityWebRTC + CameraDeviceStreamTrack）
+    信令连接运行在共享的后台事件循环中，断线后由UnityWebRTC自动重连
+    """
+
+    def __init__(self, name: str, signaling_url: str, connection_id: str = None,
+                 max_fps: float = None, max_size: Tuple[int, int] = None):
+        """
+        :param name: 传输层名称
+        :param signaling_url: 信令服务器地址，例如wss://webrtc.chainpray.top
+        :param connection_id: VR端的连接ID（例如LeftEye），不传则使用name
+        :param max_fps: 最大发送帧率
+        :param max_size: 最大分辨率(宽, 高)
+        """
+        super().__init__(name, max_fps, max_size)
+        self.signaling_url = signaling_url
+        self.connection_id = connection_id or name
+        self.track: Optional[CameraDeviceStreamTrack] = None
+        self.client: Optional[UnityWebRTC] = None
+        self._future = None
+
+    def _open(self) -> None:
+        self.track = CameraDeviceStreamTrack()
+        self.client = UnityWebRTC(connection_id=self.connection_id, signaling_url=self.signaling_url, tracker=self.track)
+        self._future = get_background_loop().submit(self.client.connect())
+
+    def _close(self) -> None:
+        if self.client is not None:
+            self.client.stop()
+        if self._future is not None:
+            # 取消正在等待信令消息的连接协程
+            self._future.cancel()
+            self._future = None
+        if self.track is not None:
+            self.track.stop()
+
+    def _send(self, frame: np.ndarray, ts: float, encoded: Optional[EncodedFrame]) -> None:
+        # EncodedFrame的RGB转换在多路推流之间共享
+        self.track.put_frame(encoded if encoded is not None else frame)
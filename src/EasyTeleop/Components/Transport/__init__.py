@@ -0,0 +1,12 @@
+# Transport包初始化文件
+from .BaseTransport import BaseTransport
+from .WebRTCTransport import WebRTCTransport
+from .SharedMemoryTransport import SharedMemoryTransport
+from .FileTransport import FileTransport
+
+__all__ = [
+    'BaseTransport',
+    'WebRTCTransport',
+    'SharedMemoryTransport',
+    'FileTransport',
+]
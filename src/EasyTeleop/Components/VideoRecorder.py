@@ -0,0 +1,93 @@
+import threading
+from typing import Any, Dict
+import cv2
+import numpy as np
+from .FrameEncoder import EncodedFrame
+
+
+class VideoRecorder:
+    """
+    把一个摄像头的帧编码到视频文件（默认MJPG/AVI），同时写入逐帧时间戳的旁路文件
+    - 视频文件: <path>，帧尺寸和颜色由第一帧决定，之后尺寸不同的帧缩放到第一帧的尺寸
+    - 时间戳文件: <path去掉扩展名>_timestamps.csv，表头frame,timestamp，第i行对应视频中的第i帧
+    - 每帧一次VideoWriter.write，不会像逐帧保存图片那样产生大量小文件
+    - write/close线程安全，close之后的write直接丢弃
+    """
+
+    # 时间戳文件每多少帧落盘一次
+    flush_frames: int = 30
+
+    def __init__(self, path: str, fps: float = 30.0, fourcc: str = "MJPG", quality: int = 90):
+        """
+        :param path: 视频文件路径
+        :param fps: 写入容器的名义帧率，实际的帧时间以时间戳文件为准
+        :param fourcc: 编码器四字符码，例如MJPG（.avi）、mp4v（.mp4）
+        :param quality: 编码质量(0-100)，MJPG有效
+        """
+        self.path = path
+        self.timestamps_path = path.rsplit(".", 1)[0] + "_timestamps.csv"
+        self.fps = fps
+        self.fourcc = fourcc
+        self.quality = quality
+        self.size = None
+        self._color = True
+        self._writer = None
+        self._timestamps = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self.frames = 0
+
+    def _open(self, frame: np.ndarray) -> None:
+        height, width = frame.shape[:2]
+        self.size = (width, height)
+        self._color = frame.ndim == 3
+        self._writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, self.size, self._color)
+        if not self._writer.isOpened():
+            self._writer = None
+            raise RuntimeError(f"无法创建视频文件{self.path}（编码器{self.fourcc}）")
+        self._writer.set(cv2.VIDEOWRITER_PROP_QUALITY, self.quality)
+        self._timestamps = open(self.timestamps_path, "w", encoding="utf-8")
+        self._timestamps.write("frame,timestamp\n")
+
+    def write(self, ts: float, frame) -> None:
+        """
+        写入一帧
+        :param ts: 时间戳(秒)
+        :param frame: numpy数组（BGR或灰度）或EncodedFrame（使用其原始帧）
+        """
+        if isinstance(frame, EncodedFrame):
+            frame = frame.raw
+        with self._lock:
+            if self._closed:
+                return
+            if self._writer is None:
+                self._open(frame)
+            if (frame.shape[1], frame.shape[0]) != self.size:
+                frame = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+            if self._color and frame.ndim == 2:
+                frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+            elif not self._color and frame.ndim == 3:
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            self._writer.write(frame)
+            self._timestamps.write(f"{self.frames},{ts:.6f}\n")
+            self.frames += 1
+            if self.frames % self.flush_frames == 0:
+                self._timestamps.flush()
+
+    def close(self) -> None:
+        """结束视频文件并关闭时间戳文件"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._writer is not None:
+                self._writer.release()
+                self._writer = None
+                self._timestamps.close()
+                self._timestamps = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        :return: 路径、已写入帧数和帧尺寸
+        """
+        return {"path": self.path, "frames": self.frames, "size": self.size}
@@ -4,6 +4,20 @@ from .HandVisualizer import HandVisualizer
 from .TeleopMiddleware import TeleopMiddleware
 from .DataCollect import DataCollect
 from .Interpolation import Interpolation
+from .EventDispatcher import EventDispatcher
+from .EventBus import EventBus, Subscription, EventInfo, event_info, event_time
+from .AsyncLoop import BackgroundLoop, get_background_loop
+from .RateScheduler import RateScheduler
+from .EventTrace import EventTrace, get_event_trace
+from .SharedFrameRing import SharedFrameRing
+from .FrameEncoder import FrameEncoder, EncodedFrame
+from .FramePool import FramePool
+from .CsvStateWriter import CsvStateWriter
+from .NpyStateWriter import NpyStateWriter
+from .VideoRecorder import VideoRecorder
+from .ImageWriterPool import ImageWriterPool
+from .ThreadPlacement import ThreadPlacement, get_thread_placement
+from .Transport import BaseTransport, WebRTCTransport, SharedMemoryTransport, FileTransport
 from .WebRTC import *
 from .StreamTracker import *
 __all__ = [
@@ -12,4 +26,29 @@ __all__ = [
     'TeleopMiddleware',
     'DataCollect',
     'Interpolation',
+    'EventDispatcher',
+    'EventBus',
+    'Subscription',
+    'EventInfo',
+    'event_info',
+    'event_time',
+    'BackgroundLoop',
+    'get_background_loop',
+    'RateScheduler',
+    'EventTrace',
+    'get_event_trace',
+    'SharedFrameRing',
+    'FrameEncoder',
+    'EncodedFrame',
+    'FramePool',
+    'CsvStateWriter',
+    'NpyStateWriter',
+    'VideoRecorder',
+    'ImageWriterPool',
+    'ThreadPlacement',
+    'get_thread_placement',
+    'BaseTransport',
+    'WebRTCTransport',
+    'SharedMemoryTransport',
+    'FileTransport',
 ]
\ No newline at end of file
@@ -0,0 +1,227 @@
+import asyncio
+import concurrent.futures
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from .BaseDevice import BaseDevice
+from ..Components.AsyncLoop import BackgroundLoop
+from ..Components.ThreadPlacement import get_thread_placement
+
+
+_device_loop: Optional[BackgroundLoop] = None
+_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_shared_lock = threading.Lock()
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def get_device_loop() -> BackgroundLoop:
+    """
+    获取所有AsyncBaseDevice共享的设备事件循环（单个后台线程）
+    与执行协程回调的事件循环分开，避免订阅者的协程拖慢设备迭代
+    :return: BackgroundLoop
+    """
+    global _device_loop
+    if _device_loop is None:
+        with _shared_lock:
+            if _device_loop is None:
+                _device_loop = BackgroundLoop("EasyTeleop-devices")
+    return _device_loop
+
+
+def get_blocking_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """
+    获取执行阻塞SDK调用的共享线程池，线程数由AsyncBaseDevice.executor_workers决定
+    :return: ThreadPoolExecutor
+    """
+    global _executor
+    if _executor is None:
+        with _shared_lock:
+            if _executor is None:
+                _executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=AsyncBaseDevice.executor_workers,
+                    thread_name_prefix="EasyTeleop-blocking",
+                    initializer=get_thread_placement().apply,
+                )
+    return _executor
+
+
+class AsyncBaseDevice(BaseDevice):
+    """
+    基于asyncio的设备基类，所有异步设备的迭代都作为协程调度在同一个设备事件循环上，不再每个设备占用一个线程
+    - _main / _connect_device / _disconnect_device 可以写成协程；写成普通函数时视为阻塞调用，放到共享线程池执行
+    - 协程中的阻塞SDK调用使用 await self.run_blocking(func, *args) 放到共享线程池执行
+    - 频率控制、超时策略、重连退避、背压和运行指标与BaseDevice相同
+    - 协程中不要调用time.sleep等阻塞函数，否则会拖慢同一循环上的所有设备
+    """
+    # 共享线程池的线程数量（第一次使用时创建，之后修改不生效）
+    executor_workers: int = 4
+
+    def __init__(self, config: Dict[str, Any] = None):
+        super().__init__(config)
+        # 主循环协程对应的concurrent.futures.Future
+        self._main_future: Optional[concurrent.futures.Future] = None
+        # 当前睡眠对应的future，stop时在设备事件循环中唤醒
+        self._sleep_waiter: Optional[asyncio.Future] = None
+        # 正在进行的连接尝试，超时后保留，下次重试时继续等待它，不会并发调用_connect_device
+        self._connect_task: Optional[asyncio.Task] = None
+        self._connect_timed_out = False
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return get_device_loop().loop
+
+    async def run_blocking(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        在共享线程池中执行阻塞调用，不阻塞设备事件循环
+        :param func: 阻塞函数，例如SDK接口
+        :return: 函数返回值
+        """
+        if kwargs:
+            func = functools.partial(func, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(get_blocking_executor(), func, *args)
+
+    async def _call(self, func: Callable) -> Any:
+        """协程直接await，普通函数视为阻塞调用放到线程池执行"""
+        if asyncio.iscoroutinefunction(func):
+            return await func()
+        return await self.run_blocking(func)
+
+    async def _sleep(self, delay: float) -> None:
+        """可被stop立即打断的睡眠，直接使用call_later唤醒，比wait_for少创建一个Task"""
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._sleep_waiter = waiter
+        handle = loop.call_later(delay, _wake, waiter)
+        try:
+            await waiter
+        finally:
+            handle.cancel()
+            self._sleep_waiter = None
+
+    def _wake(self) -> None:
+        """在设备事件循环中唤醒正在睡眠的主循环"""
+        waiter = self._sleep_waiter
+        if waiter is not None:
+            _wake(waiter)
+
+    async def _timed_connect(self) -> Any:
+        """执行一次_connect_device并记录耗时"""
+        start = time.monotonic_ns()
+        try:
+            return await self._call(self._connect_device)
+        finally:
+            elapsed = time.monotonic_ns() - start
+            self._last_connect_time_ns = elapsed
+            self._connect_time_ns += elapsed
+
+    async def _async_connect_step(self) -> bool:
+        """
+        状态2下的一次连接尝试，超过connect_timeout按失败处理
+        阻塞的_connect_device在线程池中无法被取消，超时后保留这次尝试，下次重试直接等待它的结果，
+        避免同一设备的多次连接同时占用共享线程池
+        :return: 是否连接成功
+        """
+        task = self._connect_task
+        if task is None:
+            self._connect_attempts += 1
+            self._connect_timed_out = False
+            task = self._connect_task = asyncio.ensure_future(self._timed_connect())
+        try:
+            connected = await asyncio.wait_for(asyncio.shield(task), self.connect_timeout)
+        except asyncio.TimeoutError:
+            if not self._connect_timed_out:
+                self._connect_timed_out = True
+                self._connect_failures += 1
+            self.emit("error", f"设备{self.__class__.__name__}连接超时({self.connect_timeout}s)")
+            return False
+        except Exception as e:
+            self._connect_task = None
+            self._connect_failures += 0 if self._connect_timed_out else 1
+            self.emit("error", f"设备{self.__class__.__name__}重连失败: {str(e)}")
+            return False
+        self._connect_task = None
+        if not connected:
+            self._connect_failures += 0 if self._connect_timed_out else 1
+            return False
+        self._on_connected()
+        return True
+
+    async def _async_main_loop(self) -> None:
+        """
+        异步设备主循环，与BaseDevice._main_loop的状态机相同
+        """
+        scheduler = self.scheduler
+        stop_event = self._stop_event
+        while self._conn_status != 0 and not stop_event.is_set():
+            if self.get_conn_status() == 1:
+                scheduler.tick()
+                if self.backpressure_high and self._check_backpressure():
+                    await self._sleep(scheduler.next_delay())
+                    continue
+                try:
+                    await self._call(self._main)
+                except Exception as e:
+                    self.set_conn_status(2)
+                    self.emit("error", f"设备{self.__class__.__name__}运行失败: {str(e)}")
+                    continue
+                await self._sleep(scheduler.next_delay())
+            elif self.get_conn_status() == 2:
+                if await self._async_connect_step():
+                    self.set_conn_status(1)
+                    continue
+                await self._sleep(self._next_backoff())
+
+    def start(self) -> bool:
+        """
+        启动设备，把主循环协程调度到设备事件循环上
+        :return: False已经启动，True启动成功
+        """
+        if self._conn_status != 0:
+            return False
+        self._reset_run_state()
+        self.set_conn_status(2)
+        self._main_future = asyncio.run_coroutine_threadsafe(self._async_main_loop(), self.loop)
+        return True
+
+    def stop(self) -> bool:
+        """
+        停止设备，唤醒主循环协程并在设备事件循环上执行断开连接
+        :return: 是否停止成功
+        """
+        self.set_conn_status(0)
+        self._stop_event.set()
+        loop = self.loop
+        loop.call_soon_threadsafe(self._wake)
+        try:
+            self._interrupt()
+        except Exception as e:
+            print(f"设备{self.__class__.__name__}中断阻塞调用失败: {e}")
+
+        in_loop = threading.current_thread() is get_device_loop()._thread
+        try:
+            if self._main_future is not None and not in_loop:
+                try:
+                    self._main_future.result(timeout=self.stop_timeout)
+                except concurrent.futures.TimeoutError:
+                    self._main_future.cancel()
+                    print(f"设备{self.__class__.__name__}主循环未能在{self.stop_timeout}s内退出")
+                except Exception as e:
+                    self.emit("error", f"设备{self.__class__.__name__}主循环异常退出: {str(e)}")
+            disconnect = asyncio.run_coroutine_threadsafe(self._call(self._disconnect_device), loop)
+            if in_loop:
+                # 在设备事件循环中调用stop时不能同步等待，断开连接在循环中异步完成
+                return True
+            return bool(disconnect.result(timeout=self.stop_timeout))
+        except Exception as e:
+            self.emit("error", f"设备停止失败: {str(e)}")
+            return False
+        finally:
+            self.event_bus.shutdown()
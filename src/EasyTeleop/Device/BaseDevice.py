@@ -2,8 +2,54 @@ import numpy as np
 from typing import Dict, Any, Tuple, Callable
 from abc import ABC, abstractmethod
 import asyncio
+import random
 import threading
 import time
+from ..Components.EventBus import EventBus
+from ..Components.RateScheduler import RateScheduler
+from ..Components.ThreadPlacement import get_thread_placement
+
+# 区分同类设备实例的配置字段，按顺序取第一个存在的
+_LABEL_KEYS = ("name", "serial", "ip")
+
+
+def device_label(class_name: str, config: Dict[str, Any], instance: Any) -> str:
+    """
+    设备实例的标识，用于线程名: <类名>@<配置中的name/serial/ip[:port]>，配置中都没有时使用id(instance)
+    同一类的多个设备（例如两台机械臂、两个RealSense）的线程可以在性能分析工具中区分
+    :param class_name: 设备类名
+    :param config: 设备配置，可以为None
+    :param instance: 设备对象，配置中没有标识时使用它的id
+    :return: 标识字符串
+    """
+    config = config or {}
+    for key in _LABEL_KEYS:
+        value = config.get(key)
+        if value not in (None, ""):
+            port = config.get("port") if key == "ip" else None
+            return f"{class_name}@{value}:{port}" if port not in (None, "") else f"{class_name}@{value}"
+    return f"{class_name}@{id(instance):x}"
+
+
+class _ConnectAttempt:
+    """在独立线程中执行一次_connect_device，SDK调用阻塞时主循环可以超时放弃等待或被stop打断"""
+
+    def __init__(self, connect: Callable[[], bool], name: str):
+        self.done = threading.Event()
+        self.result = False
+        self.error = None
+        # 已经按超时计入失败次数，结束时不再重复计数
+        self.timed_out = False
+        self._connect = connect
+        threading.Thread(target=self._run, name=name, daemon=True).start()
+
+    def _run(self) -> None:
+        try:
+            self.result = bool(self._connect())
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
 
 
 class BaseDevice(ABC):
@@ -12,6 +58,31 @@ class BaseDevice(ABC):
     description: str = "Base device description"
     # 需要的配置字段（由子类定义，格式: {字段名: 类型/描述}）
     need_config: Dict[str, Any] = {}
+    # 事件分发线程数量（0为每个事件一个分发线程，处理慢的回调不会拖慢其他事件）与每个线程的最大排队事件数
+    event_workers: int = 0
+    event_queue_size: int = 64
+    # 主循环目标频率(Hz)，0为不控制频率（_main自行阻塞，例如socket接收）
+    loop_rate: float = 0
+    # 主循环超时策略: "skip"跳过错过的周期, "catch_up"立即补回错过的周期
+    overrun_policy: str = "skip"
+    # 单次_connect_device的超时时间(秒)，超时后按失败处理并退避重试（超时的调用结束前不会发起新的连接）
+    connect_timeout: float = 5.0
+    # 重连(state 2 -> state 1的尝试)初始间隔秒数
+    reconnect_interval: float = 1.0
+    # 重连退避上限(秒)，退避从reconnect_interval开始每次失败翻倍，并加入随机抖动
+    reconnect_max_interval: float = 10.0
+    # stop时等待主循环线程退出的最长时间(秒)
+    stop_timeout: float = 2.0
+    # 背压: 订阅方积压量(EventBus.backlog)超过backpressure_high时进入拥塞，降到backpressure_low以下时恢复
+    # backpressure_high为0表示不检查；backpressure_low为None时取high的一半
+    backpressure_high: int = 0
+    backpressure_low: int = None
+    # 拥塞时的处理策略: "drop"跳过_main不再产生数据, "throttle"降低主循环频率, "event"只触发backpressure事件
+    backpressure_policy: str = "event"
+    # throttle策略下拥塞时的频率倍数
+    backpressure_throttle: float = 0.5
+    # 需要检查积压的事件，空表示检查全部事件
+    backpressure_topics: Tuple[str, ...] = ()
 
     @classmethod
     def get_need_config(cls) -> Dict[str, Any]:
@@ -34,42 +105,75 @@ class BaseDevice(ABC):
         }
     
     def __init__(self, config: Dict[str, Any] = None):
+        # 主循环调度器，需在set_config之前创建，子类可在set_config中调用set_loop_rate
+        self.scheduler = RateScheduler(self.loop_rate, self.overrun_policy)
         # 配置信息
         self.config = None
         # 如果提供了配置，则设置配置
         if config:
             self.set_config(config)
         
-        # 回调函数字典
+        # 默认回调函数字典，事件没有订阅者时执行
         self._events: Dict[str, Callable] = {
             "status_change": self._default_callback,
             "error": self._default_error_callback,
+            # 背压状态变化: {"congested": bool, "topic": 事件名, "backlog": 积压量}
+            "backpressure": self._default_callback,
         }
         # 连接状态: 0=未连接(灰色), 1=已连接(绿色), 2=断开连接,需要实现重连机制(红色)
         self._conn_status: int = 0
-        # 重连(state 2 -> state 1的尝试)间隔秒数
-        self.reconnect_interval = 1
         # 设备主循环线程
         self._main_loop_thread = None
+        # 停止信号，stop时唤醒主循环中所有等待（帧率等待、重连退避、连接超时）
+        self._stop_event = threading.Event()
+        # 正在进行的连接尝试，以及连续失败次数（用于计算退避时间）
+        self._connect_attempt = None
+        self._connect_backoff = 0
+        # 连接统计: 尝试/失败次数、重连成功次数、_connect_device累计耗时
+        self._connect_attempts = 0
+        self._connect_failures = 0
+        self._reconnects = 0
+        self._connect_time_ns = 0
+        self._last_connect_time_ns = 0
+        self._connected_once = False
+        # 背压状态与统计
+        self._congested = False
+        self._backpressure_entered = 0
+        self._backpressure_skipped = 0
+        self._max_backlog = 0
+        # 事件总线，支持多订阅者，默认在固定的分发线程中按顺序执行回调
+        self.event_bus = EventBus(
+            name=self.thread_name("events"),
+            defaults=self._events,
+            noop=self._default_callback,
+            num_workers=self.event_workers,
+            queue_size=self.event_queue_size,
+            on_error=self._on_dispatch_error,
+        )
 
-    def on(self, event_name: str, callback: Callable = None) -> Callable:
+    def thread_name(self, role: str) -> str:
+        """
+        设备线程名: <类名>@<实例标识>-<用途>，见device_label
+        :param role: 线程用途，例如main / events / connect / control
+        :return: 线程名
+        """
+        return f"{device_label(self.__class__.__name__, self.config, self)}-{role}"
+
+    def on(self, event_name: str, callback: Callable = None, mailbox: bool = False, inline: bool = False,
+           backlog: Callable[[], int] = None) -> Callable:
         """
         注册事件回调函数 - 可作为装饰器或普通方法使用
+        同一事件可以注册多个回调，事件触发时按注册顺序执行；需要订阅句柄时使用event_bus.subscribe
         :param event_name: 事件名称
         :param callback: 回调函数（可选，当作为装饰器使用时不需要）
+        :param mailbox: 只接收最新值，回调处理不过来时跳过旧事件（适合显示、推流等只关心最新帧的消费者）
+        :param inline: 在触发事件的线程中直接执行，省去线程切换，只适合非阻塞且很快的回调（例如队列append）
+        :param backlog: 积压探针，返回回调方尚未处理的数据量（例如queue.qsize），设备据此做背压
         :return: 装饰器函数或注册结果
         """
         # 装饰器工厂模式
         def decorator(func):
-            if not callable(func):
-                raise ValueError("回调函数必须是可调用对象")
-                
-            # 如果事件存在则更新回调
-            if event_name in self._events:
-                self._events[event_name] = func
-            else:
-                # 如果事件不存在，添加新的事件处理器
-                self._events[event_name] = func
+            self.event_bus.subscribe(event_name, func, mailbox=mailbox, inline=inline, backlog=backlog)
             return func
         
         # 如果提供了callback参数，则按照原来的方式工作
@@ -79,50 +183,49 @@ class BaseDevice(ABC):
         # 否则返回装饰器
         return decorator
 
-    def off(self, event_name: str) -> bool:
+    def off(self, event_name: str, callback: Callable = None) -> bool:
         """
         移除事件回调函数，恢复默认回调
         :param event_name: 事件名称
+        :param callback: 要移除的回调函数（可选，不传则移除该事件的全部回调）
         """
-        if event_name in self._events:
-            self._events[event_name] = self._default_callback
-            return True
-        
-        return False
+        if callback is not None:
+            return self.event_bus.remove(event_name, callback)
+        removed = self.event_bus.clear(event_name)
+        return removed or event_name in self._events
+
+    def has_subscribers(self, event_name: str) -> bool:
+        """
+        事件是否有回调（只有默认空回调时为False），主循环中可以据此跳过没有人需要的取数和转换
+        :param event_name: 事件名称
+        """
+        return self.event_bus.has_subscribers(event_name)
 
     def emit(self, event_name: str, *args, **kwargs) -> None:
         """
-        触发事件，执行注册的回调函数
-        事件处理应是非阻塞的，对于耗时操作应该在独立线程中执行
+        触发事件，按事件的投递策略执行所有注册的回调函数
         :param event_name: 事件名称
         :param args: 位置参数
         :param kwargs: 关键字参数
         """
-        if event_name in self._events:
-            try:
-                # self._events[event_name](*args, **kwargs)
-                # 异步执行回调函数以避免阻塞事件循环
-                callback = self._events[event_name]
-                if asyncio.iscoroutinefunction(callback):
-                    # 如果是异步函数，在新事件循环中运行
-                    thread = threading.Thread(target=self._run_async_callback, args=(callback, args, kwargs), daemon=True)
-                    thread.start()
-                else:
-                    # 同步函数在新线程中运行以避免阻塞
-                    thread = threading.Thread(target=callback, args=args, kwargs=kwargs, daemon=True)
-                    thread.start()
-            except Exception as e:
-                self.emit("error", f"事件{event_name}执行失败: {str(e)}")
-
-    def _run_async_callback(self, callback, args, kwargs):
-        """运行异步回调函数"""
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(callback(*args, **kwargs))
-            loop.close()
-        except Exception as e:
-            self.emit("error", f"异步事件回调执行失败: {str(e)}")
+        self.event_bus.publish(event_name, *args, **kwargs)
+
+    def emit_batch(self, events: Dict[str, Any], ts: float = None, mono_ns: int = None) -> None:
+        """
+        一次触发多个事件，作为同一时刻的快照投递，例如同一次读取得到的位姿、关节和夹爪状态
+        所有事件共享同一个时间戳（回调中通过EventBus.event_time()获取），pooled回调合并为一次分发
+        :param events: {事件名称: 事件参数}，每个事件的回调以该参数作为唯一的位置参数
+        :param ts: 共享时间戳(time.time())，不传则使用当前时间
+        :param mono_ns: 取数时刻的time.monotonic_ns()（回调中通过EventBus.event_info()获取），不传则使用当前时间
+        """
+        self.event_bus.publish_batch(events, ts, mono_ns)
+
+    def _on_dispatch_error(self, event_name: str, error: Exception) -> None:
+        """分发线程中回调执行失败时，通过error事件上报"""
+        if event_name == "error":
+            print(f"设备{self.__class__.__name__}的error回调执行失败: {error}")
+            return
+        self.emit("error", f"事件{event_name}执行失败: {str(error)}")
 
     def _default_callback(self, *args, **kwargs) -> None:
         """默认回调函数，什么也不做"""
@@ -155,25 +258,206 @@ class BaseDevice(ABC):
         
     
 
+    def set_loop_rate(self, rate: float, overrun_policy: str = None) -> None:
+        """
+        设置主循环频率，_main只需实现单次迭代，由主循环按绝对截止时间调度
+        :param rate: 目标频率(Hz)，0为不控制频率
+        :param overrun_policy: 超时策略，"skip"或"catch_up"，不传则保持不变
+        """
+        self.loop_rate = rate
+        self.scheduler.set_rate(rate)
+        if overrun_policy is not None:
+            self.scheduler.set_overrun_policy(overrun_policy)
+            self.overrun_policy = overrun_policy
+
+    def get_loop_stats(self) -> Dict[str, Any]:
+        """
+        获取主循环调度统计
+        :return: 目标频率、实际频率、唤醒抖动、超时次数等
+        """
+        return self.scheduler.get_stats()
+
+    def set_backpressure(self, high: int, low: int = None, policy: str = None, topics: Tuple[str, ...] = None) -> None:
+        """
+        配置背压阈值和策略
+        :param high: 积压量超过该值时进入拥塞，0为关闭背压检查
+        :param low: 积压量降到该值以下时恢复，不传取high的一半
+        :param policy: "drop" / "throttle" / "event"，不传则保持不变
+        :param topics: 需要检查的事件，不传则保持不变
+        """
+        if policy is not None:
+            if policy not in ("drop", "throttle", "event"):
+                raise ValueError(f"不支持的背压策略: {policy}")
+            self.backpressure_policy = policy
+        if topics is not None:
+            self.backpressure_topics = tuple(topics)
+        self.backpressure_high = high
+        self.backpressure_low = low
+        if self._congested and not high:
+            self._leave_congestion("", 0)
+
+    def _check_backpressure(self) -> bool:
+        """
+        检查订阅方积压量并更新拥塞状态，每次迭代前调用
+        :return: 本次迭代是否应该跳过(_main不执行)
+        """
+        bus = self.event_bus
+        topic, backlog = "", 0
+        for name in self.backpressure_topics or bus.topics():
+            depth = bus.backlog(name)
+            if depth > backlog:
+                topic, backlog = name, depth
+        if backlog > self._max_backlog:
+            self._max_backlog = backlog
+        high = self.backpressure_high
+        low = self.backpressure_low if self.backpressure_low is not None else high // 2
+        if not self._congested:
+            if backlog <= high:
+                return False
+            self._congested = True
+            self._backpressure_entered += 1
+            if self.backpressure_policy == "throttle" and self.loop_rate > 0:
+                self.scheduler.set_rate(self.loop_rate * self.backpressure_throttle)
+            self.emit("backpressure", {"congested": True, "topic": topic, "backlog": backlog})
+        elif backlog <= low:
+            self._leave_congestion(topic, backlog)
+            return False
+        if self.backpressure_policy == "drop":
+            self._backpressure_skipped += 1
+            return True
+        return False
+
+    def _leave_congestion(self, topic: str, backlog: int) -> None:
+        self._congested = False
+        if self.backpressure_policy == "throttle":
+            self.scheduler.set_rate(self.loop_rate)
+        self.emit("backpressure", {"congested": False, "topic": topic, "backlog": backlog})
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        获取设备运行指标，只读取计数器，不影响主循环
+        :return: 主循环统计、各事件触发次数、连接统计
+        """
+        events = {
+            topic: {"emits": stats["published"], "dropped": stats["dropped"], "coalesced": stats["coalesced"]}
+            for topic, stats in self.event_bus.get_stats().items()
+        }
+        return {
+            "name": self.__class__.__name__,
+            "conn_status": self._conn_status,
+            "loop": self.scheduler.get_stats(),
+            "events": events,
+            "connect": {
+                "attempts": self._connect_attempts,
+                "failures": self._connect_failures,
+                "reconnects": self._reconnects,
+                "total_time_ms": self._connect_time_ns / 1e6,
+                "last_time_ms": self._last_connect_time_ns / 1e6,
+            },
+            "backpressure": {
+                "policy": self.backpressure_policy,
+                "high": self.backpressure_high,
+                "congested": self._congested,
+                "entered": self._backpressure_entered,
+                "skipped": self._backpressure_skipped,
+                "max_backlog": self._max_backlog,
+            },
+        }
+
+    def _try_connect(self) -> bool:
+        """调用_connect_device并记录连接次数和耗时"""
+        self._connect_attempts += 1
+        start = time.monotonic_ns()
+        try:
+            return self._connect_device()
+        finally:
+            elapsed = time.monotonic_ns() - start
+            self._last_connect_time_ns = elapsed
+            self._connect_time_ns += elapsed
+
+    def _connect_step(self) -> bool:
+        """
+        状态2下的一次连接尝试，等待连接完成、超时或stop
+        :return: 是否连接成功
+        """
+        attempt = self._connect_attempt
+        if attempt is None:
+            attempt = _ConnectAttempt(self._try_connect, name=self.thread_name("connect"))
+            self._connect_attempt = attempt
+        deadline = time.monotonic() + self.connect_timeout
+        # SDK调用无法被打断，分片等待以便及时响应stop
+        while not attempt.done.wait(min(0.05, max(0.0, deadline - time.monotonic()))):
+            if self._stop_event.is_set():
+                return False
+            if time.monotonic() >= deadline:
+                # 连接超时，保留这次尝试，下次直接等待它的结果，避免并发调用SDK
+                if not attempt.timed_out:
+                    attempt.timed_out = True
+                    self._connect_failures += 1
+                self.emit("error", f"设备{self.__class__.__name__}连接超时({self.connect_timeout}s)")
+                return False
+        self._connect_attempt = None
+        if attempt.error is not None:
+            self._connect_failures += 0 if attempt.timed_out else 1
+            self.emit("error", f"设备{self.__class__.__name__}重连失败: {str(attempt.error)}")
+            return False
+        if not attempt.result:
+            self._connect_failures += 0 if attempt.timed_out else 1
+            return False
+        self._on_connected()
+        return True
+
+    def _on_connected(self) -> None:
+        """连接成功后的统计和调度器重置"""
+        if self._connected_once:
+            self._reconnects += 1
+        self._connected_once = True
+        # 重连后重新计时，不补偿断线期间错过的周期
+        self._connect_backoff = 0
+        self.scheduler.resync()
+
+    def _next_backoff(self) -> float:
+        """
+        计算下一次重连前的等待时间: 从reconnect_interval开始按失败次数指数增长，不超过reconnect_max_interval
+        取[1/2, 1]倍的随机值，避免多台设备同时断线后同步重连
+        """
+        delay = min(self.reconnect_max_interval, self.reconnect_interval * (2 ** min(self._connect_backoff, 16)))
+        self._connect_backoff += 1
+        return delay * random.uniform(0.5, 1.0)
+
+    def _interrupt(self) -> None:
+        """
+        stop时调用，用于打断_main中的阻塞调用（例如socket接收），默认什么也不做
+        子类可以重写，例如关闭socket使recv立即返回
+        """
+        pass
+
     def _main_loop(self):
         """
         设备主循环,不需要重写,依据_conn_status自动处理连接和运行_main逻辑
+        设置了loop_rate时按固定频率调用_main
         """
-        while self._conn_status != 0:  # 只要不是未连接状态就继续运行
+        scheduler = self.scheduler
+        stop_event = self._stop_event
+        while self._conn_status != 0 and not stop_event.is_set():  # 只要不是未连接状态就继续运行
             if self.get_conn_status() == 1:
+                scheduler.tick()
+                if self.backpressure_high and self._check_backpressure():
+                    # 订阅方处理不过来，在源头丢弃本次迭代
+                    scheduler.wait(stop_event)
+                    continue
                 try:
                     self._main()
                 except Exception as e:
                     self.set_conn_status(2)
                     self.emit("error", f"设备{self.__class__.__name__}运行失败: {str(e)}")
+                    continue
+                scheduler.wait(stop_event)
             elif self.get_conn_status() == 2:
-                try:
-                    if self._connect_device():
-                        self.set_conn_status(1) 
-                        continue
-                except Exception as e:
-                    self.emit("error", f"设备{self.__class__.__name__}重连失败: {str(e)}")
-                time.sleep(self.reconnect_interval)
+                if self._connect_step():
+                    self.set_conn_status(1)
+                    continue
+                stop_event.wait(self._next_backoff())
 
 
 
@@ -185,23 +469,42 @@ class BaseDevice(ABC):
         if self._conn_status != 0:
             return False  # 设备已经在运行中
         
+        self._reset_run_state()
         self.set_conn_status(2)#设置为2会首先尝试连接，复用重连逻辑
-        self._main_loop_thread = threading.Thread(target=self._main_loop, daemon=True)
+        self._main_loop_thread = threading.Thread(target=get_thread_placement().wrap(self._main_loop), name=self.thread_name("main"), daemon=True)
         self._main_loop_thread.start()
         return True
     
 
+    def _reset_run_state(self) -> None:
+        """每次start前重置连接、退避和背压状态"""
+        self._connected_once = False
+        self._connect_backoff = 0
+        self._stop_event.clear()
+        if self._congested:
+            # 上次停止时仍处于拥塞状态，恢复原始频率
+            self._congested = False
+            self.scheduler.set_rate(self.loop_rate)
+
     def stop(self) -> bool:
         """
         停止设备
         :return: 是否停止成功
         """
-        # 设置状态为未连接，这会停止主循环和重连循环
+        # 设置状态为未连接，并唤醒主循环中的等待，这会停止主循环和重连循环
         self.set_conn_status(0)
+        self._stop_event.set()
+        try:
+            self._interrupt()
+        except Exception as e:
+            print(f"设备{self.__class__.__name__}中断阻塞调用失败: {e}")
         
         # 等待线程结束
-        if self._main_loop_thread and self._main_loop_thread.is_alive():
-            self._main_loop_thread.join(timeout=2.0)  # 等待最多2秒
+        if self._main_loop_thread and self._main_loop_thread.is_alive() \
+                and self._main_loop_thread is not threading.current_thread():
+            self._main_loop_thread.join(timeout=self.stop_timeout)
+            if self._main_loop_thread.is_alive():
+                print(f"设备{self.__class__.__name__}主循环未能在{self.stop_timeout}s内退出")
         
         try:
             disconnected = self._disconnect_device()
@@ -209,11 +512,14 @@ class BaseDevice(ABC):
         except Exception as e:
             self.emit("error", f"设备停止失败: {str(e)}")
             return False
+        finally:
+            # 执行完已排队的事件后回收分发线程
+            self.event_bus.shutdown()
     @abstractmethod
     def _main(self):
         """
-        设备主逻辑，在独立线程中运行
-        子类应实现具体的设备逻辑
+        设备主逻辑的单次迭代，由主循环在独立线程中反复调用
+        子类应实现具体的设备逻辑，频率控制通过loop_rate/set_loop_rate交给主循环
         """
         pass
     @abstractmethod
@@ -0,0 +1,17 @@
+from ..AsyncBaseDevice import AsyncBaseDevice
+from .TestCamera import TestCamera
+
+
+class AsyncTestCamera(AsyncBaseDevice, TestCamera):
+    """TestCamera的异步版本，运行在共享的设备事件循环上，用于和线程版本对比"""
+    description = "测试摄像头(异步)"
+    name = "会以设定帧率生成1080p的黑白脉冲图像，运行在asyncio设备事件循环上"
+
+    async def _main(self):
+        try:
+            # 生成整幅图像会持有GIL较长时间，放到线程池执行，避免拖慢同一循环上的其他设备
+            frame = await self.run_blocking(self.get_frames)
+            self.publish_shared(frame)
+            self.emit("frame", frame)
+        except Exception as e:
+            self.emit("error", str(e))
@@ -1,18 +1,118 @@
 import numpy as np
 import logging
-from typing import Dict, Any, Tuple
+import time
+from typing import Dict, Any, Tuple, Optional
 from ..BaseDevice import BaseDevice
+from ...Components.SharedFrameRing import SharedFrameRing
+from ...Components.FrameEncoder import FrameEncoder, EncodedFrame
+from ...Components.EventBus import event_info
 from abc import abstractmethod
 
 
 # # 定义摄像头接口，方便获取图片帧和信息
 class BaseCamera(BaseDevice):
     """摄像头接口抽象类"""
+    # 订阅方（例如数据采集写图片）积压超过约3秒的帧时，在源头丢帧
+    backpressure_high = 90
+    backpressure_policy = "drop"
+
     def __init__(self,config: str):
         super().__init__(config)
         self._events.update({
             "frame": self._default_callback,# rgb图像
+            "encoded_frame": self._default_callback,# EncodedFrame，启用enable_encoding后触发
         })
+        # 每帧只编码一次的编码阶段，enable_encoding后创建
+        self.encoder: Optional[FrameEncoder] = None
+        # 跨进程共享的帧缓冲区，enable_shared_frames后在第一帧到来时按帧形状创建
+        self.shared_frames: Optional[SharedFrameRing] = None
+        self._shared_name: Optional[str] = None
+        self._shared_slots = 4
+
+    def enable_shared_frames(self, name: str = None, slots: int = 4) -> str:
+        """
+        把彩色帧同时写入共享内存环形缓冲区，其他进程用SharedFrameRing(name)附加后零拷贝读取
+        :param name: 共享内存名称，不传则自动生成
+        :param slots: 槽位数量
+        :return: 共享内存名称
+        """
+        if self.shared_frames is not None:
+            return self.shared_frames.name
+        self._shared_name = name or f"easyteleop_{self.__class__.__name__.lower()}_{id(self):x}"
+        self._shared_slots = slots
+        return self._shared_name
+
+    def disable_shared_frames(self) -> None:
+        """停止写入共享帧缓冲区并删除共享内存"""
+        ring = self.shared_frames
+        self.shared_frames = None
+        self._shared_name = None
+        if ring is not None:
+            ring.close()
+
+    def stop(self) -> bool:
+        """停止摄像头，并删除本次运行创建的共享帧缓冲区；共享帧仍然启用，再次start后在第一帧到来时重新创建"""
+        try:
+            return super().stop()
+        finally:
+            ring = self.shared_frames
+            self.shared_frames = None
+            if ring is not None:
+                ring.close()
+
+    def publish_shared(self, frame: np.ndarray, ts: float = None, mono_ns: int = None) -> int:
+        """
+        在_main中取到帧后调用，未启用共享帧缓冲区时什么也不做
+        :param frame: 彩色帧
+        :param ts: 时间戳，不传则取当前时间
+        :param mono_ns: 源头单调时间戳(ns)，与emit_batch传入的相同，不传则取当前时间
+        :return: 帧序号，未写入时返回0
+        """
+        if self._shared_name is None or frame is None:
+            return 0
+        ring = self.shared_frames
+        if ring is None:
+            ring = self.shared_frames = SharedFrameRing(self._shared_name, frame.shape, frame.dtype, self._shared_slots)
+        return ring.write(frame, ts, mono_ns)
+
+    def enable_encoding(self, codec: str = "jpeg", quality: int = None) -> FrameEncoder:
+        """
+        启用编码阶段：每个彩色帧在事件分发线程中编码一次，通过encoded_frame事件把编码结果和原始数组交给所有订阅者
+        数据采集直接写入编码后的字节，推流使用原始数组，不再各自重复编码或转换
+        :param codec: 编码格式，jpeg / png / webp
+        :param quality: 质量参数，不传则使用编码格式的默认值
+        :return: FrameEncoder
+        """
+        if self.encoder is not None:
+            return self.encoder
+        self.encoder = FrameEncoder(codec, quality)
+        # 不使用inline，编码不占用取帧线程
+        self.on("frame", self._encode_frame)
+        return self.encoder
+
+    def disable_encoding(self) -> None:
+        """停止编码阶段"""
+        if self.encoder is not None:
+            self.off("frame", self._encode_frame)
+            self.encoder = None
+
+    def _encode_frame(self, frame: np.ndarray) -> None:
+        encoder = self.encoder
+        if encoder is None or frame is None:
+            return
+        # 沿用帧在源头的时间戳，编码耗时不计入
+        info = event_info()
+        encoded = encoder.encode(frame, info.ts if info is not None and info.ts is not None else time.time())
+        if encoded is None:
+            self.emit("error", f"帧编码失败({encoder.codec})")
+            return
+        self.emit_batch({"encoded_frame": encoded}, encoded.ts, info.mono_ns if info is not None else None)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = super().get_metrics()
+        if self.encoder is not None:
+            metrics["encoder"] = self.encoder.get_stats()
+        return metrics
 
     @abstractmethod
     def get_frames(self) -> np.ndarray:
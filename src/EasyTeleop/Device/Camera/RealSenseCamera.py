@@ -6,6 +6,7 @@ import threading
 import time
 # from pyorbbecsdk import *
 from .BaseCamera import BaseCamera
+from ...Components.FramePool import FramePool
 
 
 class RealSenseCamera(BaseCamera):
@@ -54,22 +55,32 @@ class RealSenseCamera(BaseCamera):
         self._events.update({
              "depth_frame": self._default_callback
         })
+        # 彩色和深度帧的缓冲区池，取帧后立即拷贝出来，librealsense的帧随即归还
+        self.color_pool = FramePool(self.frame_pool_buffers)
+        self.depth_pool = FramePool(self.frame_pool_buffers)
             
+    # 帧率由相机硬件决定，偶尔取帧稍晚时立即补上，避免跳过周期导致丢帧
+    overrun_policy = "catch_up"
+    # 每个缓冲区池最多保留的帧数，略大于背压阈值backpressure_high，采集积压时也不需要临时分配
+    frame_pool_buffers = 96
+
     def _main(self):
         try:
-            last_time = time.time()
-            
-            color_frame, depth_frame = self.get_frames()
-            self.emit("frame", color_frame)
-            self.emit("depth_frame", depth_frame)
-
-            # 只有当target_fps > 0时才进行帧率控制
-            if self.target_fps > 0:
-                # 帧率控制，而不是固定间隔
-                current_time = time.time()
-                elapsed = current_time - last_time
-                if elapsed < self.min_interval:
-                    time.sleep(self.min_interval - elapsed)
+            # 没有订阅者的流不取出、不拷贝，仍然等待frameset以保持帧率并及时归还librealsense的帧
+            with_color = self._shared_name is not None or self.has_subscribers("frame")
+            with_depth = self.has_subscribers("depth_frame")
+            color_frame, depth_frame = self.get_frames(with_color, with_depth)
+            ts, mono_ns = time.time(), time.monotonic_ns()
+            # 启用共享帧缓冲区时，其他进程从共享内存读取彩色帧
+            self.publish_shared(color_frame, ts, mono_ns)
+            # 彩色和深度帧来自同一个frameset，作为同一时刻的快照一起投递
+            events = {}
+            if with_color:
+                events["frame"] = color_frame
+            if with_depth:
+                events["depth_frame"] = depth_frame
+            if events:
+                self.emit_batch(events, ts, mono_ns)
         except Exception as e:
             print(f"Error get camera frames: {str(e)}")
             self.set_conn_status(2)
@@ -117,21 +128,34 @@ class RealSenseCamera(BaseCamera):
         self.config = config
         self.camera_serial = config["serial"]
         self.target_fps = config["target_fps"]
-        self.min_interval = 1.0 / self.target_fps if self.target_fps > 0 else 0
+        # 只有当target_fps > 0时才进行帧率控制
+        self.set_loop_rate(self.target_fps)
         
         return True
                 
 
-    def get_frames(self) -> Tuple[np.ndarray, np.ndarray]:
-        """获取RealSense摄像头帧(RGB, Depth)"""
+    def get_frames(self, with_color: bool = True, with_depth: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        获取RealSense摄像头帧(RGB, Depth)
+        :param with_color: 是否取出彩色帧，False时返回None
+        :param with_depth: 是否取出深度帧，False时返回None
+        """
         if self.get_conn_status() == 2:
             print("not connected")
             return None, None
         
         frames = self.pipeline.wait_for_frames()
-        color_frame = frames.get_color_frame()
-        depth_frame = frames.get_depth_frame()
-        if not color_frame or not depth_frame:
+        color_frame = frames.get_color_frame() if with_color else None
+        depth_frame = frames.get_depth_frame() if with_depth else None
+        if (with_color and not color_frame) or (with_depth and not depth_frame):
             print(f"Failed to get frames from RealSense")
             return None, None
-        return np.asanyarray(color_frame.get_data()), np.asanyarray(depth_frame.get_data())
+        # 拷贝到池中的缓冲区，下游队列持有的是池缓冲区而不是librealsense的帧内存
+        color = self.color_pool.copy(np.asanyarray(color_frame.get_data())) if with_color else None
+        depth = self.depth_pool.copy(np.asanyarray(depth_frame.get_data())) if with_depth else None
+        return color, depth
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = super().get_metrics()
+        metrics["frame_pool"] = {"color": self.color_pool.get_stats(), "depth": self.depth_pool.get_stats()}
+        return metrics
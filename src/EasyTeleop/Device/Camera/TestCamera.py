@@ -22,7 +22,8 @@ class TestCamera(BaseCamera):
         super().set_config(config)
         if "fps" in config:
             self.fps = config["fps"]
-            self.min_interval = 1.0 / self.fps if self.fps > 0 else 0
+            # 只有当fps > 0时才进行帧率控制
+            self.set_loop_rate(self.fps)
         return True
 
     def _connect_device(self) -> bool:
@@ -35,20 +36,12 @@ class TestCamera(BaseCamera):
 
     def _main(self):
         try:
-            last_time = time.time()
             # 生成1080p黑白脉冲图片
             frame = self.get_frames()
+            self.publish_shared(frame)
             
             # 触发frame事件
             self.emit("frame", frame)
-            
-            # 只有当target_fps > 0时才进行帧率控制
-            if self.fps > 0:
-                # 帧率控制，而不是固定间隔
-                current_time = time.time()
-                elapsed = current_time - last_time
-                if elapsed < self.min_interval:
-                    time.sleep(self.min_interval - elapsed)
         except Exception as e:
             self.emit("error", str(e))
     def get_frames(self) -> np.ndarray:
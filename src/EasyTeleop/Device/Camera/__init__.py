@@ -1,9 +1,11 @@
 from .BaseCamera import BaseCamera
 from .RealSenseCamera import RealSenseCamera
 from .TestCamera import TestCamera
+from .AsyncTestCamera import AsyncTestCamera
 
 __all__ = [
     'BaseCamera',
     'RealSenseCamera',
-    'TestCamera'
+    'TestCamera',
+    'AsyncTestCamera'
 ]
\ No newline at end of file
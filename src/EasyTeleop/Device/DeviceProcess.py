@@ -0,0 +1,328 @@
+import importlib
+import multiprocessing
+import pickle
+import threading
+import traceback
+from typing import Any, Callable, Dict, Optional, Type, Union
+from ..Components.EventBus import EventBus, event_info
+from ..Components.ThreadPlacement import get_thread_placement
+from .BaseDevice import device_label
+
+# 命令消息: (调用ID, 方法名, 位置参数)，调用ID为0表示不需要回复
+# 回复消息: (调用ID, 是否成功, 返回值或错误信息)
+# 事件消息: (事件名称, 共享时间戳或None, 源头单调时间戳, 位置参数, 关键字参数或None)
+_FORWARD = "__forward__"
+_EXIT = "__exit__"
+# 子进程总是转发的事件
+_ALWAYS_FORWARD = ("status_change", "error", "backpressure")
+_PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+def _resolve_class(device_class: Union[str, Type]) -> Type:
+    """类对象直接返回；字符串形式为"模块路径.类名"或"类别.类型"（例如"Robot.RealManWithIK"）"""
+    if not isinstance(device_class, str):
+        return device_class
+    module_name, _, class_name = device_class.rpartition(".")
+    if module_name.count(".") == 0:
+        module_name = f"EasyTeleop.Device.{module_name}.{class_name}"
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _device_process_main(device_class, config, conn, event_conn, shared_frames: Optional[str]) -> None:
+    """
+    子进程入口：创建设备，转发事件，执行父进程的调用
+    """
+    send_lock = threading.Lock()
+    forwarded = set()
+
+    def forward(topic):
+        def callback(*args, **kwargs):
+            # 单调时钟在同一台机器的进程之间是同一个时钟，源头时间戳可以直接转发
+            info = event_info()
+            data = pickle.dumps((topic, info.ts, info.mono_ns, args, kwargs or None), _PICKLE_PROTOCOL)
+            with send_lock:
+                event_conn.send_bytes(data)
+        callback.__name__ = f"forward_{topic}"
+        return callback
+
+    try:
+        device = _resolve_class(device_class)(config)
+    except Exception as e:
+        conn.send((0, False, f"创建设备失败: {e}\n{traceback.format_exc()}"))
+        return
+    conn.send((0, True, None))
+
+    def add_forward(topic):
+        if topic not in forwarded:
+            forwarded.add(topic)
+            # inline订阅：在设备线程中直接序列化并写入管道，不再经过子进程的分发线程
+            device.on(topic, forward(topic), inline=True)
+
+    for topic in _ALWAYS_FORWARD:
+        add_forward(topic)
+    if shared_frames is not None:
+        device.enable_shared_frames(shared_frames)
+
+    while True:
+        try:
+            call_id, method, args = conn.recv()
+        except (EOFError, OSError):
+            break
+        if method == _EXIT:
+            break
+        try:
+            if method == _FORWARD:
+                result = add_forward(*args)
+            else:
+                result = getattr(device, method)(*args)
+            if call_id:
+                conn.send((call_id, True, result))
+        except Exception as e:
+            if call_id:
+                conn.send((call_id, False, f"{type(e).__name__}: {e}"))
+            else:
+                device.emit("error", f"调用{method}失败: {e}")
+
+    if device.get_conn_status() != 0:
+        device.stop()
+    if shared_frames is not None:
+        device.disable_shared_frames()
+
+
+class DeviceProcess:
+    """
+    在子进程中运行任意BaseDevice子类的代理，设备的主循环、SDK调用和计算（例如IK解算、取帧）不再与本进程争抢GIL
+    - 代理提供start/stop/on/off/get_conn_status/get_metrics以及add_pose_data等控制接口
+    - 子进程中订阅的事件通过管道转发，序列化为紧凑的元组(pickle最高协议)，在本进程的事件总线上重新发布，
+      on的mailbox/inline选项照常生效；事件保留源头的单调时间戳和emit_batch的共享时间戳，回调中event_info()/event_time()仍然可用
+    - 摄像头帧不走管道：shared_frames=True时子进程把帧写入SharedFrameRing，本进程用shared_frames_name附加
+    - add_pose_data等高频控制接口只发送不等待回复；其余调用等待子进程返回结果
+    - 设备类和配置需要可以pickle，spawn方式启动时设备类必须能在子进程中导入
+    """
+    # 调用子进程方法时等待回复的最长时间(秒)
+    call_timeout: float = 5.0
+    # 只发送不等待回复的方法
+    fire_and_forget = ("add_pose_data", "add_end_effector_data", "add_feedback_data", "add_video_frame")
+
+    def __init__(self, device_class: Union[str, Type], config: Dict[str, Any] = None,
+                 shared_frames: bool = False, start_method: str = "spawn"):
+        """
+        :param device_class: 设备类，或"类别.类型"字符串（例如"Robot.RealManWithIK"）
+        :param config: 设备配置
+        :param shared_frames: 摄像头是否通过共享内存帧缓冲区输出帧
+        :param start_method: 子进程启动方式，默认spawn，避免fork时复制本进程的线程和SDK状态
+        """
+        self.device_class = device_class
+        self.config = config
+        cls = _resolve_class(device_class)
+        self.name = getattr(cls, "name", cls.__name__)
+        self._class_name = cls.__name__
+        self.shared_frames_name = f"easyteleop_{self._class_name.lower()}_{id(self):x}" if shared_frames else None
+        self._conn_status = 0
+        self._events: Dict[str, Callable] = {
+            "status_change": self._default_callback,
+            "error": self._default_error_callback,
+            "backpressure": self._default_callback,
+        }
+        self.event_bus = EventBus(
+            name=self.thread_name("proxy-events"),
+            defaults=self._events,
+            noop=self._default_callback,
+            on_error=self._on_dispatch_error,
+        )
+        self._forwarded = set()
+        self._call_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._call_id = 0
+        # 统计: 转发的事件数、事件消息字节数、调用次数
+        self.events_received = 0
+        self.event_bytes = 0
+        self.calls = 0
+
+        ctx = multiprocessing.get_context(start_method)
+        self._conn, child_conn = ctx.Pipe()
+        event_recv, event_send = ctx.Pipe(duplex=False)
+        self._event_conn = event_recv
+        self.process = ctx.Process(
+            target=_device_process_main,
+            args=(device_class, config, child_conn, event_send, self.shared_frames_name),
+            name=f"EasyTeleop-{device_label(self._class_name, self.config, self)}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        event_send.close()
+        try:
+            _, ok, error = self._conn.recv()
+        except EOFError:
+            ok, error = False, f"设备进程{self.process.name}启动失败"
+        if not ok:
+            self.process.join(timeout=1.0)
+            raise RuntimeError(error)
+        self._receiver = threading.Thread(target=get_thread_placement().wrap(self._receive_events), name=self.thread_name("proxy-recv"),
+                                          daemon=True)
+        self._receiver.start()
+
+    def _receive_events(self) -> None:
+        """接收子进程转发的事件，在本进程的事件总线上发布"""
+        while True:
+            try:
+                data = self._event_conn.recv_bytes()
+            except (EOFError, OSError):
+                break
+            self.events_received += 1
+            self.event_bytes += len(data)
+            topic, ts, mono_ns, args, kwargs = pickle.loads(data)
+            if topic == "status_change":
+                self._conn_status = args[0]["new_status"]
+            self.event_bus.forward(topic, args, kwargs, ts, mono_ns)
+
+    def call(self, method: str, *args, timeout: float = None) -> Any:
+        """
+        调用子进程中设备的方法并等待返回值
+        :param method: 方法名
+        :param timeout: 等待回复的最长时间(秒)，默认call_timeout
+        :return: 方法返回值
+        """
+        if not self.process.is_alive():
+            raise RuntimeError(f"设备进程{self.process.name}已退出")
+        timeout = self.call_timeout if timeout is None else timeout
+        with self._call_lock:
+            self._call_id += 1
+            call_id = self._call_id
+            self.calls += 1
+            with self._send_lock:
+                self._conn.send((call_id, method, args))
+            while True:
+                if not self._conn.poll(timeout):
+                    raise TimeoutError(f"调用{self._class_name}.{method}超时({timeout}s)")
+                reply_id, ok, result = self._conn.recv()
+                # 跳过之前超时的调用迟到的回复
+                if reply_id == call_id:
+                    break
+        if not ok:
+            raise RuntimeError(result)
+        return result
+
+    def send(self, method: str, *args) -> None:
+        """
+        调用子进程中设备的方法，不等待返回值（用于高频控制接口）
+        :param method: 方法名
+        """
+        with self._send_lock:
+            self._conn.send((0, method, args))
+
+    def thread_name(self, role: str) -> str:
+        """本进程中代理线程的线程名，与BaseDevice.thread_name格式相同"""
+        return f"{device_label(self._class_name, self.config, self)}-{role}"
+
+    def on(self, event_name: str, callback: Callable = None, mailbox: bool = False, inline: bool = False,
+           backlog: Callable[[], int] = None) -> Callable:
+        """
+        注册事件回调函数，与BaseDevice.on相同；第一次订阅某个事件时通知子进程转发该事件
+        backlog探针只影响本进程的积压统计，子进程中的设备不会据此做背压
+        """
+        def decorator(func):
+            self.event_bus.subscribe(event_name, func, mailbox=mailbox, inline=inline, backlog=backlog)
+            if event_name not in _ALWAYS_FORWARD and event_name not in self._forwarded:
+                self._forwarded.add(event_name)
+                self.call(_FORWARD, event_name)
+            return func
+
+        if callback is not None:
+            return decorator(callback)
+        return decorator
+
+    def off(self, event_name: str, callback: Callable = None) -> bool:
+        """移除事件回调函数（子进程仍然转发该事件，本进程没有订阅者时直接忽略）"""
+        if callback is not None:
+            return self.event_bus.remove(event_name, callback)
+        removed = self.event_bus.clear(event_name)
+        return removed or event_name in self._events
+
+    def has_subscribers(self, event_name: str) -> bool:
+        """本进程中该事件是否有回调"""
+        return self.event_bus.has_subscribers(event_name)
+
+    def start(self) -> bool:
+        return self.call("start")
+
+    def stop(self, timeout: float = None) -> bool:
+        """
+        停止设备并结束子进程
+        :param timeout: 等待子进程退出的最长时间(秒)，超时后强制结束
+        """
+        timeout = self.call_timeout if timeout is None else timeout
+        result = False
+        if self.process.is_alive():
+            try:
+                result = self.call("stop", timeout=timeout)
+            except Exception as e:
+                print(f"设备进程{self.process.name}停止失败: {e}")
+            try:
+                with self._send_lock:
+                    self._conn.send((0, _EXIT, ()))
+            except OSError:
+                pass
+        self.process.join(timeout=timeout)
+        if self.process.is_alive():
+            print(f"设备进程{self.process.name}未能在{timeout}s内退出，强制结束")
+            self.process.terminate()
+            self.process.join(timeout=1.0)
+        self._conn_status = 0
+        self._receiver.join(timeout=1.0)
+        self.event_bus.shutdown()
+        return bool(result)
+
+    def get_conn_status(self) -> int:
+        """连接状态，由子进程转发的status_change事件更新，不需要跨进程调用"""
+        return self._conn_status
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = self.call("get_metrics")
+        metrics["process"] = {
+            "pid": self.process.pid,
+            "alive": self.process.is_alive(),
+            "events_received": self.events_received,
+            "event_bytes": self.event_bytes,
+            "calls": self.calls,
+        }
+        return metrics
+
+    def get_loop_stats(self) -> Dict[str, Any]:
+        return self.call("get_loop_stats")
+
+    def set_loop_rate(self, rate: float, overrun_policy: str = None) -> None:
+        self.call("set_loop_rate", rate, overrun_policy)
+
+    def add_pose_data(self, pose_data) -> None:
+        self.send("add_pose_data", pose_data)
+
+    def add_end_effector_data(self, end_effector_data) -> None:
+        self.send("add_end_effector_data", end_effector_data)
+
+    def start_control(self, *args) -> Any:
+        return self.call("start_control", *args)
+
+    def stop_control(self, *args) -> Any:
+        return self.call("stop_control", *args)
+
+    def __getattr__(self, method: str) -> Callable:
+        # 其余公开方法按名称转发到子进程，fire_and_forget中的方法不等待回复
+        if method.startswith("_"):
+            raise AttributeError(method)
+        if method in self.fire_and_forget:
+            return lambda *args: self.send(method, *args)
+        return lambda *args: self.call(method, *args)
+
+    def _on_dispatch_error(self, event_name: str, error: Exception) -> None:
+        if event_name == "error":
+            print(f"设备进程{self._class_name}的error回调执行失败: {error}")
+            return
+        self.event_bus.publish("error", f"事件{event_name}执行失败: {str(error)}")
+
+    def _default_callback(self, *args, **kwargs) -> None:
+        pass
+
+    def _default_error_callback(self, error_msg: str) -> None:
+        print(f"设备{self._class_name}(子进程)发生错误: {error_msg}")
@@ -1,4 +1,5 @@
 from .BaseHand import BaseHand
+from ...Components.ThreadPlacement import get_thread_placement
 from Robotic_Arm.rm_robot_interface import rm_thread_mode_e,rm_peripheral_read_write_params_t, RoboticArm
 import time
 import threading
@@ -31,6 +32,8 @@ class Revo2OnRealMan(BaseHand):
             "default": 126
         },
     }
+    # 控制在独立线程中进行，主循环只需低频检查连接状态
+    loop_rate = 10
     
     def __init__(self, config):
         self.ip = None
@@ -70,8 +73,7 @@ class Revo2OnRealMan(BaseHand):
         ret = self.arm_controller.rm_write_registers(param, fingers)
         return ret
     def _main(self):
-        
-        time.sleep(0.1)
+        pass
 
     def _connect_device(self) -> bool:
         """连接设备"""
@@ -341,7 +343,8 @@ class Revo2OnRealMan(BaseHand):
             self.control_thread_running = True
             
             # 启动控制线程
-            self.control_thread = threading.Thread(target=self._control_loop, daemon=True)
+            self.control_thread = threading.Thread(target=get_thread_placement().wrap(self._control_loop),
+                                                   name=self.thread_name("control"), daemon=True)
             self.control_thread.start()
             
             print("[Control] Control started.")
@@ -0,0 +1,12 @@
+from ..AsyncBaseDevice import AsyncBaseDevice
+from .TestRobot import TestRobot
+
+
+class AsyncTestRobot(AsyncBaseDevice, TestRobot):
+    """TestRobot的异步版本，运行在共享的设备事件循环上，用于和线程版本对比"""
+    name = "测试机器人(异步)"
+    description = "TestRobot的异步版本，周期性生成模拟的机器人状态数据，运行在asyncio设备事件循环上"
+
+    async def _main(self):
+        """设备主逻辑 - 每一帧执行一次，生成状态只是纯计算，直接在事件循环中执行"""
+        TestRobot._main(self)
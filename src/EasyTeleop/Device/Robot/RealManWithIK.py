@@ -6,6 +6,8 @@ from threading import Lock
 from typing import Dict, Any
 from collections import deque
 from .BaseRobot import BaseRobot
+from ...Components.EventTrace import get_event_trace
+from ...Components.ThreadPlacement import get_thread_placement
 from .Realman_IK.ik_qp import QPIK
 # from .Realman_IK.ik_rbtdef import *
 # from .Realman_IK.ik_rbtutils import *
@@ -68,7 +70,7 @@ class RealManWithIK(BaseRobot):
         super().__init__(config)
         
         self.target_fps = 30  # 目标帧率
-        self.min_interval = 1.0 / self.target_fps  # 最小间隔时间
+        self.set_loop_rate(self.target_fps)
         
         self.arm_controller = RoboticArm(rm_thread_mode_e.RM_TRIPLE_MODE_E)
         
@@ -90,30 +92,27 @@ class RealManWithIK(BaseRobot):
 
     def _main(self):
         try:
-            last_time = time.time()
             succ, arm_state = self.arm_controller.rm_get_current_arm_state()
+            # 同一次读取的位姿、关节和夹爪状态使用同一个时间戳，单调时间戳在读取后立即获取，不包含之后读取夹爪的耗时
+            ts, mono_ns = time.time(), time.monotonic_ns()
             if not succ:
                 self.current_pose_data = arm_state["pose"]
                 self.current_joint_data = arm_state["joint"]
-                self.emit("pose",self.current_pose_data)#调用回调函数
-                self.emit("joint",self.current_joint_data)#调用回调函数
             else:
                 raise RuntimeError("Failed to get arm state")
 
-        
             # 获取夹爪状态
             succ_gripper, gripper_state = self.arm_controller.rm_get_gripper_state()
             if not succ_gripper:
                 self.current_end_effector_data = gripper_state['actpos']
-                self.emit("end_effector",[self.current_end_effector_data])#调用回调函数
             else:
                 raise RuntimeError("Failed to get gripper state")
-            # 帧率控制，而不是固定间隔
-            current_time = time.time()
-            elapsed = current_time - last_time
-            if elapsed < self.min_interval:
-                time.sleep(self.min_interval - elapsed)
-            last_time = time.time()
+
+            self.emit_batch({
+                "pose": self.current_pose_data,
+                "joint": self.current_joint_data,
+                "end_effector": [self.current_end_effector_data],
+            }, ts, mono_ns)#调用回调函数
         except Exception as e:
             self.set_conn_status(2)
             print(f"Error polling robot state: {str(e)}")
@@ -220,7 +219,8 @@ class RealManWithIK(BaseRobot):
             self.control_thread_running = True
             
             # 启动控制线程
-            self.control_thread = threading.Thread(target=self._control_loop, daemon=True)
+            self.control_thread = threading.Thread(target=get_thread_placement().wrap(self._control_loop),
+                                                   name=self.thread_name("control"), daemon=True)
             self.control_thread.start()
             
             print("[Control] Control started.")
@@ -269,6 +269,7 @@ class RealManWithIK(BaseRobot):
                 else:
                     
                     # 执行位姿控制
+                    get_event_trace().mark("ik_command", self.__class__.__name__)
                     if len(pose_data) == 6:
                         self.movej(pose_data)
                     elif len(pose_data) == 7:
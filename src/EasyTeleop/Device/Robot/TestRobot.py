@@ -15,9 +15,11 @@ class TestRobot(BaseRobot):
         }
     }
     
+    loop_rate = 30
+
     def __init__(self, config=None):
+        self.fps = 30  # 默认帧率，需在super()之前初始化，避免覆盖配置中的fps
         super().__init__(config)
-        self.fps = 30  # 默认帧率
         self._time_counter = 0
         self._control_active = False
         self._control_lock = threading.Lock()
@@ -43,7 +45,7 @@ class TestRobot(BaseRobot):
         super().set_config(config)
         if "fps" in config:
             self.fps = config["fps"]
-            self.min_interval = 1.0 / self.fps if self.fps > 0 else 0
+            self.set_loop_rate(self.fps)
         return True
 
     def _connect_device(self) -> bool:
@@ -57,7 +59,6 @@ class TestRobot(BaseRobot):
         return True
 
     def _main(self):
-        last_time = time.time()
         """设备主逻辑 - 每一帧执行一次"""
         self._time_counter += 1
         
@@ -92,13 +93,6 @@ class TestRobot(BaseRobot):
         # 触发state事件
         self.emit("state", self._robot_state)
 
-        if self.fps > 0:
-            # 帧率控制，而不是固定间隔
-            current_time = time.time()
-            elapsed = current_time - last_time
-            if elapsed < self.min_interval:
-                time.sleep(self.min_interval - elapsed)
-
     def start_control(self):
         """开始控制机器人"""
         pass
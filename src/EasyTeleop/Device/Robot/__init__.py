@@ -2,9 +2,11 @@ from .BaseRobot import BaseRobot
 from .RealMan import RealMan
 from .RealManWithIK import RealManWithIK
 from .TestRobot import TestRobot
+from .AsyncTestRobot import AsyncTestRobot
 
 __all__ = [
     'BaseRobot',
     'RealMan',
-    'TestRobot'
+    'TestRobot',
+    'AsyncTestRobot'
 ]
\ No newline at end of file
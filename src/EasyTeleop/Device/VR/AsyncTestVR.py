@@ -0,0 +1,12 @@
+from ..AsyncBaseDevice import AsyncBaseDevice
+from .TestVR import TestVR
+
+
+class AsyncTestVR(AsyncBaseDevice, TestVR):
+    """TestVR的异步版本，运行在共享的设备事件循环上，用于和线程版本对比"""
+    name = "测试VR设备(异步)"
+    description = "测试VR设备，运行在asyncio设备事件循环上"
+
+    async def _main(self):
+        """设备主逻辑 - 每一帧执行一次，生成数据只是纯计算，直接在事件循环中执行"""
+        TestVR._main(self)
@@ -0,0 +1,89 @@
+import asyncio
+import json
+from ..AsyncBaseDevice import AsyncBaseDevice
+from .VRSocket import VRSocket
+
+"""
+TCP局域网直连的头显设备（asyncio版本）
+"""
+
+class AsyncVRSocket(AsyncBaseDevice, VRSocket):
+    """VRSocket的异步版本，使用asyncio流读取数据，不再占用一个阻塞在recv上的线程"""
+    name = "TCP Socket 头显(异步)"
+    description = "使用TCP Socket连接的VR设备，运行在asyncio设备事件循环上"
+
+    # 单行JSON数据包的最大长度
+    line_limit = 1 << 20
+
+    def __init__(self, config=None):
+        self.reader = None
+        self.writer = None
+        super().__init__(config)
+
+    async def _main(self):
+        """
+        每次迭代读取并处理一行JSON数据包
+        """
+        try:
+            line = await self.reader.readline()
+        except Exception as e:
+            if self.get_conn_status() == 1:  # 只有在连接状态时才报告异常
+                self.emit("error", f"Socket接收异常: {e}")
+                self.set_conn_status(2)
+            return
+        if not line:
+            if self.get_conn_status() == 1:
+                self.emit("disconnect", "[Quest断开连接]")
+                self.set_conn_status(2)
+            return
+        line = line.strip()
+        if not line:
+            return
+        try:
+            msg = json.loads(line)
+        except json.JSONDecodeError as e:
+            self.emit("error", f"[JSON解析失败]: {e}")
+            return
+        self.emit("message", msg)
+
+    async def _connect_device(self):
+        """
+        建立到VR设备的Socket连接，超时由AsyncBaseDevice按connect_timeout处理
+        """
+        await self._close_stream()
+        try:
+            self.reader, self.writer = await asyncio.open_connection(self.ip, self.port, limit=self.line_limit)
+        except Exception as e:
+            self.emit("error", f"连接失败: {e}")
+            return False
+        self.emit("connect")
+        return True
+
+    def _interrupt(self):
+        """
+        停止时在设备事件循环中关闭连接，使等待中的readline立即返回
+        """
+        writer = self.writer
+        if writer is not None:
+            self.loop.call_soon_threadsafe(writer.close)
+
+    async def _disconnect_device(self):
+        """
+        断开与VR设备的Socket连接
+        """
+        if self.writer is not None:
+            await self._close_stream()
+            self.emit("disconnect", "[VR断开连接]")
+        return True
+
+    async def _close_stream(self):
+        writer = self.writer
+        self.reader = None
+        self.writer = None
+        if writer is None:
+            return
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
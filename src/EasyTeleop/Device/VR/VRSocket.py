@@ -100,13 +100,27 @@ class VRSocket(BaseVR):
         """
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
+            # 连接阶段设置超时，连接成功后恢复阻塞接收
+            self.sock.settimeout(self.connect_timeout)
             self.sock.connect((self.ip, self.port))
+            self.sock.settimeout(None)
             self.emit("connect")
             return True
         except Exception as e:
             self.emit("error", f"连接失败: {e}")
             return False
         
+    def _interrupt(self):
+        """
+        停止时关闭socket读写，使阻塞中的recv立即返回
+        """
+        sock = self.sock
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
     def _disconnect_device(self):
         """
         断开与VR设备的Socket连接
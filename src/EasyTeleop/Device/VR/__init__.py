@@ -1,9 +1,13 @@
 from .BaseVR import BaseVR
 from .TestVR import TestVR
 from .VRSocket import VRSocket
+from .AsyncTestVR import AsyncTestVR
+from .AsyncVRSocket import AsyncVRSocket
 
 __all__ = [
     'BaseVR',
     'TestVR',
-    'VRSocket'
+    'VRSocket',
+    'AsyncTestVR',
+    'AsyncVRSocket'
 ]
\ No newline at end of file
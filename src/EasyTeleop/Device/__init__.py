@@ -2,9 +2,13 @@ import os
 import importlib
 from typing import Dict, Type, Any
 from .BaseDevice import BaseDevice
+from .AsyncBaseDevice import AsyncBaseDevice
+from .DeviceProcess import DeviceProcess
 
 __all__ = [
     'BaseDevice',
+    'AsyncBaseDevice',
+    'DeviceProcess',
     'get_device_classes',
     'get_device_types'
 ]
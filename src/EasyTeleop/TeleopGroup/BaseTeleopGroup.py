@@ -5,6 +5,8 @@ import threading
 import time
 from ..Components import TeleopMiddleware
 from ..Components import DataCollect
+from ..Components.EventBus import EventBus
+from ..Components.Transport import BaseTransport
 
 
 class BaseTeleopGroup(ABC):
@@ -19,6 +21,12 @@ class BaseTeleopGroup(ABC):
     # 遥操组所需配置字段（由子类定义）
     need_config: List[Dict[str, Any]] = []
 
+    # 并行停止所有设备的总超时时间(秒)
+    device_stop_timeout: float = 3.0
+
+    # 采集图像的编码格式（jpeg/png/webp）；设置后摄像头每帧编码一次，采集直接写入编码结果，None时保存为PNG
+    record_codec: str = None
+
     def __init__(self, devices = None):
         """
         初始化遥操组
@@ -30,31 +38,38 @@ class BaseTeleopGroup(ABC):
         
         # 设备引用
         self.devices = devices or []  # 存储所有设备实例
+
+        # 视频传输层，按名称管理: {名称: 传输层}
+        self.transports: Dict[str, BaseTransport] = {}
         
-        # 回调函数字典
+        # 默认回调函数字典，事件没有订阅者时执行
         self._events: Dict[str, Callable] = {
             "status_change": self._default_callback,
             "error": self._default_error_callback,
         }
+        # 事件总线，支持多订阅者
+        self.event_bus = EventBus(
+            name=f"{self.__class__.__name__}-events",
+            defaults=self._events,
+            noop=self._default_callback,
+            on_error=self._on_dispatch_error,
+        )
         
-    def on(self, event_name: str, callback: Callable = None) -> Callable:
+    def on(self, event_name: str, callback: Callable = None, mailbox: bool = False, inline: bool = False,
+           backlog: Callable[[], int] = None) -> Callable:
         """
         注册事件回调函数 - 可作为装饰器或普通方法使用
+        同一事件可以注册多个回调，事件触发时按注册顺序执行；需要订阅句柄时使用event_bus.subscribe
         :param event_name: 事件名称
         :param callback: 回调函数（可选，当作为装饰器使用时不需要）
+        :param mailbox: 只接收最新值，回调处理不过来时跳过旧事件（适合显示、推流等只关心最新帧的消费者）
+        :param inline: 在触发事件的线程中直接执行，省去线程切换，只适合非阻塞且很快的回调（例如队列append）
+        :param backlog: 积压探针，返回回调方尚未处理的数据量（例如queue.qsize），设备据此做背压
         :return: 装饰器函数或注册结果
         """
         # 装饰器工厂模式
         def decorator(func):
-            if not callable(func):
-                raise ValueError("回调函数必须是可调用对象")
-                
-            # 如果事件存在则更新回调
-            if event_name in self._events:
-                self._events[event_name] = func
-            else:
-                # 如果事件不存在，添加新的事件处理器
-                self._events[event_name] = func
+            self.event_bus.subscribe(event_name, func, mailbox=mailbox, inline=inline, backlog=backlog)
             return func
         
         # 如果提供了callback参数，则按照原来的方式工作
@@ -64,50 +79,32 @@ class BaseTeleopGroup(ABC):
         # 否则返回装饰器
         return decorator
 
-    def off(self, event_name: str) -> bool:
+    def off(self, event_name: str, callback: Callable = None) -> bool:
         """
         移除事件回调函数，恢复默认回调
         :param event_name: 事件名称
+        :param callback: 要移除的回调函数（可选，不传则移除该事件的全部回调）
         """
-        if event_name in self._events:
-            self._events[event_name] = self._default_callback
-            return True
-        
-        return False
+        if callback is not None:
+            return self.event_bus.remove(event_name, callback)
+        removed = self.event_bus.clear(event_name)
+        return removed or event_name in self._events
 
     def emit(self, event_name: str, *args, **kwargs) -> None:
         """
-        触发事件，执行注册的回调函数
-        事件处理应是非阻塞的，对于耗时操作应该在独立线程中执行
+        触发事件，按事件的投递策略执行所有注册的回调函数
         :param event_name: 事件名称
         :param args: 位置参数
         :param kwargs: 关键字参数
         """
-        if event_name in self._events:
-            try:
-                # self._events[event_name](*args, **kwargs)
-                # 异步执行回调函数以避免阻塞事件循环
-                callback = self._events[event_name]
-                if asyncio.iscoroutinefunction(callback):
-                    # 如果是异步函数，在新事件循环中运行
-                    thread = threading.Thread(target=self._run_async_callback, args=(callback, args, kwargs), daemon=True)
-                    thread.start()
-                else:
-                    # 同步函数在新线程中运行以避免阻塞
-                    thread = threading.Thread(target=callback, args=args, kwargs=kwargs, daemon=True)
-                    thread.start()
-            except Exception as e:
-                self.emit("error", f"事件{event_name}执行失败: {str(e)}")
-
-    def _run_async_callback(self, callback, args, kwargs):
-        """运行异步回调函数"""
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(callback(*args, **kwargs))
-            loop.close()
-        except Exception as e:
-            self.emit("error", f"异步事件回调执行失败: {str(e)}")
+        self.event_bus.publish(event_name, *args, **kwargs)
+
+    def _on_dispatch_error(self, event_name: str, error: Exception) -> None:
+        """分发线程中回调执行失败时，通过error事件上报"""
+        if event_name == "error":
+            print(f"遥操组{self.__class__.__name__}的error回调执行失败: {error}")
+            return
+        self.emit("error", f"事件{event_name}执行失败: {str(error)}")
 
     def _default_callback(self, *args, **kwargs) -> None:
         """默认回调函数，什么也不做"""
@@ -144,8 +141,105 @@ class BaseTeleopGroup(ABC):
         """
         return {
             "running": self.running,
-            "collecting": self.data_collect.capture_state
+            "collecting": self.data_collect.capture_state,
+            "collect_queues": self.data_collect.get_queue_stats(),
+            "devices": self.get_device_metrics(),
+            "transports": {name: transport.get_stats() for name, transport in self.transports.items()},
         }
+
+    def get_device_metrics(self) -> Dict[str, Any]:
+        """
+        汇总各设备的运行指标，键为need_config中的设备字段名
+        :return: {设备字段名: 设备指标}，未配置的设备为None
+        """
+        metrics = {}
+        for i, device in enumerate(list(self.devices)):
+            key = self.need_config[i]["name"] if i < len(self.need_config) else str(i)
+            metrics[key] = device.get_metrics() if device else None
+        return metrics
+    def _record_camera(self, camera, camera_id: int = 0) -> None:
+        """
+        把摄像头的帧接入数据采集
+        :param camera: 摄像头设备
+        :param camera_id: 摄像头ID，对应frames下的camera_<id>目录
+        """
+        if self.record_codec:
+            camera.enable_encoding(self.record_codec)
+            camera.on("encoded_frame", lambda encoded: self.data_collect.put_encoded_frame(encoded, camera_id=camera_id),
+                      inline=True, backlog=self.data_collect.video_queue.qsize)
+        else:
+            camera.on("frame", lambda frame: self.data_collect.put_video_frame(frame, camera_id=camera_id),
+                      inline=True, backlog=self.data_collect.video_queue.qsize)
+
+    def add_transport(self, transport: BaseTransport, camera, event_name: str = "frame") -> BaseTransport:
+        """
+        把摄像头的帧发布到传输层（WebRTC、共享内存、文件等），传输层有独立的发送线程和限速，不会拖慢采集
+        遥操组运行中添加时立即启动，否则随遥操组启动
+        :param transport: 传输层
+        :param camera: 摄像头设备
+        :param event_name: frame或encoded_frame
+        :return: 传输层
+        """
+        if transport.name in self.transports:
+            raise ValueError(f"传输层{transport.name}已存在")
+        transport.attach(camera, event_name)
+        self.transports[transport.name] = transport
+        if self.running:
+            transport.start()
+        return transport
+
+    def remove_transport(self, name: str) -> bool:
+        """
+        停止并移除传输层
+        :param name: 传输层名称
+        :return: 是否存在该传输层
+        """
+        transport = self.transports.pop(name, None)
+        if transport is None:
+            return False
+        transport.detach()
+        transport.stop()
+        return True
+
+    def get_transport(self, name: str) -> BaseTransport:
+        return self.transports.get(name)
+
+    def _start_transports(self) -> None:
+        """启动所有传输层，在启动设备之前调用，设备的第一帧就能发出"""
+        for transport in self.transports.values():
+            transport.start()
+
+    def _stop_transports(self) -> None:
+        """停止所有传输层，在设备停止之后调用"""
+        for transport in self.transports.values():
+            transport.stop()
+
+    def _start_devices(self) -> None:
+        """启动所有设备，start只创建主循环线程，连接在各设备线程中进行，不会阻塞"""
+        for device in self.devices:
+            if device:
+                device.start()
+
+    def _stop_devices(self) -> bool:
+        """
+        并行停止所有设备，总耗时不超过device_stop_timeout
+        :return: 是否全部设备都在超时时间内停止
+        """
+        threads = []
+        for device in self.devices:
+            if device:
+                thread = threading.Thread(target=device.stop, name=device.thread_name("stop") if hasattr(device, "thread_name") else f"{device.__class__.__name__}-stop", daemon=True)
+                thread.start()
+                threads.append((device, thread))
+        deadline = time.monotonic() + self.device_stop_timeout
+        all_stopped = True
+        for device, thread in threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                all_stopped = False
+                print(f"遥操组{self.__class__.__name__}: 设备{device.__class__.__name__}未能在{self.device_stop_timeout}s内停止")
+        return all_stopped
+
     @abstractmethod
     def start(self) -> bool:
         """
@@ -52,6 +52,7 @@ class SingleArmWithTriggerTeleopGroup(BaseTeleopGroup):
             
             # 启动数据采集
             self.data_collect.start()
+            # 按键切换事件在TeleopMiddleware的分发线程中执行，切换采集状态时创建会话目录和文件不会阻塞VR数据包的解析
             self.teleop.on("buttonATurnDown", self.data_collect.toggle_capture_state)
             # 注册数据采集状态变化回调
             # self.data_collect.on("status_change",None)
@@ -61,23 +62,27 @@ class SingleArmWithTriggerTeleopGroup(BaseTeleopGroup):
             if self.devices[0]:
                 self.teleop.on("leftGripTurnDown",self.devices[0].start_control)
                 self.teleop.on("leftGripTurnUp",self.devices[0].stop_control)
-                self.teleop.on("leftTrigger",self.devices[0].add_end_effector_data)
-                self.teleop.on("leftPosRot",self.devices[0].add_pose_data)
-                self.devices[0].on("pose", self.data_collect.put_robot_pose)
-                self.devices[0].on("joint", self.data_collect.put_robot_joint)
-                self.devices[0].on("end_effector", self.data_collect.put_end_effector_state)
+                self.teleop.on("leftTrigger",self.devices[0].add_end_effector_data, inline=True)
+                self.teleop.on("leftPosRot",self.devices[0].add_pose_data, inline=True)
+                # 状态数据的队列满时会等待消费线程（block策略），不在机械臂主循环中执行
+                self.devices[0].on("pose", self.data_collect.put_robot_pose,
+                                   backlog=self.data_collect.pose_queue.qsize)
+                self.devices[0].on("joint", self.data_collect.put_robot_joint,
+                                   backlog=self.data_collect.joint_queue.qsize)
+                self.devices[0].on("end_effector", self.data_collect.put_end_effector_state,
+                                   backlog=self.data_collect.end_effector_queue.qsize)
 
+            # 解析VR数据包（含四元数转换和下游inline回调）每条需要数毫秒，在VR设备的分发线程中执行，不占用socket接收线程
             self.devices[1].on("message",self.teleop.handle_socket_data)
 
             if self.devices[2]:
-                self.devices[2].on("frame",self.data_collect.put_video_frame)
+                self._record_camera(self.devices[2], camera_id=0)
             if self.devices[3]:
-                self.devices[3].on("frame",self.data_collect.put_video_frame)
+                self._record_camera(self.devices[3], camera_id=1)
             
-            # 启动所有设备
-            for device in self.devices:
-                if device:
-                    device.start()
+            # 启动传输层和所有设备
+            self._start_transports()
+            self._start_devices()
                 
             self.running = True
             
@@ -99,10 +104,9 @@ class SingleArmWithTriggerTeleopGroup(BaseTeleopGroup):
             # 触发状态变化事件（停止前）
             self.running = False
             
-            # 停止所有设备
-            for device in self.devices:
-                if device:
-                    device.stop()
+            # 并行停止所有设备，再停止传输层
+            self._stop_devices()
+            self._stop_transports()
             
             # 停止数据采集
             self.data_collect.stop()
@@ -62,6 +62,7 @@ class TwoArmWithTriggerTeleopGroup(BaseTeleopGroup):
             
             # 启动数据采集
             self.data_collect.start()
+            # 按键切换事件在TeleopMiddleware的分发线程中执行，切换采集状态时创建会话目录和文件不会阻塞VR数据包的解析
             self.teleop.on("buttonATurnDown", self.data_collect.toggle_capture_state)
             # 注册数据采集状态变化回调
             # self.data_collect.on("status_change",None)
@@ -70,33 +71,41 @@ class TwoArmWithTriggerTeleopGroup(BaseTeleopGroup):
             if self.devices[0]:
                 self.teleop.on("leftGripTurnDown",self.devices[0].start_control)
                 self.teleop.on("leftGripTurnUp",self.devices[0].stop_control)
-                self.teleop.on("leftTrigger",self.devices[0].add_end_effector_data)
-                self.teleop.on("leftPosRot",self.devices[0].add_pose_data)
-                self.devices[0].on("pose", lambda pose, arm_id=0: self.data_collect.put_robot_pose(pose, arm_id=arm_id))
-                self.devices[0].on("joint", lambda joint, arm_id=0: self.data_collect.put_robot_joint(joint, arm_id=arm_id))
-                self.devices[0].on("end_effector", lambda eff, arm_id=0: self.data_collect.put_end_effector_state(eff, arm_id=arm_id))
+                self.teleop.on("leftTrigger",self.devices[0].add_end_effector_data, inline=True)
+                self.teleop.on("leftPosRot",self.devices[0].add_pose_data, inline=True)
+                # 状态数据的队列满时会等待消费线程（block策略），不在机械臂主循环中执行
+                self.devices[0].on("pose", lambda pose, arm_id=0: self.data_collect.put_robot_pose(pose, arm_id=arm_id),
+                                   backlog=self.data_collect.pose_queue.qsize)
+                self.devices[0].on("joint", lambda joint, arm_id=0: self.data_collect.put_robot_joint(joint, arm_id=arm_id),
+                                   backlog=self.data_collect.joint_queue.qsize)
+                self.devices[0].on("end_effector", lambda eff, arm_id=0: self.data_collect.put_end_effector_state(eff, arm_id=arm_id),
+                                   backlog=self.data_collect.end_effector_queue.qsize)
             if self.devices[1]:
                 self.teleop.on("rightGripTurnDown",self.devices[1].start_control)
                 self.teleop.on("rightGripTurnUp",self.devices[1].stop_control)
-                self.teleop.on("rightTrigger",self.devices[1].add_end_effector_data)
-                self.teleop.on("rightPosRot",self.devices[1].add_pose_data)
-                self.devices[1].on("pose", lambda pose, arm_id=1: self.data_collect.put_robot_pose(pose, arm_id=arm_id))
-                self.devices[1].on("joint", lambda joint, arm_id=1: self.data_collect.put_robot_joint(joint, arm_id=arm_id))
-                self.devices[1].on("end_effector", lambda eff, arm_id=1: self.data_collect.put_end_effector_state(eff, arm_id=arm_id))
+                self.teleop.on("rightTrigger",self.devices[1].add_end_effector_data, inline=True)
+                self.teleop.on("rightPosRot",self.devices[1].add_pose_data, inline=True)
+                # 状态数据的队列满时会等待消费线程（block策略），不在机械臂主循环中执行
+                self.devices[1].on("pose", lambda pose, arm_id=1: self.data_collect.put_robot_pose(pose, arm_id=arm_id),
+                                   backlog=self.data_collect.pose_queue.qsize)
+                self.devices[1].on("joint", lambda joint, arm_id=1: self.data_collect.put_robot_joint(joint, arm_id=arm_id),
+                                   backlog=self.data_collect.joint_queue.qsize)
+                self.devices[1].on("end_effector", lambda eff, arm_id=1: self.data_collect.put_end_effector_state(eff, arm_id=arm_id),
+                                   backlog=self.data_collect.end_effector_queue.qsize)
 
+            # 解析VR数据包（含四元数转换和下游inline回调）每条需要数毫秒，在VR设备的分发线程中执行，不占用socket接收线程
             self.devices[2].on("message",self.teleop.handle_socket_data)
 
             if self.devices[3]:
-                self.devices[3].on("frame",lambda frame, camera_id=0: self.data_collect.put_video_frame(frame, camera_id=camera_id))
+                self._record_camera(self.devices[3], camera_id=0)
             if self.devices[4]:
-                self.devices[4].on("frame",lambda frame, camera_id=1: self.data_collect.put_video_frame(frame, camera_id=camera_id))
+                self._record_camera(self.devices[4], camera_id=1)
             if self.devices[5]:
-                self.devices[5].on("frame",lambda frame, camera_id=2: self.data_collect.put_video_frame(frame, camera_id=camera_id))
+                self._record_camera(self.devices[5], camera_id=2)
             
-            # 启动所有设备
-            for device in self.devices:
-                if device:
-                    device.start()
+            # 启动传输层和所有设备
+            self._start_transports()
+            self._start_devices()
                 
             self.running = True
             
@@ -118,10 +127,9 @@ class TwoArmWithTriggerTeleopGroup(BaseTeleopGroup):
             # 触发状态变化事件（停止前）
             self.running = False
             
-            # 停止所有设备
-            for device in self.devices:
-                if device:
-                    device.stop()
+            # 并行停止所有设备，再停止传输层
+            self._stop_devices()
+            self._stop_transports()
             
             # 停止数据采集
             self.data_collect.stop()